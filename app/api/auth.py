@@ -1,11 +1,14 @@
 # app/api/auth.py
+import logging
 from datetime import timedelta
 from typing import Optional
+from uuid import UUID
 from app.config import settings
 from yarl import Query
 from fastapi import APIRouter, HTTPException, Depends, status, Response, Request
 from ..models.auth import LoginRequest, AuthResponse
-from ..utils.redis import blacklist_token, check_redis_connection, is_token_blacklisted
+from ..utils.redis import blacklist_token, is_token_blacklisted
+from ..services.health_service import health_monitor
 from app.middleware.auth import get_current_user
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import JSONResponse
@@ -35,6 +38,8 @@ from app.models.responses import ResponseModel
 from app.utils.auth import revoke_token
 from fastapi.security import OAuth2PasswordBearer
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -132,15 +137,13 @@ async def login(
 ):
     """Login user and return tokens"""
     try:
-        print(f"\n=== Login Attempt ===")
-        print(f"Login attempt for email: {user.email}")
-        
+        logger.debug("Login attempt for %s", user.email)
+
         # Get user
         db_user = db.query(User).filter(User.email == user.email).first()
-        print(f"User found in database: {db_user is not None}")
-        
+
         if not db_user:
-            print("Error: Email not registered")
+            logger.info("Login failed: email not registered")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email not registered"
@@ -148,18 +151,17 @@ async def login(
 
         # Verify password
         password_valid = verify_password(user.password, db_user.hashed_password)
-        print(f"Password verification result: {password_valid}")
-        
+
         if not password_valid:
             # Log failed attempt
             current_attempts = (db_user.failed_login_attempts or 0) + 1
-            print(f"Failed login attempts: {current_attempts}")
+            logger.warning("Login failed: wrong password for user %s (attempt %d)", db_user.id, current_attempts)
             
             db_user.failed_login_attempts = current_attempts
             db.commit()
 
             if current_attempts >= 5:
-                print("Account locked due to too many failed attempts")
+                logger.warning("Locking user %s after %d failed logins", db_user.id, current_attempts)
                 db_user.is_locked = True
                 db.commit()
                 raise HTTPException(
@@ -173,39 +175,33 @@ async def login(
             )
 
         # Check if email is verified
-        print(f"Email verification status: {db_user.is_active}")
         if not db_user.is_active:
-            print("Error: Email not verified")
+            logger.info("Login refused for user %s: email not verified", db_user.id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Please verify your email first"
             )
         
         # Check if account is locked
-        print(f"Account lock status: {db_user.is_locked}")
         if db_user.is_locked:
-            print("Error: Account is locked")
+            logger.warning("Login refused for user %s: account locked", db_user.id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Account is locked. Please reset your password"
             )
         
         # Reset failed attempts on successful login
-        print("Resetting failed attempts and updating last login")
         db_user.failed_login_attempts = 0
         db_user.last_login = func.now()  # Correct usage
         db.commit()
 
         # Create tokens using db_user (which has the 'id')
-        print("Creating access and refresh tokens")
-        
         # Convert UUID to string before passing it to the token creation function
         access_token = create_access_token(str(db_user.id))  # Convert UUID to string
         refresh_token = create_refresh_token(str(db_user.id))  # Convert UUID to string
 
         # Set cookies if remember_me
         if getattr(user, 'remember_me', False):
-            print("Setting remember_me cookie")
             response.set_cookie(
                 key="refresh_token",
                 value=refresh_token,
@@ -215,7 +211,7 @@ async def login(
                 max_age=30 * 24 * 60 * 60  # 30 days
             )
 
-        print("Login successful!")
+        logger.info("User %s logged in", db_user.id)
         return ResponseModel(
             success=True,
             message="Login successful",
@@ -233,11 +229,8 @@ async def login(
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Unexpected error during login: {str(e)}")
-        print(f"Error type: {type(e)}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logger.exception("Unexpected error during login")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred during login"
@@ -309,7 +302,7 @@ def refresh_token(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid refresh token")
 
         # Find the user associated with the refresh token
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).filter(User.id == UUID(user_id)).first()
         if user is None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User not found")
 
@@ -380,9 +373,8 @@ async def resend_verification(
     request: ResendVerificationRequest,
     db: Session = Depends(get_db)
 ):
-    print(f"Received request: {request.json()}")  # Log the raw request body for debugging
     try:
-        print(f"Looking up user with email: {request.email}")
+        logger.debug("Verification email requested for %s", request.email)
         user = db.query(User).filter(User.email == request.email).first()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -390,7 +382,6 @@ async def resend_verification(
         if user.is_active:
             raise HTTPException(status_code=400, detail="Email already verified")
 
-        print(f"Creating token for email: {request.email}")
         # Create new verification token
         token = create_token(
             data={"sub": request.email},
@@ -398,7 +389,6 @@ async def resend_verification(
             expires_delta=timedelta(hours=48)
         )
         
-        print(f"Sending verification email to: {request.email}")
         # Send new verification email
         await send_verification_email(request.email, token)
         
@@ -408,8 +398,7 @@ async def resend_verification(
         )
         
     except Exception as e:
-        import traceback
-        print(f"Error in resend_verification: {traceback.format_exc()}")  # Add error logging
+        logger.exception("Error in resend_verification")
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/logout")
@@ -418,8 +407,8 @@ async def logout(
     token: str = Depends(oauth2_scheme)
 ):
     try:
-        # Check Redis connection
-        if not check_redis_connection():
+        # Last background probe of Redis (see services/health_service.py)
+        if health_monitor.is_down("redis"):
             raise HTTPException(
                 status_code=500,
                 detail="Token blacklist service unavailable"
@@ -455,7 +444,7 @@ async def logout(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Logout error: {str(e)}")
+        logger.exception("Logout error")
         raise HTTPException(
             status_code=400,
             detail=f"Error during logout: {str(e)}"
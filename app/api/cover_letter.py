@@ -1,30 +1,36 @@
 from app.models.database import CoverLetter
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from ..services.ai_service import CoverLetterService
 from ..services.cv_service import CVService
+from ..services.cv_profile_service import CVProfileService
 from ..models.ai_models import (
     CoverLetterRequest,
-    CoverLetterResponse,
+    JobMatchRequest,
+    JobMatchResponse,
     WriteStyle
 )
+from ..config import settings
 from ..models.user import User
 from ..database import get_db
 from ..middleware.auth import get_current_user
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.serialization import model_response
+from ..utils.metrics import ExportTimer, exports_in_progress
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
 from typing import List
+from uuid import UUID
 import logging
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 from ..services.cover_letter_export_service import CoverLetterExportService
-from io import BytesIO
 from typing import Literal
 
 class SaveCoverLetterRequest(BaseModel):
     content: str
-    cv_id: Optional[str] = None
-    job_id: Optional[str] = None
+    cv_id: Optional[UUID] = None
+    job_id: Optional[UUID] = None
     job_title: Optional[str] = None
     company_name: Optional[str] = None
     matching_score: Optional[float] = None
@@ -37,6 +43,19 @@ class CoverLetterResponse(BaseModel):
     matching_score: Optional[float]
     created_at: datetime
     cv_id: Optional[str]
+
+class CoverLetterSummary(BaseModel):
+    id: str
+    job_title: Optional[str]
+    company_name: Optional[str]
+    matching_score: Optional[float]
+    created_at: datetime
+    cv_id: Optional[str]
+    content: Optional[str] = None  # only with include_content=true
+
+class CoverLetterListResponse(BaseModel):
+    items: List[CoverLetterSummary]
+    next_cursor: Optional[str] = None
     
     
 router = APIRouter(prefix="/api/ai", tags=["Cover Letter"])
@@ -59,18 +78,21 @@ async def generate_cover_letter(
             )
             
         # Initialize services
+        from ..services.ai_service import CoverLetterService  # LangChain loads with the first AI request
+
         ai_service = CoverLetterService()
         cv_service = CVService(db)
         
         # Get CV content if cv_id is provided
+        cv_profile = None
         if request.cv_id:
-            cv = await cv_service.get_cv(request.cv_id, current_user.id)
+            cv = await cv_service.get_cv_view(request.cv_id, current_user.id)
             if not cv:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="CV not found"
                 )
-            request.cv_content = cv.sections
+            cv_profile = CVProfileService(db).get_for_cv(cv)
         elif not request.cv_content:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -79,7 +101,7 @@ async def generate_cover_letter(
             
         # Generate cover letter
         try:
-            result = await ai_service.generate_cover_letter(request)
+            result = await ai_service.generate_cover_letter(request, cv_profile=cv_profile)
             
             # Deduct credits
             current_user.ai_credits -= result.credits_used
@@ -102,6 +124,71 @@ async def generate_cover_letter(
             detail="Failed to generate cover letter"
         )
 
+@router.post("/match", response_model=JobMatchResponse)
+async def match_jobs(
+    request: JobMatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Rank a CV against several job postings (no letter is generated)"""
+    try:
+        if current_user.ai_credits <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                detail="Insufficient credits for AI generation"
+            )
+
+        if len(request.job_descriptions) > settings.JOB_MATCH_MAX_POSTINGS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.JOB_MATCH_MAX_POSTINGS} job postings per request"
+            )
+
+        from ..services.ai_service import CoverLetterService
+
+        ai_service = CoverLetterService()
+        cv_service = CVService(db)
+
+        cv_content, cv_profile = None, None
+        if request.cv_id:
+            cv = await cv_service.get_cv_view(request.cv_id, current_user.id)
+            cv_profile = CVProfileService(db).get_for_cv(cv)
+        elif request.cv_content:
+            cv_content = request.cv_content
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Either cv_id or cv_content must be provided"
+            )
+
+        try:
+            result = await ai_service.match_jobs(
+                cv_content,
+                request.job_descriptions,
+                fuzzy=request.fuzzy,
+                cv_profile=cv_profile
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        current_user.ai_credits -= result.credits_used
+        db.commit()
+
+        result.cv_id = str(request.cv_id) if request.cv_id else None
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Job matching failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to match job postings"
+        )
+
 @router.get("/credits")
 async def get_credits(current_user: User = Depends(get_current_user)):
     """Get user's remaining AI credits"""
@@ -148,35 +235,60 @@ async def save_cover_letter(
             detail="Failed to save cover letter"
         )
 
-@router.get("/letters", response_model=List[CoverLetterResponse])
+@router.get("/letters", response_model=CoverLetterListResponse)
 async def get_cover_letters(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 10
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    include_content: bool = False
 ):
-    """Get user's cover letters with pagination"""
+    """Get user's cover letters, newest first, one keyset page at a time"""
     try:
-        cover_letters = db.query(CoverLetter)\
-            .filter(CoverLetter.user_id == current_user.id)\
-            .order_by(CoverLetter.created_at.desc())\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
-            
-        return [
-            CoverLetterResponse(
-                id=str(letter.id),
-                content=letter.content,
-                job_title=letter.job_title,
-                company_name=letter.company_name,
-                matching_score=letter.matching_score,
-                created_at=letter.created_at,
-                cv_id=str(letter.cv_id) if letter.cv_id else None
-            )
-            for letter in cover_letters
+        columns = [
+            CoverLetter.id,
+            CoverLetter.job_title,
+            CoverLetter.company_name,
+            CoverLetter.matching_score,
+            CoverLetter.created_at,
+            CoverLetter.cv_id
         ]
+        if include_content:
+            columns.append(CoverLetter.content)
+
+        query = db.query(*columns).filter(CoverLetter.user_id == current_user.id)
+        position = decode_cursor(cursor)
+        if position:
+            query = query.filter(tuple_(CoverLetter.created_at, CoverLetter.id) < tuple_(*position))
+
+        rows = query\
+            .order_by(CoverLetter.created_at.desc(), CoverLetter.id.desc())\
+            .limit(limit + 1)\
+            .all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return model_response(CoverLetterListResponse(
+            items=[
+                CoverLetterSummary(
+                    id=str(row.id),
+                    job_title=row.job_title,
+                    company_name=row.company_name,
+                    matching_score=row.matching_score,
+                    created_at=row.created_at,
+                    cv_id=str(row.cv_id) if row.cv_id else None,
+                    content=row.content if include_content else None
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor
+        ))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch cover letters: {str(e)}")
         raise HTTPException(
@@ -186,7 +298,7 @@ async def get_cover_letters(
 
 @router.get("/letters/{letter_id}", response_model=CoverLetterResponse)
 async def get_cover_letter(
-    letter_id: str,
+    letter_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -226,7 +338,7 @@ async def get_cover_letter(
         
 @router.get("/letters/{letter_id}/export/{format}")
 async def export_cover_letter(
-    letter_id: str,
+    letter_id: UUID,
     format: Literal["pdf", "docx"],
     template: Optional[str] = "basic.html",
     db: Session = Depends(get_db),
@@ -247,6 +359,7 @@ async def export_cover_letter(
             )
 
         export_service = CoverLetterExportService()
+        timer = ExportTimer(template if format == "pdf" else "basic.html", format)
         
         export_args = {
             "content": letter.content,
@@ -255,23 +368,26 @@ async def export_cover_letter(
             "author": current_user.full_name
         }
         
-        if format == "pdf":
-            content = await export_service.to_pdf(
-                template_name=template,
-                **export_args
-            )
-            media_type = "application/pdf"
-            filename = "cover_letter.pdf"
-        else:
-            content = await export_service.to_docx(**export_args)
-            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            filename = "cover_letter.docx"
+        with exports_in_progress(format).track_inprogress():
+            if format == "pdf":
+                content = await export_service.to_pdf(
+                    template_name=template,
+                    timer=timer,
+                    **export_args
+                )
+                media_type = "application/pdf"
+                filename = "cover_letter.pdf"
+            else:
+                content = await export_service.to_docx(timer=timer, **export_args)
+                media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                filename = "cover_letter.docx"
 
-        return StreamingResponse(
-            BytesIO(content),
+        return Response(
+            content,
             media_type=media_type,
             headers={
-                "Content-Disposition": f"attachment; filename={filename}"
+                "Content-Disposition": f"attachment; filename={filename}",
+                **timer.headers()
             }
         )
         
@@ -2,29 +2,37 @@ import uuid
 from app.middleware.auth import get_current_user
 from app.models.user import User
 from app.config import settings
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 from ..services.cv_service import CVService
-from ..database import get_db
+from ..services.cv_profile_service import CVProfileService
+from ..database import SessionLocal, get_db
 from ..services.preview_service import PreviewService
 from ..services.export_service import ExportService
-from fastapi.responses import StreamingResponse
-from io import BytesIO
+from ..services.preview_session import PreviewSession, PreviewSessionError, PreviewSessionTooLarge, preview_sessions
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
-from ..models.database import CV, Section, CVStatus  # Import SQLAlchemy models
-from sqlalchemy.sql import func
-from fastapi import Depends, HTTPException
-from jose import JWTError, jwt
-from typing import Optional
+from datetime import datetime
+from ..models.database import CV, CVStatus  # Import SQLAlchemy models
+from ..models.cv import CVResponse
+from ..models.read_models import CVView
+from ..utils.serialization import model_response
+from ..utils.metrics import ExportTimer, exports_in_progress
+from ..utils.etag import body_etag, etag_matches, make_etag, not_modified, template_version
+from ..middleware.compression import static_prefixes
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import UploadFile, File
 import imghdr
+import asyncio
 import logging
+import orjson
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/cv", tags=["CV"])
+_registered_heads = set()  # template ids whose preview head is in static_prefixes
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="access_token")  # This URL is where the client gets the token from
 
 # Pydantic models for API
@@ -33,6 +41,7 @@ class SectionRequest(BaseModel):
     title: str
     content: Any
     order_index: int
+    style_config: Optional[Dict[str, Any]] = None
 
 class SectionResponse(BaseModel):
     type: str
@@ -59,6 +68,21 @@ class CVDataModel(BaseModel):
 class PreviewRequest(BaseModel):
     cv_data: CVDataModel
     template_id: str
+    # Fragment keys the editor already shows; when set, only the other fragments come back
+    known_fragments: Optional[List[str]] = None
+
+class CVSummary(BaseModel):
+    id: str
+    title: str
+    template_id: str
+    status: Optional[CVStatus]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    section_count: int
+
+class CVListResponse(BaseModel):
+    items: List[CVSummary]
+    next_cursor: Optional[str] = None
 
 
 from datetime import datetime
@@ -74,14 +98,10 @@ async def create_cv(
         if not request.template_id or not request.sections:
             raise HTTPException(status_code=400, detail="Template ID and sections are required.")
         
-        # Delete existing drafts for this user
-        existing_drafts = db.query(CV).filter(
-            CV.user_id == current_user.id,
-            CV.status == CVStatus.DRAFT
-        ).all()
-        
-        for draft in existing_drafts:
-            db.delete(draft)
+        cv_service = CVService(db)
+
+        # Replace the user's existing draft
+        cv_service.delete_drafts(current_user.id)
         
         # Generate title and create new CV
         current_time = datetime.utcnow()
@@ -97,17 +117,10 @@ async def create_cv(
         db.flush()
 
         # Create sections
-        current_time = func.now()
-        for section_data in request.sections:
-            section = Section(
-                cv_id=cv.id,
-                type=section_data.type,
-                title=section_data.title,
-                content=section_data.content,
-                order_index=section_data.order_index,
-                updated_at=current_time  
-            )
-            db.add(section)
+        sections = [s.dict() for s in request.sections]
+        cv_service.insert_sections(cv.id, sections)
+
+        CVProfileService(db).refresh(cv.id, sections)
 
         db.commit()
         db.refresh(cv)
@@ -119,63 +132,146 @@ async def create_cv(
         }
     except Exception as e:
         db.rollback()
-        print(f"Error creating CV: {str(e)}")
+        logger.exception("Error creating CV")
         raise HTTPException(status_code=400, detail=str(e))
 
 
 
-@router.get("/{cv_id}")
+def _cache_headers(etag: str) -> Dict[str, str]:
+    # Private data: browsers may keep it but must revalidate with If-None-Match
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def _register_preview_head(preview_service: PreviewService, template_id: str) -> None:
+    """Let the compression middleware reuse the compressed template CSS for {"html": ...} bodies"""
+    if template_id in _registered_heads:
+        return
+    _registered_heads.add(template_id)
+    head = preview_service.static_head(template_id)
+    if head:
+        # orjson escapes character by character, so the encoded head is a prefix of every body
+        static_prefixes.register(orjson.dumps({"html": head})[:-2])
+
+def _cv_etag(kind: str, version: Any, *parts: Any) -> str:
+    return make_etag(kind, version.id, version.updated_at or version.created_at, version.status, *parts)
+
+@router.get("/{cv_id}", response_model=CVResponse)
 async def get_cv(
-    cv_id: str,
+    cv_id: uuid.UUID,
+    http_request: Request,
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user)  # Ensure the user is authenticated
 ):
-    """Get CV by ID"""
+    """Get CV by ID (send If-None-Match to get a 304 when it hasn't changed)"""
+    cv_service = CVService(db)
+    version = await cv_service.get_cv_version(cv_id, current_user.id)
+    etag = _cv_etag("cv", version, version.template_id)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+
+    cv = await cv_service.get_cv_view(cv_id, current_user.id)
+    return model_response(CVResponse.model_validate(cv), headers=_cache_headers(etag))
+
+@router.get("/{cv_id}/preview")
+async def preview_saved_cv(
+    cv_id: uuid.UUID,
+    http_request: Request,
+    template_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Preview a saved CV, optionally in another template (conditional like get_cv)"""
     cv_service = CVService(db)
-    cv = await cv_service.get_cv(cv_id, current_user.id)
-    if not cv:
-        raise HTTPException(status_code=404, detail="CV not found.")
-    return cv
+    version = await cv_service.get_cv_version(cv_id, current_user.id)
+    template_id = template_id or version.template_id
+    etag = _cv_etag("preview", version, template_id, template_version(template_id))
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
 
-@router.get("")  # Changed from "/cvs"
+    cv = await cv_service.get_cv_view(cv_id, current_user.id)
+    preview_service = PreviewService()
+    preview_html = await preview_service.generate_preview(cv, template_id, mark_fragments=True)
+    _register_preview_head(preview_service, template_id)
+    return ORJSONResponse({"html": preview_html}, headers=_cache_headers(etag))
+
+@router.get("/{cv_id}/export/{format}")
+async def export_saved_cv(
+    cv_id: uuid.UUID,
+    format: str,
+    http_request: Request,
+    template_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Export a saved CV (conditional like get_cv)"""
+    if format not in ["pdf", "docx"]:
+        raise HTTPException(status_code=400, detail="Unsupported format.")
+
+    cv_service = CVService(db)
+    version = await cv_service.get_cv_version(cv_id, current_user.id)
+    template_id = template_id or version.template_id
+    etag = _cv_etag("export", version, format, template_id, template_version(template_id))
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+
+    cv = await cv_service.get_cv_view(cv_id, current_user.id)
+    try:
+        return await _export_response(cv, template_id, format, etag)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("", response_model=CVListResponse)  # Changed from "/cvs"
 async def get_user_cvs(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user)
 ):
-    """Get all CVs for the authenticated user"""
+    """List the authenticated user's CVs (summaries only, newest first)"""
     try:
         cv_service = CVService(db)
-        user_cvs = await cv_service.get_user_cvs(current_user.id)
-        if not user_cvs:
-            return []  # Return empty list instead of 404
-        return user_cvs
+        rows, next_cursor = await cv_service.get_user_cv_summaries(
+            current_user.id,
+            limit=limit,
+            cursor=cursor
+        )
+        return model_response(CVListResponse(
+            items=[
+                CVSummary(
+                    id=str(row.id),
+                    title=row.title,
+                    template_id=row.template_id,
+                    status=row.status,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                    section_count=row.section_count
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor
+        ))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/{cv_id}")
 async def update_cv(
-    cv_id: str,
+    cv_id: uuid.UUID,
     request: CVCreateRequest,
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user)
 ):
     """Update CV data"""
     try:
-        print(f"Received update request for CV {cv_id}")
-        
+        logger.debug("Updating CV %s", cv_id)
+
+        cv_service = CVService(db)
+
         # If updating to draft status, delete other drafts first
         if request.status == CVStatus.DRAFT:
-            existing_drafts = db.query(CV).filter(
-                CV.user_id == current_user.id,
-                CV.status == CVStatus.DRAFT,
-                CV.id != cv_id  # Don't delete the current CV
-            ).all()
-            
-            for draft in existing_drafts:
-                db.delete(draft)
+            cv_service.delete_drafts(current_user.id, exclude_id=cv_id)
         
-        cv_service = CVService(db)
-        result = await cv_service.update_cv(
+        await cv_service.update_cv(
             cv_id=cv_id, 
             user_id=current_user.id,
             cv_data={
@@ -191,13 +287,13 @@ async def update_cv(
         }
     except Exception as e:
         db.rollback()
-        print(f"Error updating CV: {str(e)}")
+        logger.exception("Error updating CV %s", cv_id)
         raise HTTPException(status_code=400, detail=str(e))
     
 
 @router.delete("/{cv_id}")
 async def delete_cv(
-    cv_id: str,
+    cv_id: uuid.UUID,
     db: Session = Depends(get_db)
 ):
     """Delete a CV"""
@@ -217,58 +313,224 @@ async def delete_cv(
         }
     except Exception as e:
         db.rollback()
-        print(f"Error deleting CV: {str(e)}")
+        logger.exception("Error deleting CV %s", cv_id)
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.post("/preview")
-async def preview_cv(request: PreviewRequest, current_user: str = Depends(get_current_user)):  # Ensure the user is authenticated
+async def preview_cv(request: PreviewRequest, http_request: Request, current_user: str = Depends(get_current_user)):  # Ensure the user is authenticated
     try:
         # Validate input
         if not request.template_id or not request.cv_data:
             raise HTTPException(status_code=400, detail="Invalid data for preview.")
+
+        # Same payload and template as last time: nothing to render
+        etag = body_etag(await http_request.body(), "preview", template_version(request.template_id))
+        if etag_matches(http_request, etag):
+            return not_modified(etag)
         
         preview_service = PreviewService()
+        if request.known_fragments is not None:
+            fragments = await preview_service.generate_fragments(
+                request.cv_data.dict(),
+                request.template_id,
+                known=request.known_fragments
+            )
+            return ORJSONResponse(fragments, headers=_cache_headers(etag))
+
         preview_html = await preview_service.generate_preview(
             request.cv_data.dict(),
-            request.template_id
+            request.template_id,
+            mark_fragments=True
         )
-        return {"html": preview_html}
+        _register_preview_head(preview_service, request.template_id)
+        return ORJSONResponse({"html": preview_html}, headers=_cache_headers(etag))
     except Exception as e:
         raise HTTPException(
             status_code=400,
             detail=str(e)
         )
 
+class _CloseSession(Exception):
+    def __init__(self, code: int, reason: str):
+        self.code = code
+        self.reason = reason
+
+
+async def _receive_json(websocket: WebSocket, timeout: float) -> Dict[str, Any]:
+    try:
+        message = await asyncio.wait_for(websocket.receive(), timeout)
+    except asyncio.TimeoutError:
+        raise _CloseSession(1001, "Idle timeout")
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    data = message.get("text") or message.get("bytes") or b""
+    if len(data) > settings.PREVIEW_WS_MAX_MESSAGE_BYTES:
+        raise _CloseSession(1009, "Message too large")
+    try:
+        payload = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        raise PreviewSessionError("Invalid JSON")
+    if not isinstance(payload, dict):
+        raise PreviewSessionError("Messages must be JSON objects")
+    return payload
+
+
+async def _send_json(websocket: WebSocket, payload: Dict[str, Any]) -> None:
+    await websocket.send_text(orjson.dumps(payload).decode())
+
+
+def _websocket_user_id(token: Any):
+    if not isinstance(token, str) or not token:
+        return None
+    db = SessionLocal()
+    try:
+        return get_current_user(token, db).id
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+
+
+async def _push_renders(websocket: WebSocket, session: PreviewSession, changed: asyncio.Event) -> None:
+    """Render once edits go quiet and push the result; the first page goes out at once"""
+    preview_service = PreviewService()
+    first = True
+    try:
+        while True:
+            await changed.wait()
+            if not first:
+                await session.wait_for_quiet()
+            first = False
+            changed.clear()
+            if not session.dirty:
+                continue
+            try:
+                payload = await session.render(preview_service)
+            except HTTPException as e:
+                payload = {"type": "error", "detail": e.detail, "seq": session.seq}
+            await _send_json(websocket, payload)
+    except Exception:
+        # The task inherits the socket's logging context, so this carries its request id
+        logger.exception("Live preview push failed at seq %s", session.seq)
+        try:
+            await websocket.close(code=1011, reason="Preview rendering failed")
+        except Exception:
+            pass  # the socket is already gone
+
+
+@router.websocket("/preview/ws")
+async def preview_session(websocket: WebSocket):
+    """
+    Live preview. Client -> server, JSON text frames:
+        {"type": "init", "token": ..., "template_id": ..., "sections": [...]}  (first message)
+        {"type": "update", "index": i, "section": {...}}  (i == len(sections) appends)
+        {"type": "remove", "index": i}
+        {"type": "move", "from": i, "to": j}
+        {"type": "sections", "sections": [...]}
+        {"type": "template", "template_id": ...}
+        {"type": "profile_image", "profile_image": ...}
+    Server -> client, after edits go quiet for PREVIEW_WS_DEBOUNCE_MS:
+        {"type": "page", "html": ..., "keys": [...], "seq": n}  (first render, template switch)
+        {"type": "fragments", "keys": [...], "fragments": [...], "seq": n}  (see generate_fragments)
+        {"type": "error", "detail": ..., "seq": n}
+    An edit that takes the session over PREVIEW_WS_MAX_SESSION_BYTES closes it with 1008.
+    """
+    await websocket.accept()
+    session: Optional[PreviewSession] = None
+    renderer: Optional[asyncio.Task] = None
+    try:
+        try:
+            init = await _receive_json(websocket, settings.PREVIEW_WS_AUTH_TIMEOUT)
+        except PreviewSessionError:
+            raise _CloseSession(1008, "Invalid init message")
+        user_id = await run_in_threadpool(_websocket_user_id, init.get("token"))
+        if init.get("type") != "init" or user_id is None:
+            raise _CloseSession(1008, "Could not validate credentials")
+        if not isinstance(init.get("template_id"), str) or not init["template_id"]:
+            raise _CloseSession(1008, "template_id is required")
+
+        try:
+            session = preview_sessions.open(user_id, init["template_id"], init.get("sections") or [])
+        except (PreviewSessionError, PreviewSessionTooLarge) as e:
+            raise _CloseSession(1008, str(e))
+        if session is None:
+            raise _CloseSession(1013, "Too many preview sessions, try again later")
+
+        changed = asyncio.Event()
+        changed.set()
+        renderer = asyncio.create_task(_push_renders(websocket, session, changed))
+        while True:
+            try:
+                session.apply(await _receive_json(websocket, settings.PREVIEW_WS_IDLE_TIMEOUT))
+            except PreviewSessionError as e:
+                await _send_json(websocket, {"type": "error", "detail": str(e), "seq": session.seq})
+                continue
+            except PreviewSessionTooLarge as e:
+                raise _CloseSession(1008, str(e))
+            changed.set()
+            if renderer.done():  # the socket went away while pushing
+                break
+
+    except _CloseSession as e:
+        await websocket.close(code=e.code, reason=e.reason)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        preview_sessions.close(session)
+        if renderer is not None:
+            renderer.cancel()
+            await asyncio.gather(renderer, return_exceptions=True)
+
+
+async def _export_response(cv_data: Any, template_id: str, format: str, etag: str) -> Response:
+    with exports_in_progress(format).track_inprogress():
+        return await _render_export(cv_data, template_id, format, etag)
+
+async def _render_export(cv_data: Any, template_id: str, format: str, etag: str) -> Response:
+    timer = ExportTimer(template_id, format)
+    if not isinstance(cv_data, CVView):
+        cv_data = CVView.from_dict(cv_data, template_id)
+    cv_data = cv_data.normalized()  # dates parsed once, for either renderer
+    export_service = ExportService()
+    if format == "pdf":
+        with timer.stage("render"):
+            preview_html = await PreviewService().generate_preview(cv_data, template_id)
+        pdf_bytes = await export_service.to_pdf(preview_html, timer)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PDF export of %s: %s", template_id, timer.server_timing())
+        # One body message: streaming a BytesIO sends the file line by line (hundreds of chunks for a PDF)
+        return Response(
+            pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": "attachment; filename=cv.pdf", **_cache_headers(etag), **timer.headers()}
+        )
+    docx_bytes = await export_service.to_docx(cv_data, template_id, timer)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("DOCX export of %s: %s", template_id, timer.server_timing())
+    return Response(
+        docx_bytes,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers={"Content-Disposition": "attachment; filename=cv.docx", **_cache_headers(etag), **timer.headers()}
+    )
+
 @router.post("/export/{format}")
 async def export_cv(
     format: str,
     request: CVExportRequest,
+    http_request: Request,
     current_user: str = Depends(get_current_user)  # Ensure the user is authenticated
 ):
     """Export CV in specified format"""
     # Validate format
     if format not in ["pdf", "docx"]:
         raise HTTPException(status_code=400, detail="Unsupported format.")
-    
-    export_service = ExportService()
-    preview_service = PreviewService()
+
+    etag = body_etag(await http_request.body(), "export", format, template_version(request.template_id))
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
 
     try:
-        if format == "pdf":
-            preview_html = await preview_service.generate_preview(request.cv_data, request.template_id)
-            pdf_bytes = await export_service.to_pdf(preview_html)
-            return StreamingResponse(
-                BytesIO(pdf_bytes),
-                media_type="application/pdf",
-                headers={"Content-Disposition": "attachment; filename=cv.pdf"}
-            )
-        elif format == "docx":
-            docx_bytes = await export_service.to_docx(request.cv_data)
-            return StreamingResponse(
-                BytesIO(docx_bytes),
-                media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                headers={"Content-Disposition": "attachment; filename=cv.docx"}
-            )
+        return await _export_response(request.cv_data, request.template_id, format, etag)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
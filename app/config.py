@@ -1,6 +1,6 @@
 # app/config.py
 from pydantic.v1 import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 import os
 from pydantic import BaseModel
@@ -10,6 +10,7 @@ load_dotenv()
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DB_SCHEMA_MODE: str = "skip"  # skip | migrate | create_all, see database.init_schema
     # settings.py (add Redis configuration)
     REDISHOST = "localhost" or "redis.railway.internal"  # Or your Redis host if using a remote Redis instance
     REDISPORT = 6379  # Default Redis port
@@ -43,7 +44,66 @@ class Settings(BaseSettings):
     
     #OpenAI APi
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
-    
+
+    # Job matching
+    JOB_ANALYSIS_CACHE_SIZE: int = 512
+    JOB_ANALYSIS_CACHE_TTL: int = 6 * 60 * 60  # seconds
+    JOB_MATCH_MAX_POSTINGS: int = 50
+    JOB_MATCH_CONCURRENCY: int = 5  # parallel job analyses per batch
+    SKILL_EMBEDDING_DIM: int = 512
+    SKILL_EMBEDDING_CACHE_SIZE: int = 50_000
+    SKILL_MATCH_THRESHOLD: float = 0.65  # cosine similarity for a fuzzy match
+
+    # Preview rendering
+    PREVIEW_FRAGMENT_CACHE_SIZE: int = 4096  # rendered sections kept per process
+    PREVIEW_FRAGMENT_CACHE_TTL: int = 60 * 60  # seconds
+
+    # Live preview WebSocket (limits are per worker process)
+    PREVIEW_WS_MAX_SESSIONS: int = 200
+    PREVIEW_WS_MAX_SECTIONS: int = 100  # per session
+    PREVIEW_WS_MAX_MESSAGE_BYTES: int = 256 * 1024
+    PREVIEW_WS_MAX_SESSION_BYTES: int = 2 * 1024 * 1024  # section content held per session, as JSON
+    PREVIEW_WS_DEBOUNCE_MS: int = 150  # render once edits pause this long
+    PREVIEW_WS_MAX_DELAY_MS: int = 1000  # ...or at the latest this long after the first edit
+    PREVIEW_WS_AUTH_TIMEOUT: int = 10  # seconds to send the init message
+    PREVIEW_WS_IDLE_TIMEOUT: int = 5 * 60  # seconds without a message before the socket is closed
+
+    # Health probes (run in the background, endpoints serve the last result)
+    HEALTH_PROBES_ENABLED: bool = True
+    HEALTH_PROBE_INTERVAL: int = 15  # seconds, database and Redis
+    HEALTH_SLOW_PROBE_INTERVAL: int = 300  # seconds, S3 and the LLM API
+    HEALTH_PROBE_TIMEOUT: float = 3.0
+    HEALTH_CRITICAL_PROBES: List[str] = ["database"]  # /health/ready fails when one of these is down
+
+    # Server processes (read by gunicorn.conf.py)
+    PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None  # None: one per CPU available to the container, at most SERVER_MAX_WORKERS
+    SERVER_MAX_WORKERS: int = 4  # each worker holds its own WeasyPrint/LangChain, ~300MB
+    SERVER_PRELOAD: bool = True  # import the app once in the master and fork workers from it
+    SERVER_MAX_REQUESTS: int = 2000  # recycle a worker after this many requests to cap memory growth
+    SERVER_MAX_REQUESTS_JITTER: int = 200  # so workers don't all restart at once
+    SERVER_TIMEOUT: int = 120  # seconds a worker's event loop may stay blocked (a long PDF) before it is killed
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # seconds to finish in-flight requests on deploy or recycle
+    SERVER_KEEPALIVE: int = 5  # seconds an idle keep-alive connection stays open
+
+    # Import WeasyPrint, LangChain etc. in the background after startup instead of on first use
+    STARTUP_WARMUP: bool = True
+
+    # Logging (see utils/logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {}  # per-logger overrides, e.g. {"app.api.auth": "DEBUG"}
+    LOG_FORMAT: str = "json"  # json | text
+    LOG_QUEUE_SIZE: int = 10_000  # records waiting for the writer thread; beyond this they are dropped
+
+    # Exports
+    EXPORT_TIMING_HEADER: bool = False  # Server-Timing header with per-stage export timings (debugging)
+
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies go out as is
+    COMPRESSION_OFFLOAD_SIZE: int = 64 * 1024  # compress in a worker thread above this
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_GZIP_LEVEL: int = 6
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -1,9 +1,12 @@
 # app/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+import logging
 import os
+from pathlib import Path
 from dotenv import load_dotenv
+from .utils.metrics import TimedQueuePool, register_pool_metrics
 
 load_dotenv()
 
@@ -14,13 +17,53 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(DATABASE_URL)
+# QueuePool (the default for server databases) with checkout wait timing
+engine = create_engine(
+    DATABASE_URL,
+    **({} if DATABASE_URL.startswith("sqlite") else {"poolclass": TimedQueuePool})
+)
+register_pool_metrics(engine)
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        # SQLite ignores ON DELETE CASCADE / SET NULL unless each connection asks for it
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def init_schema(mode: str) -> None:
+    """
+    Bring the schema up at startup according to DB_SCHEMA_MODE:
+    "skip" touches nothing (migrations run once per deploy, before the workers),
+    "migrate" runs alembic upgrade head, "create_all" is for throwaway local databases.
+    """
+    if mode == "skip":
+        return
+    if mode == "migrate":
+        from alembic import command
+        from alembic.config import Config
+
+        command.upgrade(Config(str(ALEMBIC_INI)), "head")
+    elif mode == "create_all":
+        from . import models  # noqa: F401
+        from .models import database  # noqa: F401  registers CV, Section, CoverLetter...
+
+        Base.metadata.create_all(bind=engine)
+    else:
+        raise ValueError(f"Unknown DB_SCHEMA_MODE: {mode}")
+    logger.info(f"Database schema ready ({mode})")
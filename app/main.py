@@ -1,35 +1,72 @@
 # app/main.py
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 from app.api import cv, cover_letter
-from fastapi import FastAPI
+import anyio
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .database import engine
-from .models import Base
+from .database import init_schema
+from .middleware.compression import CompressionMiddleware, static_prefixes
+from .middleware.metrics import MetricsMiddleware
+from .middleware.request_id import RequestIdMiddleware
+from .services.health_service import health_monitor
+from .utils.logging_config import configure_logging
+from .utils.metrics import scrape
+from .utils.warmup import warm_up
 from app.api import auth
 from dotenv import load_dotenv
 import os
 load_dotenv()
 
+configure_logging(
+    level=settings.LOG_LEVEL,
+    levels=settings.LOG_LEVELS,
+    fmt=settings.LOG_FORMAT,
+    queue_size=settings.LOG_QUEUE_SIZE
+)
 
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # No schema reflection by default: run `alembic upgrade head` before the workers start
+    init_schema(settings.DB_SCHEMA_MODE)
+    if settings.HEALTH_PROBES_ENABLED:
+        await health_monitor.start()
+    # Heavy libraries load in the background while requests are already served
+    warmup = asyncio.create_task(anyio.to_thread.run_sync(warm_up)) if settings.STARTUP_WARMUP else None
+    yield
+    await health_monitor.stop()
+    if warmup is not None:
+        await asyncio.gather(warmup, return_exceptions=True)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    version=settings.VERSION
+    version=settings.VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson instead of json.dumps for every dict a route returns
 )
 
 FRONTEND_URL: str = os.getenv("FRONTEND_URL")
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Include Routers
 app.include_router(auth.router)
 app.include_router(cv.router)
 app.include_router(cover_letter.router)
 
+# Compress JSON/HTML responses (previews are mostly inline CSS)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    static_prefixes=static_prefixes
+)
+
 # CORS middleware
 allowed_origins = [
     "https://cv-builder-frontend-six.vercel.app",  
@@ -45,18 +82,44 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outside CORS and compression so latency includes them
+app.add_middleware(MetricsMiddleware)
+# Outside everything so every log line of a request, metrics included, carries its id
+app.add_middleware(RequestIdMiddleware)
+
 @app.route("/")
 def home():
     return "Backend is running!"
 
 @app.get("/health")
 async def health_check():
+    """Summary for humans and old monitors; served from the last background probes"""
+    database = health_monitor.result("database").status
     return {
-        "status": "healthy",
+        "status": "healthy" if health_monitor.ready() else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
         "service": "cv-builder-api",
-        "database": "connected"
+        "database": {"ok": "connected", "down": "disconnected"}.get(database, database),
+        "checks": health_monitor.snapshot()
     }
+
+@app.get("/health/live")
+async def liveness():
+    """The process is up and its event loop is answering; dependencies don't matter here"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """200 while every critical dependency passed its last probe, 503 otherwise"""
+    ready = health_monitor.ready()
+    return ORJSONResponse(
+        {"status": "ready" if ready else "not ready", "checks": health_monitor.snapshot()},
+        status_code=200 if ready else 503
+    )
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(scrape(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/test-cors")
 async def test_cors():
     return {"message": "CORS is working"}
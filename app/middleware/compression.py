@@ -0,0 +1,202 @@
+# app/middleware/compression.py
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import anyio
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..utils.metrics import register_cache
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/html",
+    "text/css",
+    "text/plain",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encodings(accept_encoding: str) -> Tuple[str, ...]:
+    """br/gzip the client accepts, best first (q-values honoured, br wins ties)"""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    accepted = [
+        (weights.get(encoding, weights.get("*", 0.0)), -rank, encoding)
+        for rank, encoding in enumerate(("br", "gzip"))
+    ]
+    return tuple(encoding for q, _, encoding in sorted(accepted, reverse=True) if q > 0)
+
+
+register_cache("accept_encoding", negotiate_encodings)
+
+
+class _PrimedGzip:
+    """A gzip stream that has already consumed a static prefix"""
+
+    def __init__(self, prefix: bytes, level: int):
+        self.prefix = prefix
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        self._head = self._compressor.compress(prefix)
+
+    def compress(self, body: bytes) -> bytes:
+        compressor = self._compressor.copy()
+        return self._head + compressor.compress(body[len(self.prefix):]) + compressor.flush()
+
+
+class StaticPrefixCache:
+    """
+    Response bodies that start with a known static fragment (the inline CSS
+    head of a CV template) reuse a compressor primed with that fragment, so
+    only the dynamic tail is compressed per request. zlib compressors can be
+    copied; brotli's can't, so this only serves gzip clients. Brotli at a low
+    quality costs about the same as the primed gzip and is still smaller.
+    """
+
+    def __init__(self, level: int = 6, max_entries: int = 64):
+        self.level = level
+        self.max_entries = max_entries
+        self._entries: List[_PrimedGzip] = []
+
+    def register(self, prefix: bytes) -> None:
+        if len(prefix) < 256 or len(self._entries) >= self.max_entries:
+            return
+        if any(entry.prefix == prefix for entry in self._entries):
+            return
+        self._entries.append(_PrimedGzip(prefix, self.level))
+        self._entries.sort(key=lambda entry: len(entry.prefix), reverse=True)
+
+    def gzip(self, body: bytes) -> Optional[bytes]:
+        for entry in self._entries:  # longest first
+            if body.startswith(entry.prefix):
+                return entry.compress(body)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CompressionMiddleware:
+    """
+    br/gzip for buffered responses above a size threshold whose content type
+    is on the allowlist. Streaming responses (exports) pass through untouched,
+    and large bodies are compressed in a worker thread. Every response with an
+    allowlisted type carries Vary: Accept-Encoding, compressed or not.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        brotli_quality: int = 4,
+        gzip_level: int = 6,
+        content_types: Tuple[str, ...] = COMPRESSIBLE_TYPES,
+        static_prefixes: Optional[StaticPrefixCache] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.brotli_quality = brotli_quality
+        self.gzip_level = gzip_level
+        self.content_types = content_types
+        self.static_prefixes = static_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encodings = negotiate_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        await self.app(scope, receive, _CompressionResponder(self, encodings, send).send)
+
+    def compress(self, body: bytes, encodings: Tuple[str, ...]) -> Tuple[bytes, str]:
+        """Compressed body and the encoding used"""
+        if self.static_prefixes is not None and encodings[0] == "gzip":
+            primed = self.static_prefixes.gzip(body)
+            if primed is not None:
+                return primed, "gzip"
+        if encodings[0] == "br":
+            return brotli.compress(body, quality=self.brotli_quality), "br"
+        return zlib.compress(body, self.gzip_level, wbits=31), "gzip"
+
+    def compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return content_type in self.content_types
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encodings: Tuple[str, ...], send: Send):
+        self.middleware = middleware
+        self.encodings = encodings
+        self._send = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            if status < 200 or status in (204, 304) or not self.middleware.compressible(Headers(raw=message["headers"])):
+                self.passthrough = True
+                await self._send(message)
+                return
+            # Compressed or not, this route's body depends on Accept-Encoding, so shared caches must key on it
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            if not self.encodings:
+                self.passthrough = True
+                await self._send(message)
+                return
+            self.start = message  # held until we know the body
+            return
+
+        if message["type"] != "http.response.body" or self.start is None:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.middleware.minimum_size:
+            # Streaming or too small to be worth it: send as is
+            self.passthrough = True
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        if len(body) >= self.middleware.offload_size:
+            compressed, encoding = await anyio.to_thread.run_sync(
+                self.middleware.compress, body, self.encodings
+            )
+        else:
+            compressed, encoding = self.middleware.compress(body, self.encodings)
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(compressed))
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"  # a different byte representation
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+
+# Shared by the middleware and the routes that register their static fragments
+static_prefixes = StaticPrefixCache(level=settings.COMPRESSION_GZIP_LEVEL)
@@ -0,0 +1,50 @@
+# app/middleware/metrics.py
+import time
+from typing import Any, Dict, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS
+
+
+class MetricsMiddleware:
+    """
+    Latency per (method, route template, status) and requests in flight.
+    The route label is the path template FastAPI matched (/api/cv/{cv_id}),
+    never the raw path; anything unrouted is "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+        self._children: Dict[Tuple[str, str, int], Any] = {}
+
+    def _child(self, method: str, route: str, status: int):
+        key = (method, route, status)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = HTTP_REQUEST_SECONDS.labels(method, route, str(status))
+        return child
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # unless a response starts
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")  # set on the scope by the router on a match
+            route_path = getattr(route, "path", None) or "unmatched"
+            self._child(scope["method"], route_path, status).observe(time.perf_counter() - start)
@@ -1,6 +1,12 @@
 # app/models/__init__.py
 from .user import User
 from ..database import Base  # Import Base from database
+from .database import CV, CVProfile, CVStatus, CoverLetter, Section
+from .section import SectionCreate, SectionUpdate
+from .read_models import CVView, SectionView
 
 # Export all models and Base
-__all__ = ["User", "CV", "Base"]
\ No newline at end of file
+__all__ = [
+    "User", "CV", "CVProfile", "CVStatus", "CoverLetter", "Section", "Base",
+    "SectionCreate", "SectionUpdate", "CVView", "SectionView"
+]
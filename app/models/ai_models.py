@@ -35,7 +35,7 @@ class CVAnalysis(BaseModel):
     match_level: Optional[str] = Field(None, description="Match level description")
 
 class CoverLetterRequest(BaseModel):
-    cv_id: Optional[str] = Field(None, description="ID of saved CV")
+    cv_id: Optional[uuid.UUID] = Field(None, description="ID of saved CV")
     cv_content: Optional[Dict] = Field(None, description="CV content if not using saved CV")
     job_description: str = Field(..., description="Job posting content or URL")
     company_website: Optional[str] = Field(None, description="Company website URL")
@@ -70,4 +70,25 @@ class CoverLetterResponse(BaseModel):
     company_name: str
     matching_score: float
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    cv_id: Optional[str] = None
\ No newline at end of file
+    cv_id: Optional[str] = None
+
+class JobMatchRequest(BaseModel):
+    cv_id: Optional[uuid.UUID] = Field(None, description="ID of saved CV")
+    cv_content: Optional[Dict] = Field(None, description="CV content if not using saved CV")
+    job_descriptions: List[str] = Field(..., min_length=1, description="Job postings to rank the CV against")
+    fuzzy: bool = Field(False, description="Match similar skill names, not just identical ones")
+
+class JobMatchResult(BaseModel):
+    index: int = Field(description="Position of the posting in the request")
+    job_title: Optional[str] = None
+    company_name: Optional[str] = None
+    matching_score: float = 0.0
+    match_level: str = "Limited Match"
+    scores: Dict[str, float] = Field(default_factory=dict, description="Component scores")
+    error: Optional[str] = None
+
+class JobMatchResponse(BaseModel):
+    results: List[JobMatchResult]
+    credits_used: int
+    cached_analyses: int = 0
+    cv_id: Optional[str] = None
@@ -1,43 +1,37 @@
 # app/models/cv.py
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-import uuid
-from ..database import Base
-
-class CV(Base):
-    __tablename__ = "cvs"
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    cv_data = Column(JSON)
-    template_id = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    profile_image = Column(String, nullable=True)
-    # Relationships
-    user = relationship("User", back_populates="cvs")
-    sections = relationship("Section", back_populates="cv", cascade="all, delete-orphan")
-# Pydantic models for request validation
+# The CV table is mapped once, in database.py; these are the API schemas for it
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import List, Optional
 from uuid import UUID
+from .database import CV, CVStatus
+from .section import SectionCreate, SectionResponse, SectionUpdate
+
+# CV is re-exported for callers that import the table along with its schemas
+__all__ = ["CV", "CVCreate", "CVUpdate", "CVResponse"]
 
 class CVCreate(BaseModel):
-    cv_data: Dict[str, Any]
+    title: Optional[str] = "Untitled CV"
     template_id: str
+    sections: List[SectionCreate]
+
+class CVUpdate(BaseModel):
+    title: Optional[str] = None
+    template_id: Optional[str] = None
+    sections: Optional[List[SectionUpdate]] = None
+    status: Optional[CVStatus] = None
 
 class CVResponse(BaseModel):
     id: UUID
     user_id: UUID
-    cv_data: Dict[str, Any]
+    title: str
     template_id: str
+    status: Optional[CVStatus] = None
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None
     profile_image: Optional[str] = None
+    sections: List[SectionResponse] = []
 
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
@@ -1,14 +1,14 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, JSON, DateTime, Text, Enum
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, JSON, DateTime, Text, Enum, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy import Column, Float
 import uuid
 from ..database import Base
 import enum
-from pydantic import BaseModel, UUID4  # Make sure to use UUID4 from Pydantic
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+
+# JSONB on Postgres (binary, indexable), plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
 
 class CVStatus(enum.Enum):
     DRAFT = "draft"
@@ -22,36 +22,53 @@ class CV(Base):
     title = Column(String, nullable=False, default="Untitled CV")
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     template_id = Column(String, nullable=False)
-    status = Column(Enum(CVStatus), default=CVStatus.DRAFT)  # Add this line
+    status = Column(Enum(CVStatus), default=CVStatus.DRAFT, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     profile_image = Column(String, nullable=True)
 
     # Relationships
     user = relationship("User", back_populates="cvs")
-    sections = relationship("Section", back_populates="cv", cascade="all, delete-orphan",lazy="joined")
-    cover_letters = relationship("CoverLetter", back_populates="cv")
+    # passive_deletes: the database cascades, so deleting a CV doesn't load its children
+    sections = relationship("Section", back_populates="cv", cascade="all, delete-orphan", order_by="Section.order_index", passive_deletes=True)
+    cover_letters = relationship("CoverLetter", back_populates="cv", passive_deletes=True)
+    profile = relationship("CVProfile", back_populates="cv", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
 
 class Section(Base):
     __tablename__ = "sections"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    cv_id = Column(UUID(as_uuid=True), ForeignKey("cvs.id", ondelete="CASCADE"))
+    cv_id = Column(UUID(as_uuid=True), ForeignKey("cvs.id", ondelete="CASCADE"), index=True)
     type = Column(String, nullable=False)
     title = Column(String, nullable=False)
-    content = Column(JSON, nullable=False)
+    content = Column(JSONType, nullable=False)
     order_index = Column(Integer, nullable=False)
+    style_config = Column(JSONType, nullable=True)  # per-section overrides of the template style
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Changed this line
 
     cv = relationship("CV", back_populates="sections")
     
+class CVProfile(Base):
+    """Job-independent facts extracted from a CV, rebuilt whenever its sections change"""
+    __tablename__ = "cv_profiles"
+
+    cv_id = Column(UUID(as_uuid=True), ForeignKey("cvs.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(String, nullable=False)  # hash of the sections the profile was built from
+    facts = Column(JSONType, nullable=False)
+    skills = Column(JSONType, nullable=False)  # normalized skill names
+    skill_embeddings = Column(LargeBinary, nullable=True)  # float32 rows, one per skill
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    cv = relationship("CV", back_populates="profile")
+
 class CoverLetter(Base):
     __tablename__ = "cover_letters"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    cv_id = Column(UUID(as_uuid=True), ForeignKey("cvs.id"), nullable=True)
+    cv_id = Column(UUID(as_uuid=True), ForeignKey("cvs.id", ondelete="SET NULL"), nullable=True)
     job_id = Column(UUID(as_uuid=True), nullable=True)  # For future job tracking feature
     content = Column(Text, nullable=False)
     job_title = Column(String, nullable=True)
@@ -63,25 +80,29 @@ class CoverLetter(Base):
     # Relationships
     user = relationship("User", back_populates="cover_letters")
     cv = relationship("CV", back_populates="cover_letters")
-    
-# Pydantic models for API validation
-class SectionCreate(BaseModel):
-    id: UUID4  # Use UUID4 here
-    type: str
-    title: str
-    content: Dict[str, Any]
-    order_index: int
-
-class CVCreate(BaseModel):
-    title: Optional[str] = "Untitled CV"
-    template_id: str
-    sections: List[SectionCreate]
-
-class SectionUpdate(SectionCreate):
-    id: UUID4  # Use UUID4 here
-
-class CVUpdate(BaseModel):
-    title: Optional[str]
-    template_id: Optional[str]
-    sections: Optional[List[SectionUpdate]]
-    status: Optional[CVStatus]
+
+# CV list: one user's CVs newest first (also serves plain user_id lookups)
+Index("ix_cvs_user_id_created_at", CV.user_id, CV.created_at.desc(), CV.id.desc())
+
+# Containment (@>) lookups inside section content and profile skills
+Index(
+    "ix_sections_content_gin",
+    Section.content,
+    postgresql_using="gin",
+    postgresql_ops={"content": "jsonb_path_ops"}
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_cv_profiles_skills_gin",
+    CVProfile.skills,
+    postgresql_using="gin",
+    postgresql_ops={"skills": "jsonb_path_ops"}
+).ddl_if(dialect="postgresql")
+
+# Cover letter history: one user's letters newest first, summary columns included
+Index(
+    "ix_cover_letters_user_id_created_at",
+    CoverLetter.user_id,
+    CoverLetter.created_at.desc(),
+    CoverLetter.id.desc(),
+    postgresql_include=["job_title", "company_name", "matching_score", "cv_id"]
+)
@@ -0,0 +1,121 @@
+# app/models/read_models.py
+"""
+Read-only views of a CV for the preview, export and AI services.
+Plain frozen slotted dataclasses: no ORM instrumentation, no identity map,
+no lazy loads, and safe to share between requests.
+"""
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from uuid import UUID
+
+from ..utils.dates import to_datetime
+
+Identifier = Union[UUID, str]  # UUIDs from the database, strings from request JSON
+
+DATED_SECTION_TYPES = ("experience", "education")
+DATE_FIELDS = ("startDate", "endDate")
+
+
+@dataclass(frozen=True, slots=True)
+class SectionView:
+    type: str
+    title: str
+    content: Any
+    order_index: int = 0
+    style_config: Optional[Dict[str, Any]] = None
+    id: Optional[Identifier] = None
+
+    @classmethod
+    def from_row(cls, row: Any) -> "SectionView":
+        """From an ORM Section or a Row with the same column names"""
+        return cls(
+            type=row.type,
+            title=row.title,
+            content=row.content,
+            order_index=row.order_index or 0,
+            style_config=getattr(row, "style_config", None),
+            id=getattr(row, "id", None),
+        )
+
+    def normalized(self) -> "SectionView":
+        """
+        A copy whose experience/education dates are datetimes (None when
+        missing or unparseable), as the HTML and DOCX renderers expect.
+        Entries become new dicts in a tuple; the original content is untouched.
+        """
+        if self.type not in DATED_SECTION_TYPES or not isinstance(self.content, (list, tuple)):
+            return self
+        content = tuple(
+            {**item, **{field: to_datetime(item.get(field)) for field in DATE_FIELDS}}
+            if isinstance(item, dict) else item
+            for item in self.content
+        )
+        return replace(self, content=content)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SectionView":
+        """From request JSON ("order" is accepted for older clients)"""
+        return cls(
+            type=data.get("type") or "",
+            title=data.get("title") or "",
+            content=data.get("content"),
+            order_index=data.get("order_index", data.get("order")) or 0,
+            style_config=data.get("style_config"),
+            id=data.get("id"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CVView:
+    sections: Tuple[SectionView, ...] = ()
+    template_id: Optional[str] = None
+    id: Optional[Identifier] = None
+    user_id: Optional[Identifier] = None
+    title: Optional[str] = None
+    status: Optional[str] = None
+    profile_image: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    normalized_dates: bool = False  # set by normalized()
+
+    def normalized(self) -> "CVView":
+        """The render-ready view; built once per request and shared by preview and export"""
+        if self.normalized_dates:
+            return self
+        return replace(
+            self,
+            sections=tuple(section.normalized() for section in self.sections),
+            normalized_dates=True
+        )
+
+    @staticmethod
+    def _ordered(sections: Iterable[SectionView]) -> Tuple[SectionView, ...]:
+        return tuple(sorted(sections, key=lambda s: s.order_index))
+
+    @classmethod
+    def from_row(cls, row: Any, sections: Iterable[Any]) -> "CVView":
+        """From an ORM CV (or a Row of its columns) and its section rows"""
+        status = getattr(row, "status", None)
+        return cls(
+            sections=cls._ordered(SectionView.from_row(s) for s in sections),
+            template_id=row.template_id,
+            id=row.id,
+            user_id=row.user_id,
+            title=row.title,
+            status=status.value if status is not None else None,
+            profile_image=row.profile_image,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], template_id: Optional[str] = None) -> "CVView":
+        """From the cv_data payload the preview/export endpoints receive"""
+        return cls(
+            sections=cls._ordered(SectionView.from_dict(s) for s in data.get("sections") or []),
+            template_id=template_id or data.get("template_id"),
+            id=data.get("id"),
+            title=data.get("title"),
+            profile_image=data.get("profile_image"),
+        )
@@ -1,23 +1,40 @@
 # app/models/section.py
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-import uuid
-from ..database import Base
+# The sections table is mapped once, in database.py; these are the API schemas for it
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from uuid import UUID
+from .database import Section
 
-class Section(Base):
-    __tablename__ = "sections"
+# Section is re-exported for callers that import the table along with its schemas
+__all__ = ["Section", "SectionCreate", "SectionUpdate", "SectionOrder", "SectionResponse"]
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    cv_id = Column(UUID(as_uuid=True), ForeignKey("cvs.id", ondelete="CASCADE"))
-    type = Column(String, nullable=False)  # contact, text, experience, education, skills, languages
-    title = Column(String, nullable=False)
-    content = Column(JSON, nullable=False, default=dict)
-    order_index = Column(Integer, nullable=False)
-    style_config = Column(JSON, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+class SectionCreate(BaseModel):
+    cv_id: Optional[UUID] = None
+    type: str  # contact, text, experience, education, skills, languages
+    title: str
+    content: Any
+    order_index: int
+    style_config: Optional[Dict[str, Any]] = None
 
-    # Relationship
-    cv = relationship("CV", back_populates="sections")
\ No newline at end of file
+class SectionUpdate(BaseModel):
+    id: Optional[UUID] = None
+    type: Optional[str] = None
+    title: Optional[str] = None
+    content: Optional[Any] = None
+    order_index: Optional[int] = None
+    style_config: Optional[Dict[str, Any]] = None
+
+class SectionOrder(BaseModel):
+    id: UUID
+    order: int
+
+class SectionResponse(BaseModel):
+    id: Optional[UUID] = None
+    type: str
+    title: str
+    content: Any
+    order_index: int
+    style_config: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
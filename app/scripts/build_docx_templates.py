@@ -0,0 +1,25 @@
+# app/scripts/build_docx_templates.py
+"""
+Writes the base .docx of every CV template to app/templates/docx from
+TEMPLATE_STYLES. Re-run after changing the styles; a designer can also edit
+the generated files in Word directly (keep the Title, Heading 1 and
+List Bullet styles, they are what the export fills in).
+
+    python -m app.scripts.build_docx_templates
+"""
+import os
+
+from ..services.docx_engine import DOCX_TEMPLATE_DIR, TEMPLATE_STYLES, build_base
+
+
+def build_docx_templates(template_dir: str = DOCX_TEMPLATE_DIR) -> None:
+    os.makedirs(template_dir, exist_ok=True)
+    for template_id, style in TEMPLATE_STYLES.items():
+        path = os.path.join(template_dir, f"{template_id}.docx")
+        with open(path, "wb") as f:
+            f.write(build_base(style))
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    build_docx_templates()
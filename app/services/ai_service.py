@@ -13,28 +13,60 @@ from ..models.ai_models import (
     CoverLetterDraft,
     CoverLetterRequest,
     CoverLetterResponse,
+    JobMatchResult,
+    JobMatchResponse,
     WriteStyle
 )
+from ..models.database import CVProfile
+from .cv_profile_service import experience_years
+from ..utils.cache import TTLCache
+from ..utils.embeddings import skill_index
+from ..utils.text_matcher import compile_matcher
+from ..utils.metrics import register_cache
+from .llm_metrics import llm_metrics, llm_stage
+import asyncio
+import hashlib
 import logging
+import numpy as np
+import re
 
 logger = logging.getLogger(__name__)
 
+# Job analyses are shared by every request in the worker: the same posting
+# is often analysed for a match ranking and then again for the letter itself.
+_job_analysis_cache = TTLCache(
+    maxsize=settings.JOB_ANALYSIS_CACHE_SIZE,
+    ttl=settings.JOB_ANALYSIS_CACHE_TTL
+)
+register_cache("job_analysis", _job_analysis_cache)
+
+# "5+ years", "3 yrs", "10 years' experience"
+_YEARS_RE = re.compile(r"(\d{1,2})\s*\+?\s*(?:years?|yrs?)\b", re.I)
+
+
+def _job_cache_key(job_description: str) -> str:
+    normalized = " ".join(job_description.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
 class CoverLetterService:
     def __init__(self):
         self.llm_analyzer = ChatOpenAI(
             model_name="gpt-4o-mini",  # Make sure this matches available models
             temperature=0.2,
-            api_key=settings.OPENAI_API_KEY
+            api_key=settings.OPENAI_API_KEY,
+            callbacks=[llm_metrics]
         )
         self.llm_writer = ChatOpenAI(
             model_name="gpt-4o-mini",
             temperature=0.7,
-            api_key=settings.OPENAI_API_KEY
+            api_key=settings.OPENAI_API_KEY,
+            callbacks=[llm_metrics]
         )
         
     async def generate_cover_letter(
         self,
-        request: CoverLetterRequest
+        request: CoverLetterRequest,
+        cv_profile: Optional[CVProfile] = None
     ) -> CoverLetterResponse:
         """Main method to handle cover letter generation process"""
         try:
@@ -45,11 +77,14 @@ class CoverLetterService:
             job_analysis = await self._analyze_job_posting(request.job_description)
             total_tokens_used += job_analysis.get("tokens_used", 0)
             
-            # Analyze CV
-            cv_analysis = await self._analyze_cv(
-                request.cv_content,
-                job_analysis["analysis"]
-            )
+            # Analyze CV (a stored profile avoids a second LLM round trip)
+            if cv_profile is not None:
+                cv_analysis = self._analyze_cv_profile(cv_profile, job_analysis["analysis"])
+            else:
+                cv_analysis = await self._analyze_cv(
+                    request.cv_content,
+                    job_analysis["analysis"]
+                )
             total_tokens_used += cv_analysis.get("tokens_used", 0)
             
             # Generate initial draft
@@ -93,14 +128,106 @@ class CoverLetterService:
                 job_title=job_analysis["analysis"].position,
                 company_name=job_analysis["analysis"].company_name,
                 matching_score=float(draft.get("matching_score", 0)),
-                cv_id=request.cv_id
+                cv_id=str(request.cv_id) if request.cv_id else None
             )
             
         except Exception as e:
             logger.error(f"Cover letter generation failed: {str(e)}")
             raise
 
+    async def match_jobs(
+        self,
+        cv_content: dict,
+        job_descriptions: List[str],
+        fuzzy: bool = False,
+        cv_profile: Optional[CVProfile] = None
+    ) -> JobMatchResponse:
+        """Rank one CV against many job postings without drafting any letters"""
+        try:
+            semaphore = asyncio.Semaphore(settings.JOB_MATCH_CONCURRENCY)
+
+            async def analyze(description: str) -> Dict:
+                async with semaphore:
+                    return await self._analyze_job_posting(description)
+
+            outcomes = await asyncio.gather(
+                *(analyze(description) for description in job_descriptions),
+                return_exceptions=True
+            )
+
+            total_tokens_used = 0
+            cached_analyses = 0
+            analysed: List[int] = []
+            job_analyses: List[JobAnalysis] = []
+            results: Dict[int, JobMatchResult] = {}
+            for index, outcome in enumerate(outcomes):
+                if isinstance(outcome, Exception):
+                    results[index] = JobMatchResult(index=index, error=str(outcome))
+                    continue
+                total_tokens_used += outcome.get("tokens_used", 0)
+                cached_analyses += int(outcome.get("cached", False))
+                analysed.append(index)
+                job_analyses.append(outcome["analysis"])
+
+            if job_analyses:
+                # A single CV analysis against the union of all requirements
+                merged_analysis = self._merge_job_analyses(job_analyses)
+                if cv_profile is not None:
+                    cv_analysis = self._analyze_cv_profile(cv_profile, merged_analysis)
+                else:
+                    cv_analysis = await self._analyze_cv(cv_content, merged_analysis)
+                total_tokens_used += cv_analysis.get("tokens_used", 0)
+
+                scores = self._calculate_matching_scores(
+                    cv_analysis["analysis"], job_analyses, fuzzy=fuzzy
+                )
+                for index, job_analysis, score in zip(analysed, job_analyses, scores):
+                    results[index] = JobMatchResult(
+                        index=index,
+                        job_title=job_analysis.position,
+                        company_name=job_analysis.company_name,
+                        matching_score=score["total_score"],
+                        match_level=self._get_match_details(score["total_score"]),
+                        scores=score
+                    )
+
+            ranked = sorted(
+                results.values(),
+                key=lambda result: (result.error is not None, -result.matching_score, result.index)
+            )
+            return JobMatchResponse(
+                results=ranked,
+                credits_used=int(round(total_tokens_used)),
+                cached_analyses=cached_analyses
+            )
+
+        except Exception as e:
+            logger.error(f"Job matching failed: {str(e)}")
+            raise
+
+    def _merge_job_analyses(self, job_analyses: List[JobAnalysis]) -> JobAnalysis:
+        """Combine several postings into one set of requirements for CV analysis"""
+        def union(values):
+            return list(dict.fromkeys(v for v in values if v))
+
+        return JobAnalysis(
+            company_name=", ".join(union(a.company_name for a in job_analyses)),
+            position="; ".join(union(a.position for a in job_analyses)),
+            key_requirements=union(r for a in job_analyses for r in a.key_requirements),
+            required_skills=union(s for a in job_analyses for s in a.required_skills),
+            company_values=union(v for a in job_analyses for v in a.company_values),
+            contact_info=None,
+            department=None,
+            location=None,
+            employment_type=None
+        )
+
     async def _analyze_job_posting(self, job_description: str) -> Dict:
+        cache_key = _job_cache_key(job_description)
+        cached = _job_analysis_cache.get(cache_key)
+        if cached is not None:
+            return {"analysis": cached, "tokens_used": 0, "cached": True}
+
         try:
             parser = PydanticOutputParser(pydantic_object=JobAnalysis)
             
@@ -119,8 +246,9 @@ class CoverLetterService:
             response = await chain.ainvoke({
                 "job_description": job_description,
                 "format_instructions": parser.get_format_instructions()
-            })
+            }, config=llm_stage("job_analysis"))
 
+            _job_analysis_cache.set(cache_key, response)
             return {
                 "analysis": response,
                 "tokens_used": int(len(str(response).split()) * 1.3)
@@ -203,7 +331,7 @@ class CoverLetterService:
                 "position": job_analysis.position,
                 "required_skills": ", ".join(job_analysis.required_skills),
                 "key_requirements": ", ".join(job_analysis.key_requirements)
-            })
+            }, config=llm_stage("cv_analysis"))
 
             response_content = response.content if hasattr(response, 'content') else str(response)
             
@@ -216,6 +344,56 @@ class CoverLetterService:
             logger.error(f"CV analysis failed: {str(e)}")
             raise ValueError(f"Failed to analyze CV: {str(e)}")
 
+    def _analyze_cv_profile(self, profile: CVProfile, job_analysis: JobAnalysis) -> Dict:
+        """Build the CV analysis from a stored profile, locally and without tokens"""
+        facts = profile.facts or {}
+
+        # Required skills the candidate has, in the posting's own wording
+        required = list(job_analysis.required_skills)
+        closest = skill_index.best_match_scores(required, profile.skills or [])
+        highlighted = [
+            skill for skill, score in zip(required, closest)
+            if score >= settings.SKILL_MATCH_THRESHOLD
+        ]
+
+        experiences = facts.get("experiences", [])
+        summary = facts.get("summary") or ""
+
+        # Requirements the summary or a role description covers, in the posting's
+        # own wording (experience scoring compares these), then every role with
+        # what the candidate did there (the letter prompt works from these)
+        requirements = list(job_analysis.key_requirements)
+        cv_text = "\n".join([summary] + [exp.get("description") or "" for exp in experiences])
+        covered = compile_matcher(tuple(requirements)).matched(cv_text) if requirements else set()
+        key_experiences = [req for index, req in enumerate(requirements) if index in covered]
+        for exp in experiences:
+            role = " at ".join(filter(None, [exp.get("position"), exp.get("company")]))
+            entry = ": ".join(filter(None, [role, exp.get("description")]))
+            if entry:
+                key_experiences.append(entry)
+
+        if not summary and experiences:
+            role = " at ".join(filter(None, [experiences[0].get("position"), experiences[0].get("company")]))
+            summary = f"{role} skilled in {', '.join(facts.get('skills', [])[:5])}"
+
+        # "5+ years of ..." in the posting against the years the dated roles cover
+        required_years = [int(years) for req in requirements for years in _YEARS_RE.findall(req)]
+        if required_years:
+            experience_level_match = experience_years(experiences) >= max(required_years)
+        else:
+            experience_level_match = bool(experiences) or None
+
+        analysis = CVAnalysis(
+            key_experiences=key_experiences,
+            highlighted_skills=highlighted,
+            achievements=facts.get("achievements", []),
+            value_proposition=summary[:500],
+            education_match=bool(facts.get("education")),
+            experience_level_match=experience_level_match,
+            skill_match_score=round(len(highlighted) / len(required), 2) if required else None
+        )
+        return {"analysis": analysis, "tokens_used": 0}
+
     async def _generate_draft(
         self, 
         cv_data: dict,  # Complete CV data
@@ -250,7 +428,7 @@ class CoverLetterService:
                 "cv_data": cv_data,
                 "job_data": job_data,
                 "style": request.style
-            })
+            }, config=llm_stage("draft"))
 
             return {
                 "content": response.content,
@@ -325,7 +503,8 @@ class CoverLetterService:
             response = await chain.arun(
                 draft=draft,
                 style=style,
-                tone_preferences=tone_preferences
+                tone_preferences=tone_preferences,
+                metadata=llm_stage("refine")["metadata"]
             )
             
             return {
@@ -336,11 +515,31 @@ class CoverLetterService:
             logger.error(f"Refine draft failed: {str(e)}")
             raise ValueError(f"Failed to generate: {str(e)}")
 
-    def _calculate_matching_score(self, cv_analysis: CVAnalysis, job_analysis: JobAnalysis) -> Dict:
+    def _calculate_matching_score(
+        self,
+        cv_analysis: CVAnalysis,
+        job_analysis: JobAnalysis,
+        fuzzy: bool = False
+    ) -> Dict:
         """
         Calculate job matching score based on various factors.
         Returns a dict with total score and individual component scores
         """
+        return self._calculate_matching_scores(cv_analysis, [job_analysis], fuzzy=fuzzy)[0]
+
+    def _calculate_matching_scores(
+        self,
+        cv_analysis: CVAnalysis,
+        job_analyses: List[JobAnalysis],
+        fuzzy: bool = False
+    ) -> List[Dict]:
+        """
+        Score one CV against many postings at once.
+        Every posting becomes a row of an incidence matrix over the shared
+        skill/requirement vocabulary, so all scores come out of a few matrix ops.
+        With fuzzy=True a term counts as present when its local embedding is
+        close enough to one of the candidate's terms ("Postgres" ~ "PostgreSQL").
+        """
         try:
             weights = {
                 'skills': 0.35,
@@ -348,59 +547,88 @@ class CoverLetterService:
                 'education': 0.15,
                 'achievements': 0.20
             }
-            
+
+            def coverage(required: List[List[str]], candidate: set) -> np.ndarray:
+                # Fraction of each posting's (lowercased) terms found in candidate
+                rows = [set(term.lower() for term in terms) for terms in required]
+                vocabulary = {term: i for i, term in enumerate(set().union(*rows))}
+                incidence = np.zeros((len(rows), len(vocabulary)))
+                for row, terms in enumerate(rows):
+                    incidence[row, [vocabulary[t] for t in terms]] = 1.0
+                present = np.zeros(len(vocabulary))
+                if fuzzy:
+                    # vocabulary keys are in column order
+                    closest = skill_index.best_match_scores(list(vocabulary), list(candidate))
+                    present[:] = closest >= settings.SKILL_MATCH_THRESHOLD
+                else:
+                    present[[i for t, i in vocabulary.items() if t in candidate]] = 1.0
+                totals = incidence.sum(axis=1)
+                return np.divide(incidence @ present, totals, out=np.zeros_like(totals), where=totals > 0)
+
             # Skills matching
-            skills_score = 0
-            required_skills = set(s.lower() for s in job_analysis.required_skills)
-            candidate_skills = set(s.lower() for s in cv_analysis.highlighted_skills)
-            if required_skills:
-                skills_score = len(required_skills.intersection(candidate_skills)) / len(required_skills)
-            
+            skills_scores = coverage(
+                [a.required_skills for a in job_analyses],
+                set(s.lower() for s in cv_analysis.highlighted_skills)
+            )
+
             # Experience matching
-            experience_score = 0
-            key_requirements = set(req.lower() for req in job_analysis.key_requirements)
-            experiences = set(exp.lower() for exp in cv_analysis.key_experiences)
-            if key_requirements:
-                experience_score = len(key_requirements.intersection(experiences)) / len(key_requirements)
-            
+            experience_scores = coverage(
+                [a.key_requirements for a in job_analyses],
+                set(exp.lower() for exp in cv_analysis.key_experiences)
+            )
+
             # Education match
             education_score = 1.0 if cv_analysis.education_match else 0.5
-            
-            # Achievement relevance score
-            achievement_score = 0
+
+            # Achievement relevance: one automaton over every posting's requirements,
+            # then achievements x requirements against postings x requirements
+            achievement_scores = np.zeros(len(job_analyses))
             if cv_analysis.achievements:
-                relevant_achievements = sum(
-                    1 for achievement in cv_analysis.achievements
-                    if any(req.lower() in achievement.lower() for req in job_analysis.key_requirements)
-                )
-                achievement_score = min(relevant_achievements / 3, 1.0)
-            
-            # Calculate weighted total score
-            total_score = round(
-                skills_score * weights['skills'] +
-                experience_score * weights['experience'] +
+                requirements = list(dict.fromkeys(
+                    req for a in job_analyses for req in a.key_requirements
+                ))
+                column = {req: i for i, req in enumerate(requirements)}
+                matcher = compile_matcher(tuple(requirements))
+                achieved = np.zeros((len(cv_analysis.achievements), len(requirements)))
+                for row, achievement in enumerate(cv_analysis.achievements):
+                    achieved[row, list(matcher.matched(achievement))] = 1.0
+                wanted = np.zeros((len(job_analyses), len(requirements)))
+                for row, analysis in enumerate(job_analyses):
+                    wanted[row, [column[req] for req in analysis.key_requirements]] = 1.0
+                relevant_achievements = ((achieved @ wanted.T) > 0).sum(axis=0)
+                achievement_scores = np.minimum(relevant_achievements / 3, 1.0)
+
+            # Calculate weighted total scores
+            totals = (
+                skills_scores * weights['skills'] +
+                experience_scores * weights['experience'] +
                 education_score * weights['education'] +
-                achievement_score * weights['achievements'],
-                2
+                achievement_scores * weights['achievements']
             )
-            
-            return {
-                'total_score': total_score,
-                'skills_score': round(skills_score, 2),
-                'experience_score': round(experience_score, 2),
-                'education_score': round(education_score, 2),
-                'achievement_score': round(achievement_score, 2)
-            }
-            
+
+            return [
+                {
+                    'total_score': round(float(totals[i]), 2),
+                    'skills_score': round(float(skills_scores[i]), 2),
+                    'experience_score': round(float(experience_scores[i]), 2),
+                    'education_score': round(education_score, 2),
+                    'achievement_score': round(float(achievement_scores[i]), 2)
+                }
+                for i in range(len(job_analyses))
+            ]
+
         except Exception as e:
             logger.error(f"Error calculating matching score: {str(e)}")
-            return {
-                'total_score': 0.0,
-                'skills_score': 0.0,
-                'experience_score': 0.0,
-                'education_score': 0.0,
-                'achievement_score': 0.0
-            }
+            return [
+                {
+                    'total_score': 0.0,
+                    'skills_score': 0.0,
+                    'experience_score': 0.0,
+                    'education_score': 0.0,
+                    'achievement_score': 0.0
+                }
+                for _ in job_analyses
+            ]
 
     def _get_match_details(self, score: float) -> str:
         """Get matching level description based on score"""
@@ -423,49 +651,28 @@ class CoverLetterService:
         try:
             covered_points = []
             
-            # Clean and lowercase the content for comparison
-            clean_content = content.lower()
+            # One automaton for every requirement and skill, one pass over the letter
+            requirements = list(job_analysis.key_requirements)
+            skills = list(job_analysis.required_skills)
+            matcher = compile_matcher(tuple(requirements + skills))
+            found = matcher.first_matches(content)
             
             # Dictionary to track requirement coverage with context
             coverage = {}
             
-            # Check key requirements coverage
-            for requirement in job_analysis.key_requirements:
-                req_lower = requirement.lower()
-                # Check if requirement or related keywords are mentioned
-                if req_lower in clean_content:
-                    # Get the surrounding context
-                    start_idx = clean_content.find(req_lower)
+            labels = requirements + [f"Skill: {skill}" for skill in skills]
+            for index, label in enumerate(labels):
+                match = found.get(index)
+                if match:
                     # Get surrounding context (50 chars before and after)
-                    context_start = max(0, start_idx - 50)
-                    context_end = min(len(clean_content), start_idx + len(req_lower) + 50)
-                    context = content[context_start:context_end].strip()
-                    
-                    coverage[requirement] = {
-                        'covered': True,
-                        'context': context
-                    }
-                else:
-                    coverage[requirement] = {
-                        'covered': False,
-                        'context': None
-                    }
-            
-            # Check skills coverage
-            for skill in job_analysis.required_skills:
-                skill_lower = skill.lower()
-                if skill_lower in clean_content:
-                    start_idx = clean_content.find(skill_lower)
-                    context_start = max(0, start_idx - 50)
-                    context_end = min(len(clean_content), start_idx + len(skill_lower) + 50)
-                    context = content[context_start:context_end].strip()
-                    
-                    coverage[f"Skill: {skill}"] = {
+                    context_start = max(0, match.start - 50)
+                    context_end = min(len(content), match.end + 50)
+                    coverage[label] = {
                         'covered': True,
-                        'context': context
+                        'context': content[context_start:context_end].strip()
                     }
                 else:
-                    coverage[f"Skill: {skill}"] = {
+                    coverage[label] = {
                         'covered': False,
                         'context': None
                     }
@@ -518,7 +725,8 @@ class CoverLetterService:
             chain = LLMChain(llm=self.llm_analyzer, prompt=prompt)
             response = await chain.arun(
                 content=content,
-                requirements=job_analysis.key_requirements
+                requirements=job_analysis.key_requirements,
+                metadata=llm_stage("suggestions")["metadata"]
             )
             
             return response.split("\n")
@@ -1,14 +1,12 @@
 from fastapi import HTTPException
-from weasyprint import HTML
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 from io import BytesIO
 from datetime import datetime
 import jinja2
 import os
 import logging
 from typing import Optional
+from ..utils.metrics import ExportTimer
+from .export_service import render_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +14,7 @@ class CoverLetterExportService:
     def __init__(self):
         try:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            template_dir = os.path.join(base_dir, 'templates', 'cover_letter')
+            template_dir = os.path.join(base_dir, 'templates', 'cover_letters')
             
             self.template_loader = jinja2.FileSystemLoader(template_dir)
             self.template_env = jinja2.Environment(
@@ -33,22 +31,24 @@ class CoverLetterExportService:
         company_name: Optional[str] = None,
         job_title: Optional[str] = None,
         author: Optional[str] = None,
-        template_name: str = "basic.html"
+        template_name: str = "basic.html",
+        timer: Optional[ExportTimer] = None
     ) -> bytes:
         """Convert cover letter to PDF using template"""
         try:
-            template = self.template_env.get_template(template_name)
-            
-            html_content = template.render(
-                content=content,
-                company_name=company_name,
-                job_title=job_title,
-                author=author,
-                date=datetime.now().strftime("%B %d, %Y")
-            )
+            timer = timer or ExportTimer(template_name, "pdf")
+            with timer.stage("render"):
+                template = self.template_env.get_template(template_name)
+
+                html_content = template.render(
+                    content=content,
+                    company_name=company_name,
+                    job_title=job_title,
+                    author=author,
+                    date=datetime.now().strftime("%B %d, %Y")
+                )
             
-            pdf = HTML(string=html_content).write_pdf()
-            return pdf
+            return render_pdf(html_content, timer)
         except Exception as e:
             logger.error(f"PDF generation failed: {str(e)}")
             raise HTTPException(status_code=400, detail=str(e))
@@ -58,68 +58,76 @@ class CoverLetterExportService:
         content: str,
         company_name: Optional[str] = None,
         job_title: Optional[str] = None,
-        author: Optional[str] = None
+        author: Optional[str] = None,
+        timer: Optional[ExportTimer] = None
     ) -> bytes:
         """Convert cover letter to DOCX using template-based content"""
         try:
-            # First generate HTML using template for consistent formatting
-            template = self.template_env.get_template("basic.html")
-            html_content = template.render(
-                content=content,
-                company_name=company_name,
-                job_title=job_title,
-                author=author,
-                date=datetime.now().strftime("%B %d, %Y")
-            )
-            
-            # Create Word document
-            doc = Document()
-            
-            # Set margins
-            sections = doc.sections
-            for section in sections:
-                section.top_margin = Inches(1)
-                section.bottom_margin = Inches(1)
-                section.left_margin = Inches(1)
-                section.right_margin = Inches(1)
+            timer = timer or ExportTimer("basic.html", "docx")
+            with timer.stage("docx_assembly"):
+                docx_bytes = self._build_docx(content, company_name, job_title, author)
+            timer.output(docx_bytes)
+            return docx_bytes
+
+        except Exception as e:
+            logger.error(f"DOCX generation failed: {str(e)}")
+            raise HTTPException(status_code=400, detail=str(e))
+        
+    def _build_docx(
+        self,
+        content: str,
+        company_name: Optional[str],
+        job_title: Optional[str],
+        author: Optional[str]
+    ) -> bytes:
+        from docx import Document  # loaded on first DOCX export, not at startup
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import Inches, Pt
 
-            # Add date
-            date_paragraph = doc.add_paragraph()
-            date_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            date_run = date_paragraph.add_run(datetime.now().strftime("%B %d, %Y"))
-            date_run.font.size = Pt(11)
+        # Create Word document
+        doc = Document()
 
-            # Add company info
-            if company_name:
-                company_para = doc.add_paragraph()
-                company_para.add_run(company_name + "\n").bold = True
-                if job_title:
-                    company_para.add_run(f"Re: {job_title}\n")
-                doc.add_paragraph()
+        # Set margins
+        sections = doc.sections
+        for section in sections:
+            section.top_margin = Inches(1)
+            section.bottom_margin = Inches(1)
+            section.left_margin = Inches(1)
+            section.right_margin = Inches(1)
 
-            # Add content
-            content_para = doc.add_paragraph()
-            content_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-            run = content_para.add_run(content)
-            run.font.size = Pt(11)
-            run.font.name = 'Calibri'
+        # Add date
+        date_paragraph = doc.add_paragraph()
+        date_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        date_run = date_paragraph.add_run(datetime.now().strftime("%B %d, %Y"))
+        date_run.font.size = Pt(11)
 
-            # Add author if provided
-            if author:
-                doc.add_paragraph()
-                author_para = doc.add_paragraph()
-                author_para.add_run(author)
+        # Add company info
+        if company_name:
+            company_para = doc.add_paragraph()
+            company_para.add_run(company_name + "\n").bold = True
+            if job_title:
+                company_para.add_run(f"Re: {job_title}\n")
+            doc.add_paragraph()
 
-            # Convert to bytes
-            docx_buffer = BytesIO()
-            doc.save(docx_buffer)
-            docx_buffer.seek(0)
-            return docx_buffer.read()
+        # Add content
+        content_para = doc.add_paragraph()
+        content_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+        run = content_para.add_run(content)
+        run.font.size = Pt(11)
+        run.font.name = 'Calibri'
+
+        # Add author if provided
+        if author:
+            doc.add_paragraph()
+            author_para = doc.add_paragraph()
+            author_para.add_run(author)
+
+        # Convert to bytes
+        docx_buffer = BytesIO()
+        doc.save(docx_buffer)
+        docx_buffer.seek(0)
+        return docx_buffer.read()
 
-        except Exception as e:
-            logger.error(f"DOCX generation failed: {str(e)}")
-            raise HTTPException(status_code=400, detail=str(e))
-        
     def _format_content_for_html(self, content: str) -> str:
         """Format cover letter content for HTML display"""
         # Replace newlines with proper HTML breaks
@@ -0,0 +1,201 @@
+# app/services/cv_profile_service.py
+import hashlib
+import html
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models.database import CV, CVProfile
+from ..models.read_models import CVView
+from ..utils.dates import to_datetime
+from ..utils.embeddings import canonical_term, skill_index
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extracted facts change shape so stored profiles get rebuilt
+PROFILE_FORMAT = "1"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_BULLET_SPLIT_RE = re.compile(r"</li>|<br\s*/?>|</p>|\n|•")
+_SKILL_SPLIT_RE = re.compile(r"[,;|\n•]|</li>|<br\s*/?>")
+_ACHIEVEMENT_RE = re.compile(r"\d|%|\b(led|built|launched|reduced|increased|improved|delivered|won|grew|saved)\b", re.I)
+
+
+def _plain(value: Any) -> str:
+    """Strip markup from rich-text section content"""
+    if not value:
+        return ""
+    return " ".join(html.unescape(_TAG_RE.sub(" ", str(value))).split())
+
+
+def _field(section: Any, name: str) -> Any:
+    """Sections arrive as ORM rows or as request dicts"""
+    if isinstance(section, dict):
+        return section.get(name)
+    return getattr(section, name, None)
+
+
+def experience_years(experiences: Iterable[Dict[str, Any]], today: Optional[datetime] = None) -> float:
+    """Years covered by the dated experience facts, overlapping roles counted once"""
+    today = today or datetime.utcnow()
+    spans = []
+    for exp in experiences:
+        start = to_datetime(exp.get("startDate"))
+        end = today if exp.get("current") else to_datetime(exp.get("endDate"))
+        if start and end and end > start:
+            spans.append((start, min(end, today)))
+
+    days = 0
+    covered_until = None
+    for start, end in sorted(spans):
+        if covered_until is not None:
+            start = max(start, covered_until)
+        if end > start:
+            days += (end - start).days
+        covered_until = end if covered_until is None else max(covered_until, end)
+    return days / 365.25
+
+
+class CVProfileService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def compute_version(sections: Iterable[Any]) -> str:
+        """Content hash of the sections a profile is derived from"""
+        # Content goes in serialized: sections tied on the other fields would
+        # otherwise have their dicts compared by sorted()
+        payload = sorted(
+            (
+                _field(s, "order_index") or 0,
+                _field(s, "type") or "",
+                _field(s, "title") or "",
+                json.dumps(_field(s, "content"), sort_keys=True, default=str),
+            )
+            for s in sections
+        )
+        digest = hashlib.sha256(PROFILE_FORMAT.encode())
+        digest.update(json.dumps(payload).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def extract_facts(sections: Iterable[Any]) -> Dict[str, Any]:
+        """Pull the job-independent facts the AI service needs out of the sections"""
+        facts: Dict[str, Any] = {
+            "contact": {},
+            "summary": "",
+            "experiences": [],
+            "education": [],
+            "skills": [],
+            "languages": [],
+            "achievements": [],
+        }
+
+        ordered = sorted(sections, key=lambda s: _field(s, "order_index") or 0)
+        for section in ordered:
+            section_type = _field(section, "type")
+            content = _field(section, "content")
+
+            if section_type == "contact" and isinstance(content, dict):
+                facts["contact"] = {
+                    key: content.get(key, "")
+                    for key in ("name", "email", "phone", "location")
+                }
+            elif section_type == "text":
+                facts["summary"] = " ".join(filter(None, [facts["summary"], _plain(content)]))
+            elif section_type == "experience" and isinstance(content, list):
+                for exp in content:
+                    if not isinstance(exp, dict):
+                        continue
+                    facts["experiences"].append({
+                        "position": exp.get("position", ""),
+                        "company": exp.get("company", ""),
+                        "description": _plain(exp.get("description")),
+                        "startDate": exp.get("startDate"),
+                        "endDate": exp.get("endDate"),
+                        "current": bool(exp.get("current")),
+                    })
+                    for line in _BULLET_SPLIT_RE.split(str(exp.get("description") or "")):
+                        line = _plain(line)
+                        if line and _ACHIEVEMENT_RE.search(line):
+                            facts["achievements"].append(line)
+            elif section_type == "education" and isinstance(content, list):
+                for edu in content:
+                    if isinstance(edu, dict):
+                        facts["education"].append({
+                            "degree": edu.get("degree", ""),
+                            "institution": edu.get("institution", ""),
+                            "description": _plain(edu.get("description")),
+                        })
+            elif section_type == "skills":
+                if isinstance(content, list):
+                    names = [s.get("name", "") if isinstance(s, dict) else str(s) for s in content]
+                else:
+                    names = _SKILL_SPLIT_RE.split(str(content or ""))
+                facts["skills"].extend(_plain(name) for name in names if _plain(name))
+            elif section_type == "languages" and isinstance(content, list):
+                facts["languages"].extend(
+                    {"name": lang.get("name", ""), "level": lang.get("level", "")}
+                    for lang in content if isinstance(lang, dict)
+                )
+
+        # Same name twice (e.g. "Python" in two skill sections) counts once
+        seen = set()
+        unique_skills = []
+        for name in facts["skills"]:
+            key = canonical_term(name)
+            if key and key not in seen:
+                seen.add(key)
+                unique_skills.append(name)
+        facts["skills"] = unique_skills
+        facts["achievements"] = facts["achievements"][:20]
+        return facts
+
+    def refresh(self, cv_id: Any, sections: Iterable[Any]) -> CVProfile:
+        """Rebuild the profile for the given sections (caller commits)"""
+        sections = list(sections)
+        version = self.compute_version(sections)
+
+        profile = self.db.get(CVProfile, cv_id)
+        if profile is not None and profile.version == version:
+            return profile
+
+        facts = self.extract_facts(sections)
+        skills = [canonical_term(name) for name in facts["skills"]]
+        embeddings = skill_index.embed(skills)
+
+        if profile is None:
+            profile = CVProfile(cv_id=cv_id)
+            self.db.add(profile)
+        profile.version = version
+        profile.facts = facts
+        profile.skills = skills
+        profile.skill_embeddings = embeddings.astype(np.float32).tobytes()
+        logger.debug(f"Rebuilt profile for CV {cv_id} ({len(skills)} skills)")
+        return profile
+
+    def get_for_cv(self, cv: Union[CV, CVView]) -> CVProfile:
+        """Stored profile for a loaded CV, rebuilt first if the sections changed"""
+        profile = self.db.get(CVProfile, cv.id)
+        if profile is None or profile.version != self.compute_version(cv.sections):
+            profile = self.refresh(cv.id, cv.sections)
+            self.db.commit()
+        self.load_embeddings(profile)
+        return profile
+
+    @staticmethod
+    def load_embeddings(profile: CVProfile) -> Optional[np.ndarray]:
+        """Hand the stored skill vectors to the shared index so they aren't recomputed"""
+        if not profile.skill_embeddings or not profile.skills:
+            return None
+        vectors = np.frombuffer(profile.skill_embeddings, dtype=np.float32)
+        if vectors.size % len(profile.skills):
+            return None
+        vectors = vectors.reshape(len(profile.skills), -1)
+        skill_index.add(profile.skills, vectors)
+        return vectors
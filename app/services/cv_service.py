@@ -1,23 +1,46 @@
 # app/services/cv_service.py
+import json
 import os
 import uuid
-from app.services.storage_service import S3StorageService
 from fastapi import HTTPException
-from typing import Dict, Any, List
-from sqlalchemy.orm import Session, joinedload
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import String, cast, delete, func, insert, select, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session, selectinload
 import logging
 from fastapi import UploadFile
-from ..models.database import CV, Section
+from ..models.database import CV, CVProfile, CVStatus, Section
+from ..models.read_models import CVView
+from ..utils.embeddings import canonical_term
+from ..utils.pagination import decode_cursor, encode_cursor
+from .cv_profile_service import CVProfileService
 from datetime import datetime
 
 
 logger = logging.getLogger(__name__)
 
+
+def _json_contains(document: Any, fragment: Any) -> bool:
+    """Python version of jsonb @> for databases without it"""
+    if isinstance(fragment, dict):
+        return isinstance(document, dict) and all(
+            key in document and _json_contains(document[key], value)
+            for key, value in fragment.items()
+        )
+    if isinstance(fragment, list):
+        if not isinstance(document, list):
+            return False
+        return all(any(_json_contains(item, wanted) for item in document) for wanted in fragment)
+    return document == fragment
+
+
 class CVService:
     def __init__(self, db: Session):
         self.db = db
    
     async def upload_profile_image(self, user_id: str, file: UploadFile) -> str:
+        from app.services.storage_service import S3StorageService  # boto3 loads on first upload
+
         storage = S3StorageService()
         file_data = await file.read()
         filename = f"{user_id}_{uuid.uuid4()}{os.path.splitext(file.filename)[1]}"
@@ -38,10 +61,11 @@ class CVService:
             logger.debug(f"Creating new CV for user {user_id} with template {template_id}")
             cv = CV(
                 user_id=user_id,
-                template_id=template_id,
-                cv_data={}  # Initialize empty
+                template_id=template_id
             )
             self.db.add(cv)
+            self.db.flush()
+            CVProfileService(self.db).refresh(cv.id, [])
             self.db.commit()
             self.db.refresh(cv)
             logger.info(f"Successfully created CV with ID: {cv.id}")
@@ -51,7 +75,7 @@ class CVService:
             logger.error(f"Failed to create CV: {str(e)}")
             raise HTTPException(status_code=400, detail=str(e))
 
-    async def get_cv(self, cv_id: str, user_id: str) -> CV:
+    async def get_cv(self, cv_id: uuid.UUID, user_id: str) -> CV:
         """Get CV by ID, including its sections"""
         cv = (
             self.db.query(CV)
@@ -59,18 +83,169 @@ class CVService:
                 CV.user_id == user_id,
                 CV.id == cv_id
             )
-            .options(joinedload(CV.sections))  # Include related sections in the query
+            .options(selectinload(CV.sections))  # Sections in one extra IN query
             .first()
         )
         if not cv:
             raise HTTPException(status_code=404, detail="CV not found")
         return cv
 
+    async def get_cv_version(self, cv_id: uuid.UUID, user_id: str) -> Any:
+        """
+        The columns a CV's ETag is built from, without touching its sections.
+        Every write to a CV or its sections bumps updated_at (see update_cv).
+        """
+        row = self.db.execute(
+            select(
+                CV.id,
+                CV.template_id,
+                CV.status,
+                CV.created_at,
+                CV.updated_at
+            ).where(CV.user_id == user_id, CV.id == cv_id)
+        ).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="CV not found")
+        return row
+
+    async def get_cv_view(self, cv_id: uuid.UUID, user_id: str) -> CVView:
+        """
+        Read-only CV for rendering, exporting and AI use.
+        Selects plain columns, so nothing is instrumented or kept in the session.
+        """
+        cv = self.db.execute(
+            select(
+                CV.id,
+                CV.user_id,
+                CV.title,
+                CV.template_id,
+                CV.status,
+                CV.profile_image,
+                CV.created_at,
+                CV.updated_at
+            ).where(CV.user_id == user_id, CV.id == cv_id)
+        ).first()
+        if not cv:
+            raise HTTPException(status_code=404, detail="CV not found")
+
+        sections = self.db.execute(
+            select(
+                Section.id,
+                Section.type,
+                Section.title,
+                Section.content,
+                Section.order_index,
+                Section.style_config
+            ).where(Section.cv_id == cv.id)
+        ).all()
+        return CVView.from_row(cv, sections)
+
     async def get_user_cvs(self, user_id: str) -> List[CV]:
         """Get all CVs for a user"""
         return self.db.query(CV).filter(CV.user_id == user_id).all()
 
-    async def update_cv(self, cv_id: str, user_id: str, cv_data: Dict[Any, Any]) -> CV:
+    async def get_user_cv_summaries(
+        self,
+        user_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        One page of a user's CVs, newest first, without section content.
+        Returns the rows and the cursor for the next page (None on the last).
+        """
+        section_count = (
+            select(func.count(Section.id))
+            .where(Section.cv_id == CV.id)
+            .correlate(CV)
+            .scalar_subquery()
+        )
+        query = (
+            self.db.query(
+                CV.id,
+                CV.title,
+                CV.template_id,
+                CV.status,
+                CV.created_at,
+                CV.updated_at,
+                section_count.label("section_count")
+            )
+            .filter(CV.user_id == user_id)
+        )
+
+        position = decode_cursor(cursor)
+        if position:
+            query = query.filter(tuple_(CV.created_at, CV.id) < tuple_(*position))
+
+        rows = (
+            query.order_by(CV.created_at.desc(), CV.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        return rows, next_cursor
+
+    def _is_postgres(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    async def find_cvs_by_skill(
+        self,
+        skill: str,
+        user_id: Optional[str] = None,
+        limit: int = 50
+    ) -> List[CV]:
+        """
+        CVs whose profile lists a skill, newest first.
+        On Postgres this is skills @> '["python"]' on the GIN-indexed jsonb column.
+        """
+        term = canonical_term(skill)
+        if not term:
+            return []
+        if self._is_postgres():
+            condition = type_coerce(CVProfile.skills, JSONB).contains([term])
+        else:
+            condition = cast(CVProfile.skills, String).contains(json.dumps(term))
+
+        query = self.db.query(CV).join(CVProfile, CVProfile.cv_id == CV.id).filter(condition)
+        if user_id is not None:
+            query = query.filter(CV.user_id == user_id)
+        return query.order_by(CV.created_at.desc(), CV.id.desc()).limit(limit).all()
+
+    async def find_sections(
+        self,
+        user_id: Optional[str] = None,
+        cv_id: Optional[uuid.UUID] = None,
+        section_type: Optional[str] = None,
+        contains: Optional[Any] = None,
+        limit: int = 100
+    ) -> List[Section]:
+        """
+        Sections filtered in SQL, e.g. section_type="experience" or
+        contains=[{"company": "ACME"}] (jsonb @> against the GIN index).
+        """
+        query = self.db.query(Section)
+        if user_id is not None:
+            query = query.join(CV, CV.id == Section.cv_id).filter(CV.user_id == user_id)
+        if cv_id is not None:
+            query = query.filter(Section.cv_id == cv_id)
+        if section_type is not None:
+            query = query.filter(Section.type == section_type)
+        query = query.order_by(Section.cv_id, Section.order_index)
+
+        if contains is None:
+            return query.limit(limit).all()
+        if self._is_postgres():
+            return query.filter(type_coerce(Section.content, JSONB).contains(contains)).limit(limit).all()
+
+        # Local SQLite databases have no containment operator
+        matches = (section for section in query if _json_contains(section.content, contains))
+        return [section for _, section in zip(range(limit), matches)]
+
+    async def update_cv(self, cv_id: uuid.UUID, user_id: str, cv_data: Dict[Any, Any]) -> CV:
         """Update CV data"""
         try:
             # Get the CV
@@ -83,19 +258,10 @@ class CVService:
             cv.status = cv_data.get("status")
             cv.updated_at = datetime.utcnow()
 
-            # Delete existing sections
-            self.db.query(Section).filter(Section.cv_id == cv_id).delete()
+            self.replace_sections(cv.id, cv_data.get("sections", []))
 
-            # Add new sections
-            for section_data in cv_data.get("sections", []):
-                section = Section(
-                    cv_id=cv_id,
-                    type=section_data["type"],
-                    title=section_data["title"],
-                    content=section_data["content"],
-                    order_index=section_data["order_index"]
-                )
-                self.db.add(section)
+            # Keep the extracted profile in step with the new sections
+            CVProfileService(self.db).refresh(cv.id, cv_data.get("sections", []))
 
             self.db.commit()
             self.db.refresh(cv)
@@ -104,7 +270,47 @@ class CVService:
             self.db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
 
-    async def delete_cv(self, cv_id: str, user_id: str) -> bool:
+    def delete_drafts(self, user_id: Any, exclude_id: Optional[Any] = None) -> int:
+        """
+        Drop the user's drafts in one DELETE (caller commits).
+        Sections and profiles go with them through ON DELETE CASCADE,
+        cover letters keep their text and lose the cv_id (ON DELETE SET NULL).
+        """
+        stmt = delete(CV).where(CV.user_id == user_id, CV.status == CVStatus.DRAFT)
+        if exclude_id is not None:
+            stmt = stmt.where(CV.id != exclude_id)
+        result = self.db.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+
+    def insert_sections(self, cv_id: Any, sections: List[Dict[str, Any]]) -> None:
+        """Add all of a CV's sections in one bulk INSERT (caller commits)"""
+        if not sections:
+            return
+        self.db.execute(
+            insert(Section),
+            [
+                {
+                    "cv_id": cv_id,
+                    "type": section["type"],
+                    "title": section["title"],
+                    "content": section["content"],
+                    "order_index": section["order_index"],
+                    "style_config": section.get("style_config")
+                }
+                for section in sections
+            ]
+        )
+
+    def replace_sections(self, cv_id: Any, sections: List[Dict[str, Any]]) -> None:
+        """Swap a CV's sections with one DELETE and one bulk INSERT (caller commits)"""
+        self.db.execute(
+            delete(Section)
+            .where(Section.cv_id == cv_id)
+            .execution_options(synchronize_session=False)
+        )
+        self.insert_sections(cv_id, sections)
+
+    async def delete_cv(self, cv_id: uuid.UUID, user_id: str) -> bool:
         """Delete CV"""
         try:
             cv = await self.get_cv(cv_id, user_id)
@@ -0,0 +1,307 @@
+# app/services/docx_engine.py
+"""
+DOCX export from a pre-styled base document per CV template.
+
+Each base (app/templates/docx/<template_id>.docx, or one built from
+TEMPLATE_STYLES when the file is missing) is read once per process and
+split into a zip of its static parts plus the head and tail of
+word/document.xml. An export copies those bytes, appends a document.xml
+whose body is rendered from string snippets with the style ids already
+resolved, and is done: styles, theme and numbering are never parsed or
+recompressed again.
+"""
+import logging
+import os
+import re
+import zipfile
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from ..models.read_models import CVView, SectionView
+
+logger = logging.getLogger(__name__)
+
+DOCX_TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "docx"
+)
+DOCUMENT_PART = "word/document.xml"
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Control characters Word refuses (python-docx raises on them)
+_INVALID_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+# (heading field, its format, subtitle field, its format) of dated entries
+EXPERIENCE_FIELDS = ("position", "{}", "company", " at {}\n")
+EDUCATION_FIELDS = ("degree", "{}\n", "institution", "{}\n")
+
+
+class DocxStyle(NamedTuple):
+    font: str = "Calibri"
+    body_size: int = 11
+    title_size: Optional[int] = None  # None keeps the base's Title size
+    heading_size: int = 15
+    text_color: Optional[str] = None  # hex RRGGBB, None keeps the theme colour
+    accent_color: Optional[str] = None  # headings and the name
+
+
+DEFAULT_STYLE = DocxStyle()
+
+# Close to the CSS of the HTML templates in templates/cv
+TEMPLATE_STYLES: Dict[str, DocxStyle] = {
+    "modern": DocxStyle(font="Arial", title_size=28, text_color="333333", accent_color="3498DB"),
+    "classic": DocxStyle(font="Calibri", title_size=30, text_color="333333", accent_color="2563EB"),
+    "professional": DocxStyle(font="Arial", title_size=30, text_color="333333", accent_color="2C3E50"),
+}
+
+
+def build_base(style: DocxStyle = DEFAULT_STYLE) -> bytes:
+    """An empty document carrying the template's fonts and colours"""
+    # Only needed when a base file is missing; exports themselves never load python-docx
+    from docx import Document
+    from docx.shared import Pt, RGBColor
+
+    doc = Document()
+    normal = doc.styles['Normal']
+    normal.font.name = style.font
+    normal.font.size = Pt(style.body_size)
+    if style.text_color:
+        normal.font.color.rgb = RGBColor.from_string(style.text_color)
+
+    for i in range(1, 4):
+        heading = doc.styles[f'Heading {i}']
+        heading.font.name = style.font
+        heading.font.size = Pt(style.heading_size + 1 - i)
+        heading.font.bold = True
+        if style.accent_color:
+            heading.font.color.rgb = RGBColor.from_string(style.accent_color)
+
+    title = doc.styles['Title']
+    title.font.name = style.font
+    if style.title_size:
+        title.font.size = Pt(style.title_size)
+    if style.accent_color:
+        title.font.color.rgb = RGBColor.from_string(style.accent_color)
+
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_text(item) for item in value if item)
+    if isinstance(value, dict):
+        return ", ".join(_text(item) for item in value.values() if item)
+    return str(value)
+
+
+def _skill_text(skill: Any) -> str:
+    """A {"name", "level"} skill as "Python (Expert)", so a level never reads as another skill"""
+    if isinstance(skill, dict):
+        name, level = _text(skill.get('name')), _text(skill.get('level'))
+        return f"{name} ({level})" if name and level else name
+    return _text(skill)
+
+
+def _run(text: str, bold: bool = False, italic: bool = False) -> str:
+    """A w:r as python-docx's add_run would write it (newlines become breaks)"""
+    text = _INVALID_XML.sub("", text)
+    if not text:
+        return ""
+    props = ("<w:b/>" if bold else "") + ("<w:i/>" if italic else "")
+    parts = []
+    for i, line in enumerate(_LINE_BREAK.split(text)):
+        if i:
+            parts.append("<w:br/>")
+        for j, chunk in enumerate(line.split("\t")):
+            if j:
+                parts.append("<w:tab/>")
+            if chunk:
+                parts.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+    return f"<w:r>{f'<w:rPr>{props}</w:rPr>' if props else ''}{''.join(parts)}</w:r>"
+
+
+class CompiledDocxTemplate:
+    """One base document, split once into reusable bytes and style ids"""
+
+    def __init__(self, base: bytes):
+        static = BytesIO()
+        with zipfile.ZipFile(BytesIO(base)) as source, \
+                zipfile.ZipFile(static, "w", zipfile.ZIP_DEFLATED) as target:
+            document = source.read(DOCUMENT_PART).decode("utf-8")
+            styles = source.read("word/styles.xml")
+            for info in source.infolist():
+                if info.filename != DOCUMENT_PART:
+                    target.writestr(info, source.read(info))
+        self.static = static.getvalue()
+
+        # Body content goes between the opening <w:body> and the final section properties
+        body_start = document.index(">", document.index("<w:body")) + 1
+        body_end = document.rfind("<w:sectPr")
+        if body_end < body_start:
+            body_end = document.rindex("</w:body>")
+        self.head = document[:body_end]
+        self.tail = document[body_end:]
+
+        self.style_ids = self._style_ids(styles)
+        self._heading = self._paragraph_open("Heading 1")
+        self._title = self._paragraph_open("Title", centered=True)
+        self._bullet = self._paragraph_open("List Bullet")
+        self._centered = self._paragraph_open(None, centered=True)
+
+    @staticmethod
+    def _style_ids(styles_xml: bytes) -> Dict[str, str]:
+        root = etree.fromstring(styles_xml)
+        ids = {}
+        for style in root.iterfind(f"{{{W_NS}}}style"):
+            name = style.find(f"{{{W_NS}}}name")
+            if name is not None:
+                # Word stores some built-in names lower-case ("heading 1")
+                ids[name.get(f"{{{W_NS}}}val").lower()] = style.get(f"{{{W_NS}}}styleId")
+        return ids
+
+    def _paragraph_open(self, style: Optional[str], centered: bool = False) -> str:
+        props = ""
+        if style and style.lower() in self.style_ids:
+            props += f'<w:pStyle w:val="{self.style_ids[style.lower()]}"/>'
+        if centered:
+            props += '<w:jc w:val="center"/>'
+        return f"<w:p><w:pPr>{props}</w:pPr>" if props else "<w:p>"
+
+    def _p(self, *runs: str, opening: str = "<w:p>") -> str:
+        return f"{opening}{''.join(runs)}</w:p>"
+
+    # Section renderers, one per type ExportService supports
+
+    def _contact(self, content: Any, out: List[str]) -> None:
+        if not content or not isinstance(content, dict):
+            return
+        name = _text(content.get('name'))
+        email = _text(content.get('email'))
+        phone = _text(content.get('phone'))
+        location = _text(content.get('location'))
+        if name:
+            out.append(self._p(_run(name), opening=self._title))
+        runs = [_run(email)]
+        if phone:
+            runs.append(_run(f" | {phone}" if email else phone))
+        if location:
+            runs.append(_run(f"\n{location}"))
+        out.append(self._p(*runs, opening=self._centered))
+        out.append("<w:p/>")
+
+    def _plain(self, title: str, content: Any, out: List[str]) -> None:
+        text = _text(content)
+        if not text:
+            return
+        out.append(self._p(_run(title), opening=self._heading))
+        out.append(self._p(_run(text)))
+        out.append("<w:p/>")
+
+    def _dated(self, title: str, entries: Any, fields: Tuple[str, str, str, str], out: List[str]) -> None:
+        """Experience and education: bold heading, italic subtitle and dates, description"""
+        if not entries:
+            return
+        heading_key, heading_format, subtitle_key, subtitle_format = fields
+        out.append(self._p(_run(title), opening=self._heading))
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            runs = []
+            if entry.get(heading_key):
+                runs.append(_run(heading_format.format(entry[heading_key]), bold=True))
+            if entry.get(subtitle_key):
+                runs.append(_run(subtitle_format.format(entry[subtitle_key]), italic=True))
+            start = entry.get('startDate')
+            if start:
+                end = "Present" if entry.get('current') else _format_date(entry.get('endDate'))
+                runs.append(_run(f"{_format_date(start)} - {end}\n", italic=True))
+            out.append(self._p(*runs))
+            if entry.get('description'):
+                out.append(self._p(_run(_text(entry['description']))))
+            out.append("<w:p/>")
+
+    def _languages(self, title: str, languages: Any, out: List[str]) -> None:
+        if not languages:
+            return
+        out.append(self._p(_run(title), opening=self._heading))
+        for language in languages:
+            if isinstance(language, dict) and language.get('name') and language.get('level'):
+                out.append(self._p(_run(f"{language['name']} - {language['level']}"), opening=self._bullet))
+        out.append("<w:p/>")
+
+    def body(self, sections: Iterable[SectionView]) -> str:
+        out: List[str] = []
+        for section in sections:
+            if section.type == 'contact':
+                self._contact(section.content, out)
+            elif section.type in ('text', 'hobbies'):
+                self._plain(section.title, section.content, out)
+            elif section.type == 'skills':
+                skills = section.content
+                if isinstance(skills, (list, tuple)):
+                    skills = ", ".join(filter(None, (_skill_text(skill) for skill in skills)))
+                self._plain(section.title, skills, out)
+            elif section.type == 'experience':
+                self._dated(section.title, section.content, EXPERIENCE_FIELDS, out)
+            elif section.type == 'education':
+                self._dated(section.title, section.content, EDUCATION_FIELDS, out)
+            elif section.type == 'languages':
+                self._languages(section.title, section.content, out)
+        return "".join(out)
+
+    def render(self, cv: CVView) -> bytes:
+        """A filled .docx for a normalized CV (dates already datetimes)"""
+        buffer = BytesIO(self.static)
+        buffer.seek(0, os.SEEK_END)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as package:
+            package.writestr(DOCUMENT_PART, self.head + self.body(cv.sections) + self.tail)
+        return buffer.getvalue()
+
+
+def _format_date(value: Any) -> str:
+    return value.strftime('%B %Y') if hasattr(value, "strftime") else ""
+
+
+class DocxTemplates:
+    """Compiled bases by template id, loaded on first use"""
+
+    def __init__(self, template_dir: str = DOCX_TEMPLATE_DIR):
+        self.template_dir = template_dir
+        self._compiled: Dict[str, CompiledDocxTemplate] = {}
+
+    def _source(self, template_id: Optional[str]) -> Tuple[str, Optional[str]]:
+        """(cache key, base file path) so unknown ids share the default instead of growing the cache"""
+        name = os.path.basename(template_id or "")
+        path = os.path.join(self.template_dir, f"{name}.docx")
+        if name and os.path.isfile(path):
+            return name, path
+        if name in TEMPLATE_STYLES:
+            return name, None
+        return "", None
+
+    def get(self, template_id: Optional[str]) -> CompiledDocxTemplate:
+        key, path = self._source(template_id)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            if path:
+                with open(path, "rb") as f:
+                    base = f.read()
+            else:
+                logger.info(f"No base .docx for template {key or 'default'}, building one")
+                base = build_base(TEMPLATE_STYLES.get(key, DEFAULT_STYLE))
+            compiled = CompiledDocxTemplate(base)
+            self._compiled[key] = compiled
+        return compiled
+
+    def render(self, cv: CVView, template_id: Optional[str] = None) -> bytes:
+        return self.get(template_id or cv.template_id).render(cv.normalized())
+
+
+docx_templates = DocxTemplates()
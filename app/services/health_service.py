@@ -0,0 +1,178 @@
+# app/services/health_service.py
+"""
+Dependency health, probed in the background. Each probe runs on its own
+interval in a worker thread with a timeout. The health endpoints, and
+callers like logout that need Redis, only read the last result, so a
+liveness or readiness check never touches a dependency itself.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import anyio
+from sqlalchemy import text
+
+from ..config import settings
+from ..utils.metrics import DEPENDENCY_PROBE_SECONDS, DEPENDENCY_UP
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+DOWN = "down"
+UNKNOWN = "unknown"  # not probed yet, or the last result is stale
+
+
+class ProbeResult(NamedTuple):
+    status: str
+    latency_ms: Optional[float] = None
+    checked_at: Optional[datetime] = None
+    detail: Optional[str] = None
+    checked_monotonic: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "detail": self.detail,
+        }
+
+
+class Probe(NamedTuple):
+    name: str
+    check: Callable[[], Any]  # blocking; raises when the dependency is unhealthy
+    interval: float
+
+
+def _database_probe() -> None:
+    from ..database import engine  # the app's pool, so exhaustion shows up here too
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def _redis_probe() -> None:
+    from ..utils.redis import r
+    if not r.ping():
+        raise RuntimeError("PING failed")
+
+
+@lru_cache(maxsize=1)
+def _storage():
+    from ..services.storage_service import S3StorageService
+    return S3StorageService()
+
+
+@lru_cache(maxsize=1)
+def _openai():
+    from openai import OpenAI
+    return OpenAI(api_key=settings.OPENAI_API_KEY, timeout=settings.HEALTH_PROBE_TIMEOUT, max_retries=0)
+
+
+def _storage_probe() -> None:
+    storage = _storage()
+    storage.s3.head_bucket(Bucket=storage.bucket)
+
+
+def _llm_probe() -> None:
+    # Model metadata is free to fetch and needs a valid key and a reachable API
+    _openai().models.retrieve("gpt-4o-mini")
+
+
+def default_probes() -> List[Probe]:
+    interval = settings.HEALTH_PROBE_INTERVAL
+    return [
+        Probe("database", _database_probe, interval),
+        Probe("redis", _redis_probe, interval),
+        Probe("storage", _storage_probe, settings.HEALTH_SLOW_PROBE_INTERVAL),
+        Probe("llm", _llm_probe, settings.HEALTH_SLOW_PROBE_INTERVAL),
+    ]
+
+
+class HealthMonitor:
+    def __init__(self, probes: List[Probe], critical: List[str], timeout: float):
+        self.probes = probes
+        self.critical = [name for name in critical if any(p.name == name for p in probes)]
+        self.timeout = timeout
+        # A result is stale once its probe has missed a run
+        self._stale_after = {probe.name: 2 * probe.interval + timeout for probe in probes}
+        self._results: Dict[str, ProbeResult] = {probe.name: ProbeResult(UNKNOWN) for probe in probes}
+        self._tasks: List[asyncio.Task] = []
+        self._up = {probe.name: DEPENDENCY_UP.labels(probe.name) for probe in probes}
+        self._latency = {probe.name: DEPENDENCY_PROBE_SECONDS.labels(probe.name) for probe in probes}
+
+    async def run_probe(self, probe: Probe) -> ProbeResult:
+        start = time.perf_counter()
+        try:
+            with anyio.fail_after(self.timeout):
+                # abandon_on_cancel: a hung driver call can't hold up the loop past the timeout
+                await anyio.to_thread.run_sync(probe.check, abandon_on_cancel=True)
+            status, detail = OK, None
+        except TimeoutError:
+            status, detail = DOWN, f"timed out after {self.timeout}s"
+        except Exception as e:
+            status, detail = DOWN, f"{type(e).__name__}: {e}"[:200]
+        elapsed = time.perf_counter() - start
+
+        result = ProbeResult(status, round(elapsed * 1000, 1), datetime.utcnow(), detail, time.monotonic())
+        if status != self._results[probe.name].status:
+            log = logger.info if status == OK else logger.warning
+            log(f"Dependency {probe.name} is {status}" + (f": {detail}" if detail else ""))
+        self._results[probe.name] = result
+        self._up[probe.name].set(1 if status == OK else 0)
+        self._latency[probe.name].observe(elapsed)
+        return result
+
+    async def _loop(self, probe: Probe) -> None:
+        while True:
+            await self.run_probe(probe)
+            await asyncio.sleep(probe.interval)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._loop(probe)) for probe in self.probes]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def result(self, name: str) -> ProbeResult:
+        result = self._results.get(name)
+        if result is None:
+            return ProbeResult(UNKNOWN)
+        if result.status != UNKNOWN and time.monotonic() - result.checked_monotonic > self._stale_after[name]:
+            return result._replace(status=UNKNOWN, detail="stale")
+        return result
+
+    def is_down(self, name: str) -> bool:
+        """Last probe failed; unknown counts as not down so callers just try"""
+        return self.result(name).status == DOWN
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def ready(self) -> bool:
+        """
+        Every critical dependency answered its last probe, recently. Without
+        the probe loops (HEALTH_PROBES_ENABLED off) nothing is ever checked,
+        so readiness doesn't depend on them.
+        """
+        if not self.running:
+            return True
+        return all(self.result(name).status == OK for name in self.critical)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {probe.name: self.result(probe.name).as_dict() for probe in self.probes}
+
+
+health_monitor = HealthMonitor(
+    default_probes(),
+    critical=settings.HEALTH_CRITICAL_PROBES,
+    timeout=settings.HEALTH_PROBE_TIMEOUT
+)
@@ -0,0 +1,55 @@
+# app/services/llm_metrics.py
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from ..utils.metrics import observe_llm_call, observe_llm_tokens
+
+
+def llm_stage(stage: str) -> Dict[str, Any]:
+    """Run config naming the pipeline stage an LLM call belongs to"""
+    return {"metadata": {"llm_stage": stage}}
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """
+    Latency and token usage of every LLM call, labelled by the llm_stage
+    metadata of the run (see llm_stage); calls without one count as "other".
+    """
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[str, float]] = {}
+
+    def _start(self, run_id: UUID, metadata: Optional[Dict[str, Any]]) -> None:
+        stage = (metadata or {}).get("llm_stage", "other")
+        self._runs[run_id] = (stage, time.perf_counter())
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        self._start(run_id, metadata)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        stage, start = run
+        observe_llm_call(stage, "ok", time.perf_counter() - start)
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage.get("prompt_tokens"):
+            observe_llm_tokens(stage, "prompt", usage["prompt_tokens"])
+        if usage.get("completion_tokens"):
+            observe_llm_tokens(stage, "completion", usage["completion_tokens"])
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            stage, start = run
+            observe_llm_call(stage, "error", time.perf_counter() - start)
+
+
+llm_metrics = LLMMetricsHandler()  # stateless apart from in-flight runs, shared by every client
@@ -1,61 +1,187 @@
 # app/services/preview_service.py
 from fastapi import HTTPException
+import hashlib
 import jinja2
 import logging
-from typing import Dict, Any
+import orjson
+from markupsafe import Markup
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
 import os
-from datetime import datetime
+from ..config import settings
+from ..models.read_models import CVView, SectionView
+from ..utils.cache import TTLCache
+from ..utils.etag import template_version
+from ..utils.metrics import register_cache
 
 logger = logging.getLogger(__name__)
 
+# template_id -> rendered markup that is the same for every CV (doctype, inline CSS)
+_static_heads: Dict[str, Optional[str]] = {}
+
+# Shared by every PreviewService so templates and their macros compile once
+_template_env: Optional[jinja2.Environment] = None
+_template_modules: Dict[str, Tuple[jinja2.Template, Any]] = {}
+
+# (template_id, template version, section type, fragment key) -> rendered section
+_fragment_cache = TTLCache(
+    maxsize=settings.PREVIEW_FRAGMENT_CACHE_SIZE,
+    ttl=settings.PREVIEW_FRAGMENT_CACHE_TTL
+)
+register_cache("preview_fragments", _fragment_cache)
+
+
+class Fragment(NamedTuple):
+    section: SectionView
+    key: str  # hash of everything the section's markup depends on
+    html: Markup
+
+
 class PreviewService:
     def __init__(self):
+        global _template_env
+        if _template_env is None:
+            try:
+                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                template_dir = os.path.join(base_dir, 'templates', 'cv')
+                
+                _template_env = jinja2.Environment(
+                    loader=jinja2.FileSystemLoader(template_dir),
+                    autoescape=True,
+                    trim_blocks=True,  # no blank line per {% if %} in every fragment
+                    lstrip_blocks=True
+                )
+                
+            except Exception as e:
+                logger.error(f"Template environment initialization failed: {str(e)}")
+                raise
+        self.template_env = _template_env
+
+    def _template(self, template_id: str) -> Tuple[jinja2.Template, Any]:
+        """The page template and its module (for the render_section macro)"""
+        template = self.template_env.get_template(f'{template_id}.html')
+        cached = _template_modules.get(template_id)
+        if cached is None or cached[0] is not template:  # first use, or reloaded from disk
+            cached = (template, template.make_module({"cv": CVView(), "sections": []}))
+            _template_modules[template_id] = cached
+        return cached
+
+    @staticmethod
+    def fragment_key(section: SectionView, profile_image: Optional[str]) -> str:
+        payload = orjson.dumps(
+            [section.type, section.title, section.content, section.style_config, profile_image],
+            default=str,
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.blake2b(payload, digest_size=12).hexdigest()
+
+    def render_fragments(self, cv: CVView, template_id: str) -> List[Fragment]:
+        """Every section's markup, rendering only those not already cached"""
+        cv = cv.normalized()
+        _, module = self._template(template_id)
+        version = template_version(template_id)
+        fragments = []
+        for section in cv.sections:
+            key = self.fragment_key(section, cv.profile_image)
+            cache_key = (template_id, version, section.type, key)
+            html = _fragment_cache.get(cache_key)
+            if html is None:
+                html = module.render_section(section, cv.profile_image).strip()
+                _fragment_cache.set(cache_key, html)
+            fragments.append(Fragment(section, key, html))
+        return fragments
+
+    @staticmethod
+    def marked(fragment: Fragment) -> Markup:
+        """Fragment wrapped so an editor can find and swap it (the wrapper takes no box)"""
+        return Markup('<div data-fragment="{}" style="display: contents">{}</div>').format(
+            fragment.key, fragment.html
+        )
+
+    def render_page(
+        self,
+        cv: CVView,
+        template_id: str,
+        fragments: List[Fragment],
+        mark_fragments: bool = False
+    ) -> str:
+        template, _ = self._template(template_id)
+        sections = [
+            (fragment.section, self.marked(fragment) if mark_fragments else fragment.html)
+            for fragment in fragments
+        ]
+        return template.render(cv=cv, sections=sections)
+
+    def static_head(self, template_id: str) -> Optional[str]:
+        """Leading markup of a template that doesn't depend on the CV"""
+        if template_id not in _static_heads:
+            try:
+                empty = self.render_page(CVView(), template_id, [])
+                filled_cv = CVView(
+                    profile_image="x",
+                    sections=(SectionView(type="text", title="x", content="x"),)
+                )
+                filled = self.render_page(filled_cv, template_id, self.render_fragments(filled_cv, template_id))
+                common = 0
+                for a, b in zip(empty, filled):
+                    if a != b:
+                        break
+                    common += 1
+                # Stop at the last complete tag before the first difference
+                _static_heads[template_id] = empty[:empty.rfind(">", 0, common) + 1] or None
+            except Exception as e:
+                logger.warning(f"Could not extract static head of {template_id}: {str(e)}")
+                _static_heads[template_id] = None
+        return _static_heads[template_id]
+
+    async def generate_preview(
+        self,
+        cv_data: Union[CVView, Dict[str, Any]],
+        template_id: str,
+        mark_fragments: bool = False
+    ) -> str:
+        """Full page; unchanged sections come from the fragment cache"""
         try:
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            template_dir = os.path.join(base_dir, 'templates', 'cv')
-            
-            self.template_loader = jinja2.FileSystemLoader(template_dir)
-            self.template_env = jinja2.Environment(
-                loader=self.template_loader,
-                autoescape=True
-            )
+            if not isinstance(cv_data, CVView):
+                cv_data = CVView.from_dict(cv_data, template_id)
+            cv_data = cv_data.normalized()
+            fragments = self.render_fragments(cv_data, template_id)
+            return self.render_page(cv_data, template_id, fragments, mark_fragments)
             
         except Exception as e:
-            logger.error(f"Template environment initialization failed: {str(e)}")
-            raise
+            logger.error(f"Preview generation failed: {str(e)}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Template rendering failed: {str(e)}"
+            )
 
-    def parse_date(self, date_string: str) -> datetime:
-        """Parse date string handling various formats"""
-        if not date_string:
-            return None
-            
+    async def generate_fragments(
+        self,
+        cv_data: Union[CVView, Dict[str, Any]],
+        template_id: str,
+        known: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fragment keys in section order plus the markup of those the editor
+        doesn't have yet (see marked()), instead of the whole page
+        """
         try:
-            # Remove timezone info
-            date_string = date_string.split('T')[0]
-            return datetime.strptime(date_string, '%Y-%m-%d')
-        except Exception as e:
-            logger.error(f"Date parsing failed for {date_string}: {str(e)}")
-            return None
+            if not isinstance(cv_data, CVView):
+                cv_data = CVView.from_dict(cv_data, template_id)
+            cv_data = cv_data.normalized()
+            known_keys = set(known or ())
+            fragments = self.render_fragments(cv_data, template_id)
+            return {
+                "keys": [fragment.key for fragment in fragments],
+                "fragments": [
+                    {"index": index, "key": fragment.key, "html": str(self.marked(fragment))}
+                    for index, fragment in enumerate(fragments)
+                    if fragment.key not in known_keys
+                ]
+            }
 
-    async def generate_preview(self, cv_data: Dict[str, Any], template_id: str) -> str:
-        try:
-            template = self.template_env.get_template(f'{template_id}.html')
-            
-            # Process dates for proper formatting
-            if 'sections' in cv_data:
-                for section in cv_data['sections']:
-                    if section['type'] in ['experience', 'education']:
-                        for item in section.get('content', []):
-                            if isinstance(item, dict):  # Make sure item is a dictionary
-                                item['startDate'] = self.parse_date(item.get('startDate'))
-                                item['endDate'] = self.parse_date(item.get('endDate'))
-            
-            html = template.render(cv=cv_data)
-            return html
-            
         except Exception as e:
-            logger.error(f"Preview generation failed: {str(e)}")
+            logger.error(f"Fragment generation failed: {str(e)}")
             raise HTTPException(
                 status_code=400,
                 detail=f"Template rendering failed: {str(e)}"
-            )
\ No newline at end of file
+            )
@@ -0,0 +1,208 @@
+# app/services/preview_session.py
+"""
+Live preview over a WebSocket. The editor authenticates once, then sends
+section edits; each session keeps its CV in memory and renders on a short
+debounce, so a burst of keystrokes becomes one render and one push of the
+fragments that changed (see PreviewService.generate_fragments).
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import orjson
+
+from ..config import settings
+from ..models.read_models import CVView, SectionView
+from .preview_service import PreviewService
+
+logger = logging.getLogger(__name__)
+
+
+class PreviewSessionError(ValueError):
+    """A client message that can't be applied; reported back, the session stays open"""
+
+
+class PreviewSessionTooLarge(Exception):
+    """An edit would take the session over PREVIEW_WS_MAX_SESSION_BYTES; the socket is closed"""
+
+
+class PreviewSession:
+    """
+    One editor's CV as the server sees it. Holds only the frozen section views
+    and the fragment keys the client already has, both bounded by
+    PREVIEW_WS_MAX_SECTIONS, and the sections and profile image together by
+    PREVIEW_WS_MAX_SESSION_BYTES.
+    """
+
+    def __init__(self, user_id: Any, template_id: str, sections: List[Dict[str, Any]]):
+        self.user_id = user_id
+        self.template_id = template_id
+        self.profile_image: Optional[str] = None
+        self.sections: List[SectionView] = []
+        self.sizes: List[int] = []  # JSON size of each section as received
+        self.known: Set[str] = set()  # fragment keys the client has
+        self.full_page = True  # next push is a whole page (first render, template switch)
+        self.seq = 0  # bumped on every applied edit
+        self.rendered_seq = -1
+        self.first_edit_at: Optional[float] = None
+        self.last_edit_at = time.monotonic()
+        self.replace_sections(sections)
+
+    @property
+    def size(self) -> int:
+        return sum(self.sizes) + len(self.profile_image or "")
+
+    @property
+    def dirty(self) -> bool:
+        return self.seq != self.rendered_seq
+
+    def _touch(self) -> None:
+        now = time.monotonic()
+        if not self.dirty:
+            self.first_edit_at = now
+        self.last_edit_at = now
+        self.seq += 1
+
+    def _section(self, data: Any) -> SectionView:
+        if not isinstance(data, dict) or not isinstance(data.get("type"), str):
+            raise PreviewSessionError("A section needs at least a type")
+        return SectionView.from_dict(data)
+
+    def _check_size(self, size: int) -> None:
+        """Raise before an edit that would leave the session at this size is applied"""
+        if size > settings.PREVIEW_WS_MAX_SESSION_BYTES:
+            raise PreviewSessionTooLarge(f"Preview content over {settings.PREVIEW_WS_MAX_SESSION_BYTES} bytes")
+
+    def _index(self, value: Any, upper: int) -> int:
+        if not isinstance(value, int) or not 0 <= value <= upper:
+            raise PreviewSessionError(f"Section index out of range: {value}")
+        return value
+
+    def replace_sections(self, sections: Any) -> None:
+        if not isinstance(sections, list):
+            raise PreviewSessionError("sections must be a list")
+        if len(sections) > settings.PREVIEW_WS_MAX_SECTIONS:
+            raise PreviewSessionError(f"At most {settings.PREVIEW_WS_MAX_SECTIONS} sections")
+        views = [self._section(s) for s in sections]
+        sizes = [len(orjson.dumps(s)) for s in sections]
+        self._check_size(sum(sizes) + len(self.profile_image or ""))
+        self.sections, self.sizes = views, sizes
+        self._touch()
+
+    def apply(self, message: Dict[str, Any]) -> None:
+        """Apply one edit message (see the protocol in api/cv.py)"""
+        kind = message.get("type")
+        if kind == "update":
+            index = self._index(message.get("index"), len(self.sections))
+            section = self._section(message.get("section"))
+            size = len(orjson.dumps(message["section"]))
+            if index == len(self.sections):
+                if index >= settings.PREVIEW_WS_MAX_SECTIONS:
+                    raise PreviewSessionError(f"At most {settings.PREVIEW_WS_MAX_SECTIONS} sections")
+                self._check_size(self.size + size)
+                self.sections.append(section)
+                self.sizes.append(size)
+            else:
+                self._check_size(self.size - self.sizes[index] + size)
+                self.sections[index] = section
+                self.sizes[index] = size
+        elif kind == "remove":
+            index = self._index(message.get("index"), len(self.sections) - 1)
+            del self.sections[index]
+            del self.sizes[index]
+        elif kind == "move":
+            source = self._index(message.get("from"), len(self.sections) - 1)
+            target = self._index(message.get("to"), len(self.sections) - 1)
+            self.sections.insert(target, self.sections.pop(source))
+            self.sizes.insert(target, self.sizes.pop(source))
+        elif kind == "sections":
+            self.replace_sections(message.get("sections"))
+            return
+        elif kind == "template":
+            template_id = message.get("template_id")
+            if not isinstance(template_id, str) or not template_id:
+                raise PreviewSessionError("template_id is required")
+            self.template_id = template_id
+            self.full_page = True
+        elif kind == "profile_image":
+            profile_image = message.get("profile_image")
+            if profile_image is not None and not isinstance(profile_image, str):
+                raise PreviewSessionError("profile_image must be a string")
+            self._check_size(self.size - len(self.profile_image or "") + len(profile_image or ""))
+            self.profile_image = profile_image
+        else:
+            raise PreviewSessionError(f"Unknown message type: {kind}")
+        self._touch()
+
+    def view(self) -> CVView:
+        # The client's list order is the display order
+        sections = tuple(
+            section if section.order_index == index else SectionView(
+                type=section.type,
+                title=section.title,
+                content=section.content,
+                order_index=index,
+                style_config=section.style_config,
+                id=section.id
+            )
+            for index, section in enumerate(self.sections)
+        )
+        return CVView(sections=sections, template_id=self.template_id, profile_image=self.profile_image)
+
+    async def render(self, preview_service: PreviewService) -> Dict[str, Any]:
+        """The page on the first push and after a template switch, fragment diffs otherwise"""
+        seq = self.seq
+        view = self.view().normalized()
+        if self.full_page:
+            html = await preview_service.generate_preview(view, self.template_id, mark_fragments=True)
+            keys = [preview_service.fragment_key(s, view.profile_image) for s in view.sections]
+            payload = {"type": "page", "html": html, "keys": keys}
+            self.full_page = False
+        else:
+            payload = {"type": "fragments", **await preview_service.generate_fragments(
+                view, self.template_id, known=list(self.known)
+            )}
+        self.known = set(payload["keys"])  # whatever the client doesn't show any more is forgotten
+        self.rendered_seq = seq
+        payload["seq"] = seq
+        return payload
+
+    async def wait_for_quiet(self) -> None:
+        """Sleep until edits pause for the debounce window, or the max delay is up"""
+        debounce = settings.PREVIEW_WS_DEBOUNCE_MS / 1000
+        max_delay = settings.PREVIEW_WS_MAX_DELAY_MS / 1000
+        while True:
+            now = time.monotonic()
+            quiet_at = self.last_edit_at + debounce
+            deadline = (self.first_edit_at or now) + max_delay
+            wake_at = min(quiet_at, deadline)
+            if now >= wake_at:
+                return
+            await asyncio.sleep(wake_at - now)
+
+
+class PreviewSessionRegistry:
+    """Live sessions of this worker, capped at PREVIEW_WS_MAX_SESSIONS"""
+
+    def __init__(self, max_sessions: int):
+        self.max_sessions = max_sessions
+        self._sessions: Set[PreviewSession] = set()
+
+    def open(self, user_id: Any, template_id: str, sections: List[Dict[str, Any]]) -> Optional[PreviewSession]:
+        """A new session, or None when the worker is full"""
+        if len(self._sessions) >= self.max_sessions:
+            logger.warning(f"Preview session cap reached ({self.max_sessions})")
+            return None
+        session = PreviewSession(user_id, template_id, sections)
+        self._sessions.add(session)
+        return session
+
+    def close(self, session: Optional[PreviewSession]) -> None:
+        self._sessions.discard(session)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+preview_sessions = PreviewSessionRegistry(settings.PREVIEW_WS_MAX_SESSIONS)
@@ -0,0 +1,38 @@
+# app/utils/dates.py
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Optional
+
+from .metrics import register_cache
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_date(value: str) -> Optional[datetime]:
+    """
+    Dates as the editor sends them: "2020-05-17", "2020-05-17T00:00:00.000Z"
+    or "2020-05" (month precision, which is all the templates show).
+    None for anything else. Memoized: a CV repeats the same few dates.
+    """
+    head = value.split("T", 1)[0].strip()
+    try:
+        if len(head) == 10:
+            return datetime.fromisoformat(head)
+        if len(head) == 7 and head[4] == "-":
+            return datetime(int(head[:4]), int(head[5:]), 1)
+    except ValueError:
+        pass
+    return None
+
+
+register_cache("iso_dates", parse_iso_date)
+
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """A stored or submitted date field as a datetime (None when empty or unparseable)"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, str) and value:
+        return parse_iso_date(value)
+    return None
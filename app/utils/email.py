@@ -1,23 +1,29 @@
 # app/utils/email.py
 import logging
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
+from functools import lru_cache
 from pathlib import Path
 from app.config import settings
 from jinja2 import Template
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=587,
-    MAIL_FROM_NAME="CV Builder Pro",
-    MAIL_SERVER="smtp.gmail.com",
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    VALIDATE_CERTS=False, #To be removed after Testing
-    USE_CREDENTIALS=True,
-    TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates' / 'email'
-)
+
+@lru_cache(maxsize=1)
+def mail_config():
+    # fastapi-mail (and aiosmtplib) load with the first email, not with the app
+    from fastapi_mail import ConnectionConfig
+
+    return ConnectionConfig(
+        MAIL_USERNAME=settings.MAIL_USERNAME,
+        MAIL_PASSWORD=settings.MAIL_PASSWORD,
+        MAIL_FROM=settings.MAIL_FROM,
+        MAIL_PORT=settings.MAIL_PORT or 587,
+        MAIL_FROM_NAME="CV Builder Pro",
+        MAIL_SERVER=settings.MAIL_SERVER or "smtp.gmail.com",
+        MAIL_STARTTLS=settings.MAIL_TLS,
+        MAIL_SSL_TLS=settings.MAIL_SSL,
+        VALIDATE_CERTS=False, #To be removed after Testing
+        USE_CREDENTIALS=settings.USE_CREDENTIALS,
+        TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates' / 'email'
+    )
 
 async def send_verification_email_(email: str, token: str, subject: str, template: str, data: dict):
     """Send verification email with custom template"""
@@ -83,6 +89,8 @@ async def send_verification_email_(email: str, token: str, subject: str, templat
     # Render the template with the provided data
     html = template_obj.render(verify_url=verification_url, expires_in="48 hours")
 
+    from fastapi_mail import FastMail, MessageSchema
+
     # Create the email message
     message = MessageSchema(
         subject=subject,
@@ -92,5 +100,5 @@ async def send_verification_email_(email: str, token: str, subject: str, templat
     )
     
     # Send the email using FastMail
-    fm = FastMail(conf)
+    fm = FastMail(mail_config())
     await fm.send_message(message)
\ No newline at end of file
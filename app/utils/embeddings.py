@@ -0,0 +1,113 @@
+# app/utils/embeddings.py
+import re
+import zlib
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+import numpy as np
+
+from ..config import settings
+
+_DOTTED_RE = re.compile(r"(?<=\w)\.(?=\w)")   # node.js -> nodejs
+_SEPARATOR_RE = re.compile(r"[^\w+#]+")         # keep c++ / c# apart from c
+
+
+def canonical_term(term: str) -> str:
+    """Lowercase and strip punctuation so spelling variants share n-grams"""
+    term = _DOTTED_RE.sub("", term.lower().strip())
+    return _SEPARATOR_RE.sub(" ", term).strip()
+
+
+class HashedNgramEmbedder:
+    """
+    Character n-gram feature hashing into a fixed-size, L2-normalised vector.
+    No model download and no network: "PostgreSQL" and "Postgres" land close
+    together because they share most of their n-grams.
+    Uses crc32 rather than hash() so vectors are stable across processes.
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Sequence[int] = (2, 3, 4)):
+        self.dim = dim
+        self.ngram_range = tuple(ngram_range)
+
+    def embed(self, term: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        padded = f"<{canonical_term(term)}>"
+        for n in self.ngram_range:
+            for i in range(len(padded) - n + 1):
+                h = zlib.crc32(padded[i:i + n].encode("utf-8"))
+                vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class EmbeddingIndex:
+    """
+    Embedding table for a vocabulary of short terms, filled on demand.
+    Holds at most maxsize terms; a new term past that takes over the row of
+    the least recently used one.
+    """
+
+    def __init__(self, embedder: HashedNgramEmbedder, maxsize: int = 50_000):
+        self.embedder = embedder
+        self.maxsize = maxsize
+        self._rows: "OrderedDict[str, int]" = OrderedDict()  # term -> table row, oldest first
+        self._table = np.zeros((256, embedder.dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, term: str) -> bool:
+        return canonical_term(term) in self._rows
+
+    def _row(self, key: str, vector: Optional[np.ndarray] = None) -> int:
+        row = self._rows.get(key)
+        if row is not None:
+            self._rows.move_to_end(key)
+            return row
+        if len(self._rows) >= self.maxsize:
+            _, row = self._rows.popitem(last=False)
+        else:
+            row = len(self._rows)
+            if row >= len(self._table):
+                grown = np.zeros((len(self._table) * 2, self.embedder.dim), dtype=np.float32)
+                grown[:row] = self._table[:row]
+                self._table = grown
+        self._table[row] = self.embedder.embed(key) if vector is None else vector
+        self._rows[key] = row
+        return row
+
+    def add(self, terms: Sequence[str], vectors: np.ndarray) -> None:
+        """Seed the table with vectors computed elsewhere (e.g. stored with a CV)"""
+        if vectors.shape != (len(terms), self.embedder.dim):
+            return
+        for term, vector in zip(terms, vectors):
+            self._row(canonical_term(term), vector)
+
+    def embed(self, terms: Sequence[str]) -> np.ndarray:
+        """(len(terms), dim) matrix of unit vectors, computing only unseen terms"""
+        if not terms:
+            return np.zeros((0, self.embedder.dim), dtype=np.float32)
+        keys = [canonical_term(term) for term in terms]
+        if len(set(keys)) > self.maxsize:
+            # Would evict its own rows before they are read; embed without the table
+            return np.stack([self.embedder.embed(key) for key in keys])
+        rows = [self._row(key) for key in keys]
+        return self._table[rows]
+
+    def similarity(self, left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of every left term against every right term"""
+        return self.embed(left) @ self.embed(right).T
+
+    def best_match_scores(self, left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+        """For each left term, its highest similarity to any right term"""
+        if not left or not right:
+            return np.zeros(len(left), dtype=np.float32)
+        return self.similarity(left, right).max(axis=1)
+
+
+# Shared per-worker table for skill and requirement phrases
+skill_index = EmbeddingIndex(
+    HashedNgramEmbedder(dim=settings.SKILL_EMBEDDING_DIM),
+    maxsize=settings.SKILL_EMBEDDING_CACHE_SIZE
+)
@@ -0,0 +1,59 @@
+# app/utils/etag.py
+import hashlib
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from .metrics import register_cache
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "cv")
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given values (str() of each, in order)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def body_etag(body: bytes, *parts: Any) -> str:
+    """Strong ETag for a rendering of a request body (POST preview/export)"""
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return make_etag(digest, *parts)
+
+
+@lru_cache(maxsize=64)
+def template_version(template_id: str) -> str:
+    """Content hash of a CV template, so edited templates invalidate cached renders"""
+    path = os.path.join(TEMPLATE_DIR, f"{os.path.basename(template_id)}.html")
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    except OSError:
+        return "missing"
+
+
+register_cache("template_versions", template_version)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, so compressed W/ variants match too)"""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,154 @@
+# app/utils/logging_config.py
+"""
+Logging for the whole process. Records are handed to a bounded queue on the
+calling thread and formatted and written by a single listener thread, so a
+request never waits on stdout. Output is one JSON object per line (or plain
+text for local runs), tagged with the id of the request that produced it.
+
+Levels come from Settings: LOG_LEVEL for everything, LOG_LEVELS for
+per-logger overrides, e.g. LOG_LEVELS='{"app.api.auth": "DEBUG"}'.
+Disabled levels are rejected by the logger before a record is built, so
+debug calls with %-style arguments cost a level check.
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import orjson
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through extra= (uvicorn's ANSI copy excepted)
+_RECORD_FIELDS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "color_message"}
+
+# Loggers of the server running the app; they come with their own handlers
+SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access", "gunicorn.error")
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "request_id", None):
+            record.request_id = "-"
+        return super().format(record)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Captures what must be read on the calling thread (the formatted message,
+    the traceback, the request id) and drops the record instead of blocking
+    when the listener falls behind.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: str = "INFO",
+    levels: Optional[Dict[str, str]] = None,
+    fmt: str = "json",
+    queue_size: int = 10_000
+) -> None:
+    """Route every logger (uvicorn's too) through one queue and listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _listener = QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.handlers = [NonBlockingQueueHandler(log_queue)]
+    root.setLevel(level.upper())
+
+    route_server_loggers()
+
+    for name, logger_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level.upper())
+
+
+def route_server_loggers() -> None:
+    """Send uvicorn's and gunicorn's records through our handler instead of their own"""
+    for name in SERVER_LOGGERS:
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+
+def _restart_after_fork() -> None:
+    """
+    A forked worker inherits the queue but not the listener thread. Give it
+    its own of both so its records aren't silently dropped.
+    """
+    global _listener
+    if _listener is None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=_listener.queue.maxsize)
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=False)
+    _listener.start()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, NonBlockingQueueHandler):
+            handler.queue = log_queue
+            handler.dropped = 0
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def dropped_records() -> int:
+    handler = next((h for h in logging.getLogger().handlers if isinstance(h, NonBlockingQueueHandler)), None)
+    return handler.dropped if handler else 0
+
+
+@atexit.register
+def _flush() -> None:
+    if _listener is not None:
+        _listener.stop()
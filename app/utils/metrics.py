@@ -0,0 +1,331 @@
+# app/utils/metrics.py
+"""
+Prometheus metrics, registered on prometheus_client's default registry and
+served by GET /metrics. Hot paths keep label children bound up front (or
+cached on first use) so recording is a dict lookup and an observe().
+
+Under gunicorn (see gunicorn.conf.py) PROMETHEUS_MULTIPROC_DIR is set and
+every worker writes its counters, gauges and histograms to files there, so
+a scrape answered by any worker sums all of them. The scrape-time
+collectors (pool, caches, log drops) read in-process state and describe
+only the worker that answered.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.pool import QueuePool
+
+from ..config import settings
+from .logging_config import dropped_records
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+_TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+
+def _template_names(*dirs: str) -> frozenset:
+    names = set()
+    for name in dirs:
+        path = os.path.join(_TEMPLATE_ROOT, name)
+        if os.path.isdir(path):
+            names.update(os.path.splitext(f)[0] for f in os.listdir(path) if f.endswith(".html"))
+    return frozenset(names)
+
+
+# Label values are capped to the templates we ship: template_id comes from the client
+KNOWN_TEMPLATES = _template_names("cv", "cover_letters")
+
+
+# Scrape-time collectors, also added to the multiprocess registry in scrape()
+_process_collectors: List[Collector] = []
+
+
+def _register(collector: Collector) -> None:
+    REGISTRY.register(collector)
+    _process_collectors.append(collector)
+
+
+def scrape() -> bytes:
+    """The /metrics body: every worker's metrics in multiprocess mode, this process's otherwise"""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _process_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
+
+
+def template_label(template_id: Optional[str]) -> str:
+    name = os.path.splitext(os.path.basename(template_id or ""))[0]
+    return name if name in KNOWN_TEMPLATES else "other"
+
+
+EXPORT_STAGE_SECONDS = Histogram(
+    "export_stage_seconds",
+    "Time spent in each stage of a CV or cover letter export",
+    ["stage", "template_id", "format"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+EXPORT_HTML_BYTES = Histogram(
+    "export_html_bytes",
+    "Size of the rendered HTML an export starts from",
+    ["template_id", "format"],
+    buckets=tuple(2 ** i * 1024 for i in range(2, 13)),  # 4KB .. 4MB
+)
+EXPORT_OUTPUT_BYTES = Histogram(
+    "export_output_bytes",
+    "Size of the exported PDF or DOCX",
+    ["template_id", "format"],
+    buckets=tuple(2 ** i * 1024 for i in range(2, 15)),  # 4KB .. 16MB
+)
+EXPORT_PAGES = Histogram(
+    "export_pages",
+    "Pages in an exported PDF",
+    ["template_id", "format"],
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30),
+)
+
+
+class _ExportMetrics(NamedTuple):
+    """The children of one (template_id, format), bound on first use"""
+    stages: Dict[str, Any]
+    html: Any
+    output: Any
+    pages: Any
+
+
+_export_metrics: Dict[Tuple[str, str], _ExportMetrics] = {}
+
+
+def _export_children(labels: Tuple[str, str]) -> _ExportMetrics:
+    children = _export_metrics.get(labels)
+    if children is None:
+        children = _export_metrics[labels] = _ExportMetrics(
+            {}, EXPORT_HTML_BYTES.labels(*labels), EXPORT_OUTPUT_BYTES.labels(*labels), EXPORT_PAGES.labels(*labels)
+        )
+    return children
+
+
+class ExportTimer:
+    """
+    Stage timings and sizes of one export. Each stage is observed into the
+    histograms as it ends and kept for the Server-Timing debug header.
+    """
+
+    def __init__(self, template_id: Optional[str], format: str):
+        self.labels = (template_label(template_id), format)
+        self.stages: List[Tuple[str, float]] = []
+        self._metrics = _export_children(self.labels)
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages.append((name, seconds))
+        child = self._metrics.stages.get(name)
+        if child is None:
+            child = self._metrics.stages[name] = EXPORT_STAGE_SECONDS.labels(name, *self.labels)
+        child.observe(seconds)
+
+    def html(self, html: str) -> None:
+        self._metrics.html.observe(len(html))
+
+    def output(self, body: bytes, pages: Optional[int] = None) -> None:
+        self._metrics.output.observe(len(body))
+        if pages is not None:
+            self._metrics.pages.observe(pages)
+
+    def server_timing(self) -> str:
+        stages = self.stages + [("total", time.perf_counter() - self._started)]
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages)
+
+    def headers(self) -> Dict[str, str]:
+        """Server-Timing for the response, when EXPORT_TIMING_HEADER is on"""
+        if not settings.EXPORT_TIMING_HEADER:
+            return {}
+        return {"Server-Timing": self.server_timing()}
+
+
+# HTTP (see middleware/metrics.py)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled", multiprocess_mode="livesum")
+
+
+# Exports; exports run inline, so "queued" means started and not yet finished
+
+EXPORTS_IN_PROGRESS = Gauge(
+    "exports_in_progress", "Exports currently being generated", ["format"], multiprocess_mode="livesum"
+)
+_exports_in_progress = {format: EXPORTS_IN_PROGRESS.labels(format) for format in ("pdf", "docx")}
+
+
+def exports_in_progress(format: str) -> Gauge:
+    return _exports_in_progress["pdf" if format == "pdf" else "docx"]
+
+
+# Database pool
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=FAST_BUCKETS + (2.5, 5.0, 10.0, 30.0),
+)
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
+
+class PoolCollector(Collector):
+    """Pool usage, read at scrape time so checkouts pay nothing for it"""
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return
+        gauge = GaugeMetricFamily("db_pool_connections", "Database pool connections by state", labels=["state"])
+        gauge.add_metric(["checked_out"], pool.checkedout())
+        gauge.add_metric(["idle"], pool.checkedin())
+        gauge.add_metric(["overflow"], max(pool.overflow(), 0))
+        yield gauge
+        yield GaugeMetricFamily("db_pool_size", "Configured pool size", value=pool.size())
+
+
+def register_pool_metrics(engine: Any) -> None:
+    _register(PoolCollector(engine))
+
+
+# Redis
+
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+_redis_commands: Dict[str, Any] = {}
+
+
+def observe_redis(command: str, seconds: float) -> None:
+    child = _redis_commands.get(command)
+    if child is None:
+        child = _redis_commands[command] = REDIS_COMMAND_SECONDS.labels(command)
+    child.observe(seconds)
+
+
+# LLM calls (see services/llm_metrics.py)
+
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_seconds",
+    "LLM call latency by pipeline stage",
+    ["stage", "outcome"],
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0),
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens",
+    "Tokens per LLM call by pipeline stage",
+    ["stage", "kind"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+)
+_llm_calls: Dict[Tuple[str, str], Any] = {}
+_llm_tokens: Dict[Tuple[str, str], Any] = {}
+
+
+def observe_llm_call(stage: str, outcome: str, seconds: float) -> None:
+    child = _llm_calls.get((stage, outcome))
+    if child is None:
+        child = _llm_calls[stage, outcome] = LLM_CALL_SECONDS.labels(stage, outcome)
+    child.observe(seconds)
+
+
+def observe_llm_tokens(stage: str, kind: str, tokens: int) -> None:
+    child = _llm_tokens.get((stage, kind))
+    if child is None:
+        child = _llm_tokens[stage, kind] = LLM_TOKENS.labels(stage, kind)
+    child.observe(tokens)
+
+
+# Dependency health (see services/health_service.py)
+
+DEPENDENCY_UP = Gauge(
+    "dependency_up", "1 if the last probe of a dependency succeeded", ["dependency"],
+    multiprocess_mode="livemostrecent"  # every worker probes; the newest result wins
+)
+DEPENDENCY_PROBE_SECONDS = Histogram(
+    "dependency_probe_seconds",
+    "Duration of background dependency probes",
+    ["dependency"],
+    buckets=FAST_BUCKETS + (2.5, 5.0),
+)
+
+
+# Logging (see utils/logging_config.py)
+
+class LogCollector(Collector):
+    def collect(self):
+        yield CounterMetricFamily(
+            "log_records_dropped", "Log records dropped because the log queue was full", value=dropped_records()
+        )
+
+
+_register(LogCollector())
+
+
+# In-process caches
+
+_caches: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """A TTLCache (hits/misses/len) or an lru_cache-wrapped function (cache_info)"""
+    _caches[name] = cache
+
+
+class CacheCollector(Collector):
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "In-process cache hits", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "In-process cache misses", labels=["cache"])
+        entries = GaugeMetricFamily("cache_entries", "Entries held by an in-process cache", labels=["cache"])
+        for name, cache in _caches.items():
+            if hasattr(cache, "cache_info"):
+                info = cache.cache_info()
+                counts = (info.hits, info.misses, info.currsize)
+            else:
+                counts = (cache.hits, cache.misses, len(cache))
+            hits.add_metric([name], counts[0])
+            misses.add_metric([name], counts[1])
+            entries.add_metric([name], counts[2])
+        yield hits
+        yield misses
+        yield entries
+
+
+_register(CacheCollector())
@@ -1,12 +1,29 @@
 # app/utils/redis_helper.py
+import logging
 import redis
 from jose import jwt
 from datetime import datetime
 from ..config import settings
 from typing import Optional
+import time
+from .metrics import observe_redis
+
+logger = logging.getLogger(__name__)
+
+
+class TimedRedis(redis.StrictRedis):
+    """StrictRedis that records each command's latency"""
+
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            observe_redis(str(args[0]).lower(), time.perf_counter() - start)
+
 
 # Create Redis connection
-r = redis.StrictRedis(
+r = TimedRedis(
     host=settings.REDISHOST, 
     port=settings.REDISPORT, 
     db=0, 
@@ -32,14 +49,14 @@ def blacklist_token(token: str, secret_key: str, algorithm: str = "HS256"):
                 ttl,
                 "blacklisted"
             )
-            print(f"Token blacklisted successfully with TTL: {ttl} seconds")
+            logger.debug("Token blacklisted with TTL %d seconds", ttl)
             return True
         return False
     except jwt.ExpiredSignatureError:
-        print("Token already expired, no need to blacklist")
+        logger.debug("Token already expired, no need to blacklist")
         return False
     except Exception as e:
-        print(f"Error blacklisting token: {str(e)}")
+        logger.error("Error blacklisting token: %s", e)
         return False
 
 def is_token_blacklisted(token: str) -> bool:
@@ -49,13 +66,12 @@ def is_token_blacklisted(token: str) -> bool:
     try:
         key = f"blacklisted_token:{token}"
         exists = r.exists(key)
-        if exists:
-            # Optionally get TTL for debugging
-            ttl = r.ttl(key)
-            print(f"Found blacklisted token with TTL: {ttl} seconds")
+        # The TTL costs a second round trip, so only fetch it when someone reads it
+        if exists and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found blacklisted token with TTL %d seconds", r.ttl(key))
         return exists
     except Exception as e:
-        print(f"Error checking token blacklist: {str(e)}")
+        logger.error("Error checking token blacklist: %s", e)
         return False
 
 def clear_expired_tokens():
@@ -70,9 +86,9 @@ def clear_expired_tokens():
             if r.ttl(key) <= 0:
                 r.delete(key)
                 expired += 1
-        print(f"Cleared {expired} expired tokens")
+        logger.info("Cleared %d expired tokens", expired)
     except Exception as e:
-        print(f"Error clearing expired tokens: {str(e)}")
+        logger.error("Error clearing expired tokens: %s", e)
 
 # Optional: health check function
 def check_redis_connection() -> bool:
@@ -82,5 +98,5 @@ def check_redis_connection() -> bool:
     try:
         return r.ping()
     except Exception as e:
-        print(f"Redis connection error: {str(e)}")
+        logger.error("Redis connection error: %s", e)
         return False
\ No newline at end of file
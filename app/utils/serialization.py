@@ -0,0 +1,19 @@
+# app/utils/serialization.py
+from typing import Dict, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def model_response(model: BaseModel, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize a response model straight to JSON bytes with pydantic-core.
+    Returning a Response skips FastAPI's second validation pass and jsonable_encoder;
+    keep response_model on the route so the OpenAPI schema stays accurate.
+    """
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model),
+        media_type="application/json",
+        status_code=status_code,
+        headers=headers
+    )
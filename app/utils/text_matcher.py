@@ -0,0 +1,130 @@
+# app/utils/text_matcher.py
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+from .metrics import register_cache
+
+# Words, dotted names (node.js, asp.net) and trailing +/# (c++, c#)
+_TOKEN_RE = re.compile(r"[^\W_]+(?:\.[^\W_]+)*[+#]*")
+
+
+class Match(NamedTuple):
+    pattern: int  # index of the pattern as passed to the matcher
+    start: int    # character offsets in the searched text
+    end: int
+
+
+@lru_cache(maxsize=8192)
+def stem(token: str) -> str:
+    """Very light suffix stripping so 'managed', 'manages' and 'managing' meet"""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    for suffix in ("ing", "ed", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith(("ss", "us", "is")):
+                break
+            token = token[:-len(suffix)]
+            break
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+    return token
+
+
+register_cache("keyword_stems", stem)
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Yield (stem, start, end) for every word in text"""
+    for m in _TOKEN_RE.finditer(text):
+        yield stem(m.group().lower()), m.start(), m.end()
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over stemmed word tokens.
+    All patterns are found in a single pass over the text, and because the
+    alphabet is whole words a match can never start or end mid-word.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (pattern index, token length)
+
+        for index, pattern in enumerate(self.patterns):
+            words = [token for token, _, _ in tokenize(pattern)]
+            if not words:
+                continue
+            node = 0
+            for word in words:
+                nxt = self._goto[node].get(word)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][word] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((index, len(words)))
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _scan(self, text: str) -> Iterator[Match]:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        spans: List[int] = []  # start offset of every token seen so far
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            lowered = text  # lowercasing moved offsets (rare); lower per token below
+        for m in _TOKEN_RE.finditer(lowered):
+            word = stem(m.group().lower())
+            spans.append(m.start())
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            if out[node]:
+                last = len(spans) - 1
+                for pattern, length in out[node]:
+                    yield Match(pattern, spans[last - length + 1], m.end())
+
+    def find_all(self, text: str) -> List[Match]:
+        """Every occurrence of every pattern, in order of where it ends"""
+        return list(self._scan(text))
+
+    def first_matches(self, text: str) -> Dict[int, Match]:
+        """First occurrence of each pattern found in text"""
+        first: Dict[int, Match] = {}
+        for match in self._scan(text):
+            if match.pattern not in first:
+                first[match.pattern] = match
+        return first
+
+    def matched(self, text: str) -> Set[int]:
+        """Indices of the patterns present in text"""
+        return {match.pattern for match in self._scan(text)}
+
+    def search(self, text: str) -> bool:
+        """True as soon as any pattern is found"""
+        return next(self._scan(text), None) is not None
+
+
+@lru_cache(maxsize=256)
+def compile_matcher(patterns: Tuple[str, ...]) -> KeywordMatcher:
+    """Build (or reuse) the automaton for a set of patterns"""
+    return KeywordMatcher(patterns)
+
+
+register_cache("keyword_matchers", compile_matcher)
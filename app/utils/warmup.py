@@ -0,0 +1,58 @@
+# app/utils/warmup.py
+"""
+The heavy subsystems (WeasyPrint, python-docx, LangChain, boto3,
+fastapi-mail) are imported where they are first used, so importing
+app.main stays fast and the server accepts traffic as soon as the
+database is ready. Once it does, warm_up() imports them in a worker
+thread so the first export or AI request doesn't pay for it either. A
+request that arrives mid-import simply waits on Python's import lock.
+
+benchmarks/import_time.py fails when one of LAZY_MODULES is pulled back
+into the startup path.
+"""
+import importlib
+import logging
+import sys
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Loaded after startup; in the order requests are most likely to need them
+LAZY_MODULES = (
+    "weasyprint",
+    "docx",
+    "app.services.ai_service",  # langchain, langchain_openai, openai
+    "boto3",
+    "fastapi_mail",
+)
+
+
+def warm_up() -> Dict[str, float]:
+    """Import LAZY_MODULES and compile the DOCX bases; blocking, run it in a thread"""
+    if all(name in sys.modules for name in LAZY_MODULES):
+        return {}  # done by the gunicorn master before forking (see gunicorn.conf.py)
+    timings = {}
+    for name in LAZY_MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # The first real use will raise the same error where it can be handled
+            logger.exception("Warmup import of %s failed", name)
+            continue
+        timings[name] = time.perf_counter() - start
+
+    from ..services.docx_engine import TEMPLATE_STYLES, docx_templates
+
+    start = time.perf_counter()
+    for template_id in TEMPLATE_STYLES:
+        docx_templates.get(template_id)
+    timings["docx_templates"] = time.perf_counter() - start
+
+    logger.info(
+        "Warmup done in %.2fs (%s)",
+        sum(timings.values()),
+        ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+    )
+    return timings
@@ -0,0 +1,93 @@
+# benchmarks/bench_docx_export.py
+"""
+DOCX export time for a CV with a 1-, 10- and 50-entry experience section.
+
+before: python-docx from scratch per export (Document(), style setup,
+        add_heading/add_paragraph/add_run), as ExportService.to_docx did
+after:  the template's compiled base (services/docx_engine.py), filled
+        with one document.xml per export
+
+    python -m benchmarks.bench_docx_export
+"""
+import os
+import timeit
+from io import BytesIO
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from docx import Document  # noqa: E402
+from docx.shared import Pt  # noqa: E402
+
+from app.models.read_models import CVView  # noqa: E402
+from app.services.docx_engine import DocxTemplates  # noqa: E402
+from benchmarks.bench_read_models import EXPERIENCE  # noqa: E402
+
+
+def make_cv(entries: int) -> CVView:
+    return CVView.from_dict({
+        "template_id": "modern",
+        "sections": [
+            {"type": "contact", "title": "Contact", "order_index": 0,
+             "content": {"name": "Jane Doe", "email": "jane@example.com", "phone": "1", "location": "Berlin"}},
+            {"type": "text", "title": "Profile", "order_index": 1, "content": "Engineer who likes fast, boring systems."},
+            {"type": "experience", "title": "Experience", "order_index": 2,
+             "content": [dict(EXPERIENCE) for _ in range(entries)]},
+        ],
+    }).normalized()
+
+
+def python_docx_export(cv: CVView) -> bytes:
+    """The previous implementation, reduced to the sections above"""
+    doc = Document()
+    style = doc.styles['Normal']
+    style.font.name = 'Calibri'
+    style.font.size = Pt(11)
+    for i in range(1, 4):
+        style = doc.styles[f'Heading {i}']
+        style.font.name = 'Calibri'
+        style.font.size = Pt(16 - i)
+        style.font.bold = True
+
+    for section in cv.sections:
+        if section.type == 'contact':
+            doc.add_heading(section.content['name'], 0).alignment = 1
+            para = doc.add_paragraph()
+            para.alignment = 1
+            para.add_run(section.content['email'])
+            para.add_run(f" | {section.content['phone']}")
+            para.add_run(f"\n{section.content['location']}")
+            doc.add_paragraph()
+        elif section.type == 'text':
+            doc.add_heading(section.title, 1)
+            doc.add_paragraph(section.content)
+            doc.add_paragraph()
+        elif section.type == 'experience':
+            doc.add_heading(section.title, 1)
+            for exp in section.content:
+                p = doc.add_paragraph()
+                p.add_run(exp['position']).bold = True
+                p.add_run(f" at {exp['company']}\n").italic = True
+                p.add_run(f"{exp['startDate'].strftime('%B %Y')} - {exp['endDate'].strftime('%B %Y')}\n").italic = True
+                doc.add_paragraph(exp['description'])
+                doc.add_paragraph()
+
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def run(entry_counts=(1, 10, 50), repeat=5, number=20):
+    templates = DocxTemplates()
+    templates.get("modern")  # compiled once per process, like the first export after a deploy
+
+    print(f"{'entries':>8} {'python-docx':>12} {'compiled':>10} {'speedup':>8} {'size':>8}")
+    for entries in entry_counts:
+        cv = make_cv(entries)
+        before = min(timeit.repeat(lambda: python_docx_export(cv), repeat=repeat, number=number)) / number * 1e3
+        after = min(timeit.repeat(lambda: templates.render(cv), repeat=repeat, number=number)) / number * 1e3
+        size = len(templates.render(cv))
+        print(f"{entries:>8} {before:>10.2f}ms {after:>8.2f}ms {before / after:>7.1f}x {size / 1024:>6.1f}KB")
+
+
+if __name__ == "__main__":
+    run()
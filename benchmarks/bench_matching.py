@@ -0,0 +1,85 @@
+# benchmarks/bench_matching.py
+"""
+Micro-benchmark for requirement/skill matching on long job postings.
+
+    python -m benchmarks.bench_matching
+"""
+import random
+import timeit
+
+from app.utils.text_matcher import KeywordMatcher, compile_matcher
+
+BASE_WORDS = (
+    "python django fastapi postgresql kubernetes docker terraform aws azure react "
+    "typescript leadership mentoring stakeholder communication agile scrum testing "
+    "ci cd pipelines monitoring observability security compliance data modelling "
+    "analytics machine learning pandas spark kafka microservices api design "
+    "customer success budgeting hiring roadmap delivery architecture migration"
+).split()
+
+
+def make_vocabulary(size: int, rng: random.Random):
+    """Real keywords plus pronounceable filler so postings look like prose"""
+    syllables = ["ka", "lo", "mi", "ren", "ta", "vor", "pel", "sun", "dri", "qua"]
+    filler = {
+        "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        for _ in range(size)
+    }
+    return BASE_WORDS + sorted(filler)
+
+
+def make_phrases(count: int, vocabulary, rng: random.Random):
+    return [" ".join(rng.sample(vocabulary, rng.randint(1, 4))) for _ in range(count)]
+
+
+def make_letter(words: int, vocabulary, rng: random.Random) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words)) + "."
+
+
+def legacy_scan(content: str, patterns):
+    """The per-pattern lower/in/find loop the service used to run"""
+    clean_content = content.lower()
+    found = {}
+    for pattern in patterns:
+        needle = pattern.lower()
+        if needle in clean_content:
+            found[pattern] = clean_content.find(needle)
+    return found
+
+
+def legacy_achievements(achievements, requirements):
+    return sum(
+        1 for achievement in achievements
+        if any(req.lower() in achievement.lower() for req in requirements)
+    )
+
+
+def run(requirement_counts=(10, 100, 250, 1000), letter_words=600, repeat=5, number=20):
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(2000, rng)
+    letter = make_letter(letter_words, vocabulary, rng)
+    achievements = [make_letter(25, vocabulary, rng) for _ in range(15)]
+
+    print(f"letter: {len(letter)} chars, {len(achievements)} achievements")
+    print(f"{'patterns':>9} {'legacy scan':>12} {'automaton':>12} {'build':>10} "
+          f"{'legacy ach.':>12} {'automaton ach.':>15}")
+    for count in requirement_counts:
+        patterns = make_phrases(count, vocabulary, rng)
+        matcher = KeywordMatcher(patterns)
+
+        def best(fn):
+            return min(timeit.repeat(fn, repeat=repeat, number=number)) / number * 1e3
+
+        legacy = best(lambda: legacy_scan(letter, patterns))
+        automaton = best(lambda: matcher.first_matches(letter))
+        build = best(lambda: KeywordMatcher(patterns))
+        legacy_ach = best(lambda: legacy_achievements(achievements, patterns))
+        automaton_ach = best(
+            lambda: sum(1 for a in achievements if compile_matcher(tuple(patterns)).search(a))
+        )
+        print(f"{count:>9} {legacy:>10.3f}ms {automaton:>10.3f}ms {build:>8.3f}ms "
+              f"{legacy_ach:>10.3f}ms {automaton_ach:>13.3f}ms")
+
+
+if __name__ == "__main__":
+    run()
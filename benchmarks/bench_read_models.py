@@ -0,0 +1,114 @@
+# benchmarks/bench_read_models.py
+"""
+Memory held per loaded CV: ORM entities (session + identity map) versus the
+frozen CVView read model built from plain column rows.
+
+    python -m benchmarks.bench_read_models
+
+Runs against an in-memory SQLite database unless DATABASE_URL is set.
+"""
+import asyncio
+import gc
+import os
+import tracemalloc
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import selectinload, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.models import Base, CV, Section, User  # noqa: E402
+from app.services.cv_service import CVService  # noqa: E402
+
+EXPERIENCE = {
+    "position": "Backend Engineer",
+    "company": "ACME",
+    "startDate": "2020-01-01",
+    "endDate": "2023-06-01",
+    "current": False,
+    "description": "<ul><li>Built Python APIs on PostgreSQL</li><li>Cut p95 latency by 40%</li></ul>",
+}
+
+
+def make_sections(count: int):
+    kinds = [
+        ("contact", {"name": "Jane Doe", "email": "jane@example.com", "phone": "1", "location": "Berlin"}),
+        ("text", "<p>Engineer who likes fast, boring systems.</p>"),
+        ("experience", [dict(EXPERIENCE) for _ in range(3)]),
+        ("skills", "Python, PostgreSQL, Docker, Kubernetes, FastAPI"),
+    ]
+    return [
+        {"type": kinds[i % 4][0], "title": kinds[i % 4][0].title(), "content": kinds[i % 4][1], "order_index": i}
+        for i in range(count)
+    ]
+
+
+def setup(cv_count: int, section_count: int):
+    engine = create_engine(
+        os.environ["DATABASE_URL"],
+        connect_args={"check_same_thread": False} if os.environ["DATABASE_URL"].startswith("sqlite") else {},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    user = User(email=f"{uuid.uuid4().hex[:8]}@bench.local", full_name="Bench", ai_credits=0)
+    db.add(user)
+    db.flush()
+    cv_ids = [uuid.uuid4() for _ in range(cv_count)]
+    db.execute(insert(CV), [{"id": cv_id, "user_id": user.id, "template_id": "modern"} for cv_id in cv_ids])
+    db.execute(
+        insert(Section),
+        [dict(section, cv_id=cv_id) for cv_id in cv_ids for section in make_sections(section_count)],
+    )
+    db.commit()
+    user_id = user.id
+    db.close()
+    return Session, user_id, cv_ids
+
+
+def measure(load):
+    """Bytes still allocated after load() returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = load()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def run(cv_count=50, section_counts=(1, 10, 40)):
+    print(f"{'sections/CV':>12} {'ORM per CV':>12} {'CVView per CV':>14} {'saving':>8}")
+    for section_count in section_counts:
+        Session, user_id, cv_ids = setup(cv_count, section_count)
+
+        def load_orm():
+            db = Session()
+            cvs = (
+                db.query(CV)
+                .filter(CV.id.in_(cv_ids))
+                .options(selectinload(CV.sections))
+                .all()
+            )
+            return db, cvs  # the session keeps the identity map alive, as in a request
+
+        def load_views():
+            db = Session()
+            service = CVService(db)
+            views = [asyncio.run(service.get_cv_view(cv_id, user_id)) for cv_id in cv_ids]
+            db.close()
+            return views
+
+        orm = measure(load_orm) / cv_count
+        views = measure(load_views) / cv_count
+        print(f"{section_count:>12} {orm / 1024:>10.1f}KB {views / 1024:>12.1f}KB {1 - views / orm:>8.0%}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,51 @@
+# benchmarks/bench_serialization.py
+"""
+Encode time for GET /api/cv/{id} with a 20-section CV.
+Runs against an in-memory SQLite database unless DATABASE_URL is set.
+
+before: ORM CV returned as-is -> jsonable_encoder -> JSONResponse (json.dumps)
+after:  CVView -> CVResponse -> pydantic-core to_json (utils.serialization.model_response)
+
+    python -m benchmarks.bench_serialization
+"""
+import asyncio
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.models import CV  # noqa: E402
+from app.models.cv import CVResponse  # noqa: E402
+from app.services.cv_service import CVService  # noqa: E402
+from app.utils.serialization import model_response  # noqa: E402
+from benchmarks.bench_read_models import setup  # noqa: E402
+
+
+def run(section_count=20, repeat=5, number=500):
+    Session, user_id, (cv_id,) = setup(1, section_count)
+    db = Session()
+    orm_cv = db.query(CV).filter(CV.id == cv_id).options(selectinload(CV.sections)).one()
+    view = asyncio.run(CVService(db).get_cv_view(cv_id, user_id))
+
+    cases = {
+        "jsonable_encoder + json.dumps (before)": lambda: JSONResponse(jsonable_encoder(orm_cv)).body,
+        "jsonable_encoder + orjson": lambda: ORJSONResponse(jsonable_encoder(orm_cv)).body,
+        "model_dump + orjson": lambda: ORJSONResponse(CVResponse.model_validate(view).model_dump(mode="json")).body,
+        "pydantic-core to_json (after)": lambda: model_response(CVResponse.model_validate(view)).body,
+    }
+
+    print(f"{section_count} sections, {len(cases['pydantic-core to_json (after)']())} bytes")
+    baseline = None
+    for name, fn in cases.items():
+        elapsed = min(timeit.repeat(fn, repeat=repeat, number=number)) / number * 1e6
+        baseline = baseline or elapsed
+        print(f"{name:>40} {elapsed:>9.1f}us {baseline / elapsed:>6.1f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    run()
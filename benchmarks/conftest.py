@@ -0,0 +1,136 @@
+# benchmarks/conftest.py
+"""
+Fixtures for the pytest-benchmark suite (test_*.py in this package): CV
+payloads of 1, 10 and 100 sections with long descriptions and a cover
+letter.
+
+Runs are saved to, and compared against, benchmarks/baselines/ unless
+--benchmark-storage says otherwise. --benchmark-compare without
+--benchmark-compare-fail fails on a median regression of more than
+DEFAULT_COMPARE_FAIL.
+"""
+import asyncio
+import os
+import random
+from typing import Any, Dict
+
+import pytest
+
+# Settings the app refuses to start without; nothing here talks to them
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("AWS_BUCKET_NAME", "benchmark")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_STORAGE = "file://./.benchmarks"  # pytest-benchmark's own default
+DEFAULT_COMPARE_FAIL = "median:20%"
+
+SECTION_COUNTS = (1, 10, 100)
+TEMPLATES = ("modern", "classic", "professional")
+
+_WORDS = (
+    "built", "APIs", "for", "payments", "with", "Python", "and", "PostgreSQL", "led", "a", "team",
+    "of", "engineers", "migrating", "services", "to", "Kubernetes", "reducing", "costs", "latency",
+    "designed", "event-driven", "pipelines", "on", "AWS", "mentored", "shipped", "observability",
+)
+SKILLS = (
+    "Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "AWS", "TypeScript", "React",
+    "CI/CD", "Terraform", "Redis", "GraphQL", "Kafka", "Leadership", "Communication", "Mentoring",
+)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Before pytest-benchmark reads its options (its hook runs last)
+    from pytest_benchmark.utils import parse_compare_fail
+
+    if config.getoption("benchmark_storage") == DEFAULT_STORAGE:
+        config.option.benchmark_storage = f"file://{BASELINES}"
+    if config.getoption("benchmark_compare") and not config.getoption("benchmark_compare_fail"):
+        config.option.benchmark_compare_fail = [parse_compare_fail(DEFAULT_COMPARE_FAIL)]
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def paragraph(rng: random.Random, sentences: int = 6) -> str:
+    """A long description, as the rich-text editor stores it"""
+    items = "".join(f"<li>{sentence(rng, 18)}</li>" for _ in range(sentences))
+    return f"<p>{sentence(rng, 30)}</p><ul>{items}</ul>"
+
+
+def make_section(kind: str, index: int, rng: random.Random) -> Dict[str, Any]:
+    if kind == "contact":
+        content: Any = {"name": "Jane Doe", "email": "jane@example.com", "phone": "+1 555 0100", "location": "Berlin"}
+    elif kind == "experience":
+        content = [
+            {
+                "position": rng.choice(("Backend Engineer", "Developer", "Tech Lead")),
+                "company": rng.choice(("Acme", "Globex", "Initech")),
+                "startDate": f"{2008 + i}-0{1 + i % 9}-01",
+                "endDate": f"{2009 + i}-0{1 + i % 9}-01",
+                "current": False,
+                "description": paragraph(rng),
+            }
+            for i in range(4)
+        ]
+    elif kind == "education":
+        content = [
+            {"degree": "BSc Computer Science", "institution": "TU Berlin", "startDate": "2004-10-01",
+             "endDate": "2008-09-30", "current": False, "description": paragraph(rng, 3)},
+        ]
+    elif kind == "skills":
+        content = ", ".join(rng.sample(SKILLS, 10))
+    elif kind == "languages":
+        content = [{"name": "English", "level": "C2"}, {"name": "German", "level": "B2"}]
+    else:  # text, hobbies
+        content = paragraph(rng)
+    return {"type": kind, "title": f"{kind.capitalize()} {index}", "order_index": index, "content": content}
+
+
+def make_cv(sections: int, seed: int = 1) -> Dict[str, Any]:
+    """
+    The cv_data payload of a CV with this many sections. A single section
+    is the experience list; larger CVs start with contact details and
+    cycle through every other section type.
+    """
+    rng = random.Random(seed)
+    if sections == 1:
+        return {"sections": [make_section("experience", 0, rng)]}
+    kinds = ("experience", "text", "education", "skills", "languages", "hobbies")
+    return {"sections": [make_section("contact", 0, rng)] + [
+        make_section(kinds[i % len(kinds)], i + 1, rng) for i in range(sections - 1)
+    ]}
+
+
+def make_letter(rng: random.Random, paragraphs: int = 5) -> str:
+    body = "\n\n".join(" ".join(sentence(rng, 20) for _ in range(4)) for _ in range(paragraphs))
+    return f"Dear Hiring Manager,\n\n{body}\n\nSincerely,\nJane Doe"
+
+
+@pytest.fixture(scope="session")
+def loop():
+    """One event loop for every awaited call, so runs measure the coroutine and not loop setup"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session", params=SECTION_COUNTS, ids=lambda n: f"{n}-sections")
+def cv_data(request) -> Dict[str, Any]:
+    return make_cv(request.param)
+
+
+@pytest.fixture(scope="session", params=TEMPLATES)
+def template_id(request) -> str:
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def letter() -> str:
+    return make_letter(random.Random(3))
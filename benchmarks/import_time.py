@@ -0,0 +1,115 @@
+# benchmarks/import_time.py
+"""
+Cold import of app.main, measured with `python -X importtime` in a fresh
+interpreter. Prints the slowest imports by cumulative time and exits 1
+when one of the lazily loaded subsystems (utils/warmup.py LAZY_MODULES and
+their dependencies) is imported at startup again, or when the total goes
+over --budget (BUDGET by default).
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --top 40 --budget 2.5
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds for a cold import of app.main (tests/test_import_time.py enforces it).
+# About 1.5-2s without the lazy subsystems; langchain alone adds over a second.
+BUDGET = 3.0
+
+# Top-level packages that must not load with app.main (tests/test_import_time.py enforces it)
+FORBIDDEN = (
+    "weasyprint",
+    "docx",
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "langsmith",
+    "openai",
+    "boto3",
+    "botocore",
+    "fastapi_mail",
+)
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(target: str = "app.main") -> List[ImportTime]:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"importing {target} failed")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append(ImportTime(
+            name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2
+        ))
+    return timings
+
+
+def total_seconds(timings: List[ImportTime], target: str = "app.main") -> float:
+    return max((t.cumulative_us for t in timings if t.module == target), default=0) / 1e6
+
+
+def digest(timings: List[ImportTime], top: int) -> str:
+    total = next((t.cumulative_us for t in timings if t.depth == 0 and t.module == "app.main"), 0)
+    packages: Dict[str, int] = {}
+    for t in timings:
+        package = t.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + t.self_us
+
+    lines = [f"app.main: {total / 1e6:.3f}s, {len(timings)} modules", "", "slowest imports (cumulative):"]
+    for t in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        lines.append(f"  {t.cumulative_us / 1e3:9.1f}ms  {'  ' * t.depth}{t.module}")
+    lines += ["", "by top-level package (self time):"]
+    for package, self_us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:top]:
+        lines.append(f"  {self_us / 1e3:9.1f}ms  {package}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--budget", type=float, default=BUDGET, help="seconds; fail above this")
+    args = parser.parse_args()
+
+    timings = measure()
+    print(digest(timings, args.top))
+
+    failures = []
+    loaded = {t.module.split(".")[0] for t in timings}
+    for package in FORBIDDEN:
+        if package in loaded:
+            failures.append(f"{package} is imported at startup; import it where it is used")
+    total = total_seconds(timings)
+    if total > args.budget:
+        failures.append(f"importing app.main took {total:.2f}s, budget is {args.budget:.2f}s")
+
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: no heavy subsystem loads with app.main")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# benchmarks/test_matching.py
+"""
+Job matching and letter coverage on long postings, without calling the LLM.
+
+    pytest benchmarks/test_matching.py
+"""
+import random
+
+import pytest
+
+from app.models.ai_models import CVAnalysis, JobAnalysis
+from app.services.ai_service import CoverLetterService
+from benchmarks.conftest import SKILLS, sentence
+
+
+def make_job_analysis(requirements: int, rng: random.Random) -> JobAnalysis:
+    return JobAnalysis(
+        company_name="Acme",
+        position="Backend Engineer",
+        key_requirements=[
+            f"{rng.randint(2, 8)}+ years of {rng.choice(SKILLS)} {sentence(rng, 4).rstrip('.')}"
+            for _ in range(requirements)
+        ],
+        required_skills=list(SKILLS),
+        company_values=["ownership", "customer focus"],
+        contact_info=None,
+        department="Engineering",
+        location="Remote",
+        employment_type="full-time",
+    )
+
+
+@pytest.fixture(scope="module")
+def service():
+    return CoverLetterService()  # builds the LLM clients; nothing here calls them
+
+
+@pytest.fixture(scope="module", params=[10, 100], ids=lambda n: f"{n}-requirements")
+def job_analysis(request) -> JobAnalysis:
+    return make_job_analysis(request.param, random.Random(request.param))
+
+
+@pytest.fixture(scope="module")
+def cv_analysis(job_analysis) -> CVAnalysis:
+    rng = random.Random(4)
+    return CVAnalysis(
+        key_experiences=[req.lower() for req in job_analysis.key_requirements[::2]],
+        highlighted_skills=rng.sample(SKILLS, 8),
+        achievements=[f"Delivered {req}" for req in job_analysis.key_requirements[::3]],
+        value_proposition="Engineer who ships reliable services",
+        education_match=True,
+        experience_level_match=True,
+    )
+
+
+@pytest.mark.benchmark(group="matching")
+@pytest.mark.parametrize("fuzzy", [False, True], ids=["exact", "fuzzy"])
+def test_calculate_matching_score(benchmark, service, cv_analysis, job_analysis, fuzzy):
+    score = benchmark(service._calculate_matching_score, cv_analysis, job_analysis, fuzzy)
+    assert score["total_score"] > 0  # errors come back as all zeros
+
+
+@pytest.mark.benchmark(group="matching")
+def test_identify_covered_points(benchmark, service, job_analysis, letter):
+    # Half the requirements quoted in the letter, half missing
+    content = letter + "\n\n" + " ".join(job_analysis.key_requirements[::2])
+    coverage = benchmark(service._identify_covered_points, content, job_analysis)
+    assert coverage["covered"] and coverage["missing"]
@@ -0,0 +1,77 @@
+# benchmarks/test_rendering.py
+"""
+Preview and export of a CV per template and size, and of a cover letter.
+
+    pytest benchmarks/test_rendering.py
+"""
+import pytest
+
+from app.models.read_models import CVView
+from app.services import preview_service
+from app.services.cover_letter_export_service import CoverLetterExportService
+from app.services.export_service import ExportService
+from app.services.preview_service import PreviewService
+
+
+def _weasyprint_loads() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):  # OSError: pango/cairo are not installed
+        return False
+    return True
+
+
+needs_weasyprint = pytest.mark.skipif(not _weasyprint_loads(), reason="WeasyPrint or its system libraries are missing")
+
+
+@pytest.fixture(scope="module")
+def preview():
+    return PreviewService()
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    return ExportService()
+
+
+@pytest.fixture(scope="module")
+def cover_letter_exporter():
+    return CoverLetterExportService()
+
+
+@pytest.mark.benchmark(group="preview")
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def test_generate_preview(benchmark, loop, preview, cv_data, template_id, cache):
+    """cold: every section rendered; warm: every fragment cached, as while typing in one section"""
+    def run():
+        if cache == "cold":
+            preview_service._fragment_cache.clear()
+        return loop.run_until_complete(preview.generate_preview(cv_data, template_id))
+
+    html = benchmark(run)
+    assert html.startswith("<!DOCTYPE html>")
+
+
+@needs_weasyprint
+@pytest.mark.benchmark(group="export-pdf")
+def test_export_pdf(benchmark, loop, preview, exporter, cv_data, template_id):
+    html = loop.run_until_complete(preview.generate_preview(cv_data, template_id))
+    pdf = benchmark(lambda: loop.run_until_complete(exporter.to_pdf(html)))
+    assert pdf
+
+
+@pytest.mark.benchmark(group="export-docx")
+def test_export_docx(benchmark, loop, exporter, cv_data, template_id):
+    cv = CVView.from_dict(cv_data, template_id).normalized()  # as the export route hands it over
+    docx = benchmark(lambda: loop.run_until_complete(exporter.to_docx(cv, template_id)))
+    assert docx.startswith(b"PK")
+
+
+@pytest.mark.benchmark(group="cover-letter-export")
+@pytest.mark.parametrize("fmt", [pytest.param("pdf", marks=needs_weasyprint), "docx"])
+def test_export_cover_letter(benchmark, loop, cover_letter_exporter, letter, fmt):
+    export = cover_letter_exporter.to_pdf if fmt == "pdf" else cover_letter_exporter.to_docx
+    document = benchmark(lambda: loop.run_until_complete(
+        export(letter, company_name="Acme", job_title="Backend Engineer", author="Jane Doe")
+    ))
+    assert document
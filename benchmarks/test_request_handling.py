@@ -0,0 +1,40 @@
+# benchmarks/test_request_handling.py
+"""
+Per-request overhead outside the handlers: JWT issue/check and parsing
+the CV payloads into their Pydantic request models.
+
+    pytest benchmarks/test_request_handling.py
+"""
+import uuid
+
+import pytest
+
+from app.api.cv import CVCreateRequest, PreviewRequest
+from app.middleware.auth import verify_token
+from app.utils.auth import create_access_token
+
+
+@pytest.mark.benchmark(group="jwt")
+def test_jwt_encode(benchmark):
+    user_id = str(uuid.uuid4())
+    assert benchmark(create_access_token, user_id)
+
+
+@pytest.mark.benchmark(group="jwt")
+def test_jwt_decode(benchmark):
+    token = create_access_token(str(uuid.uuid4()))
+    assert benchmark(verify_token, token, "access")["type"] == "access"
+
+
+@pytest.mark.benchmark(group="request-parsing")
+def test_parse_cv_create(benchmark, cv_data):
+    payload = {"template_id": "modern", "status": "draft", **cv_data}
+    request = benchmark(CVCreateRequest.model_validate, payload)
+    assert len(request.sections) == len(cv_data["sections"])
+
+
+@pytest.mark.benchmark(group="request-parsing")
+def test_parse_preview(benchmark, cv_data):
+    payload = {"template_id": "modern", "cv_data": cv_data}
+    request = benchmark(PreviewRequest.model_validate, payload)
+    assert len(request.cv_data.sections) == len(cv_data["sections"])
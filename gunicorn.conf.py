@@ -0,0 +1,90 @@
+# gunicorn.conf.py
+"""
+Production server: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py
+
+The master imports the app once (SERVER_PRELOAD), warms up the heavy
+libraries and freezes the GC so the workers forked from it share those
+pages instead of each loading and then touching its own copy. Workers are
+recycled after SERVER_MAX_REQUESTS (plus jitter) and given
+SERVER_GRACEFUL_TIMEOUT to finish in-flight requests on SIGTERM. All
+values come from Settings (app/config.py).
+"""
+import gc
+import os
+import shutil
+import tempfile
+
+from app.config import settings
+
+
+def available_cpus() -> int:
+    """CPUs this container may use: the cgroup quota when there is one, else the affinity mask"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+wsgi_app = "app.main:app"
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = settings.SERVER_WORKERS or min(available_cpus(), settings.SERVER_MAX_WORKERS)
+bind = f"0.0.0.0:{settings.PORT}"
+
+preload_app = settings.SERVER_PRELOAD
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+timeout = settings.SERVER_TIMEOUT
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+keepalive = settings.SERVER_KEEPALIVE
+
+# Worker heartbeats go through tmpfs rather than the container's overlay filesystem
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Metrics from every worker (see app/utils/metrics.py); must be set before prometheus_client is imported
+_metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "cv-builder-metrics")
+)
+shutil.rmtree(_metrics_dir, ignore_errors=True)
+os.makedirs(_metrics_dir)
+
+if preload_app:
+    # Collections before the fork would only be undone by gc.freeze(); skip them
+    gc.disable()
+
+
+def when_ready(server):
+    """Master, once before the first worker is forked"""
+    if preload_app:
+        from app.utils.warmup import warm_up
+
+        warm_up()
+        gc.freeze()  # preloaded objects are never scanned, so forked workers keep sharing their pages
+        gc.enable()
+    server.log.info("Starting %d workers (%s)", workers, worker_class)
+
+
+def post_fork(server, worker):
+    from app.utils.logging_config import route_server_loggers
+
+    # The worker class points uvicorn's loggers at gunicorn's handlers; use the app's again
+    route_server_loggers()
+    if preload_app:
+        from app.database import engine
+
+        # Connections the master may have opened must not be shared with the worker
+        engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,2 @@
+# loadtest/__init__.py
+"""Load-test harness: the app against local stand-ins. Start with `python -m loadtest.run --help`."""
@@ -0,0 +1,205 @@
+# loadtest/run.py
+"""
+Boots the app against local stand-ins (see standins.py), seeds users and
+drives virtual users through the scenario mix (see scenarios.py), then
+reports throughput and p50/p95/p99 per step.
+
+    python -m loadtest.run --users 20 --duration 60
+    python -m loadtest.run --workers 4 --database-url postgresql://localhost/cv_loadtest
+    python -m loadtest.run --mix autosave=70,preview=30 --json results.json
+
+Defaults to a fresh SQLite file; pass --database-url for a local Postgres,
+which is what production numbers should come from. Server and stand-in
+output goes to log files in the temp directory.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Tuple
+
+import httpx
+
+from .scenarios import DEFAULT_MIX, VirtualUser, make_job_descriptions, seed_users
+from .stats import Recorder, format_report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown step {name!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+def app_env(args: argparse.Namespace, ports: Dict[str, int]) -> Dict[str, str]:
+    """Settings for the app under test: every external service is a stand-in"""
+    return {
+        "DATABASE_URL": args.database_url,
+        "DB_SCHEMA_MODE": "create_all" if args.database_url.startswith("sqlite") else "migrate",
+        "REDISHOST": "127.0.0.1",
+        "REDISPORT": str(ports["redis"]),
+        "AWS_ACCESS_KEY_ID": "loadtest",
+        "AWS_SECRET_ACCESS_KEY": "loadtest",
+        "AWS_BUCKET_NAME": "loadtest",
+        "AWS_REGION": "us-east-1",
+        "AWS_ENDPOINT_URL_S3": f"http://127.0.0.1:{ports['s3']}",
+        "OPENAI_API_KEY": "sk-loadtest",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{ports['openai']}/v1",
+        "OPENAI_API_BASE": f"http://127.0.0.1:{ports['openai']}/v1",
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": str(ports["smtp"]),
+        "MAIL_TLS": "false",
+        "MAIL_SSL": "false",
+        "USE_CREDENTIALS": "false",
+        "MAIL_USERNAME": "loadtest",
+        "MAIL_PASSWORD": "loadtest",
+        "MAIL_FROM": "noreply@example.com",
+        "FRONTEND_URL": "http://localhost:3000",
+        "LOG_LEVEL": args.log_level,
+        "PORT": str(ports["app"]),
+        "SERVER_WORKERS": str(args.workers),
+    }
+
+
+def start(name: str, command: List[str], env: Dict[str, str]) -> Tuple[subprocess.Popen, str]:
+    log_path = os.path.join(tempfile.gettempdir(), f"cv-builder-loadtest-{name}.log")
+    log = open(log_path, "w")
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    log.close()
+    return process, log_path
+
+
+def stop(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_ready(base_url: str, timeout: float, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise SystemExit("the app exited during startup, see its log")
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise SystemExit(f"the app was not ready after {timeout:.0f}s")
+
+
+async def drive(args: argparse.Namespace, base_url: str, emails: List[str]) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    job_descriptions = make_job_descriptions(args.job_postings)
+    names, weights = zip(*args.mix.items())
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    started = time.monotonic()
+    ends = started + args.ramp_up + args.duration
+
+    async def virtual_user(index: int, client: httpx.AsyncClient) -> None:
+        await asyncio.sleep(args.ramp_up * index / args.users)
+        rng = random.Random(args.seed + index)
+        user = VirtualUser(client, recorder, emails[index], rng, job_descriptions)
+        if not await user.start():
+            return
+        while time.monotonic() < ends:
+            await user.step(rng.choices(names, weights)[0])()
+            if args.think_ms:
+                await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        await asyncio.gather(*(virtual_user(i, client) for i in range(args.users)))
+    return recorder, time.monotonic() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds at full load")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds to start every user")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between a user's steps")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX), help="step=weight,...")
+    parser.add_argument("--workers", type=int, default=1, help="1: uvicorn; more: gunicorn.conf.py with that many")
+    parser.add_argument("--database-url", default=f"sqlite:///{tempfile.gettempdir()}/cv-builder-loadtest.db")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--job-postings", type=int, default=50, help="distinct job descriptions users pick from")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per request, seconds")
+    parser.add_argument("--log-level", default="WARNING", help="the app's LOG_LEVEL")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the results here")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        db_path = args.database_url[len("sqlite:///"):]
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+    ports = {name: free_port() for name in ("app", "redis", "smtp", "openai", "s3")}
+    env = {**os.environ, **app_env(args, ports)}
+    base_url = f"http://127.0.0.1:{ports['app']}"
+
+    with ExitStack() as stack:
+        standins, standins_log = start("standins", [
+            sys.executable, "-m", "loadtest.standins",
+            "--redis-port", str(ports["redis"]), "--smtp-port", str(ports["smtp"]),
+            "--openai-port", str(ports["openai"]), "--s3-port", str(ports["s3"]),
+            "--llm-latency-ms", str(args.llm_latency_ms),
+        ], env)
+        stack.callback(stop, standins)
+
+        if args.workers > 1:
+            command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "loadtest.server:app"]
+        else:
+            command = [sys.executable, "-m", "uvicorn", "loadtest.server:app",
+                       "--host", "127.0.0.1", "--port", str(ports["app"]), "--no-access-log"]
+        server, server_log = start("app", command, env)
+        stack.callback(stop, server)
+        print(f"logs: {server_log}, {standins_log}")
+
+        asyncio.run(wait_ready(base_url, 60.0, server))
+        os.environ.update(app_env(args, ports))  # seeding imports the app's models and settings
+        emails = seed_users(args.users)
+
+        print(f"{args.users} users for {args.duration:.0f}s (+{args.ramp_up:.0f}s ramp-up), "
+              f"{args.workers} worker(s), {args.database_url.split(':')[0]}, LLM {args.llm_latency_ms:.0f}ms")
+        recorder, elapsed = asyncio.run(drive(args, base_url, emails))
+
+    rows = recorder.stats(elapsed)
+    print(format_report(rows, elapsed))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "config": {k: v for k, v in vars(args).items() if k != "json"},
+                "elapsed": elapsed,
+                "steps": [row._asdict() for row in rows],
+                "statuses": {name: dict(counts) for name, counts in recorder.statuses.items()},
+            }, f, indent=2)
+    return 1 if any(row.errors for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
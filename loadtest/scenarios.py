@@ -0,0 +1,185 @@
+# loadtest/scenarios.py
+"""
+What a virtual user does: log in, create a CV, then pick weighted steps
+(autosave, preview, export, cover letter, ...) until the run ends. Each
+step is one request, recorded under its step name.
+"""
+import random
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from .stats import Recorder
+
+PASSWORD = "loadtest-password"
+TEMPLATES = ("modern", "classic", "professional")
+
+# Relative weights of the steps a logged-in user repeats
+DEFAULT_MIX: Dict[str, int] = {
+    "autosave": 50,
+    "preview": 25,
+    "export_pdf": 6,
+    "export_docx": 4,
+    "cover_letter": 3,
+    "login": 2,
+    "register": 1,  # the only step that sends mail
+}
+
+_WORDS = (
+    "built", "APIs", "for", "payments", "with", "Python", "and", "PostgreSQL", "led", "a", "team",
+    "of", "engineers", "migrating", "services", "to", "Kubernetes", "reducing", "costs", "latency",
+)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_sections(rng: random.Random, experience_entries: int = 4) -> List[Dict[str, Any]]:
+    """A typical CV: contact, profile, dated entries, skills and languages"""
+    return [
+        {"type": "contact", "title": "Contact", "order_index": 0, "content": {
+            "name": "Jane Doe", "email": "jane@example.com", "phone": "+1 555 0100", "location": "Berlin",
+        }},
+        {"type": "text", "title": "Profile", "order_index": 1, "content": _sentence(rng, 40)},
+        {"type": "experience", "title": "Experience", "order_index": 2, "content": [
+            {
+                "position": rng.choice(("Backend Engineer", "Developer", "Tech Lead")),
+                "company": rng.choice(("Acme", "Globex", "Initech")),
+                "startDate": f"{2010 + i}-0{1 + i % 9}-01",
+                "endDate": f"{2011 + i}-0{1 + i % 9}-01",
+                "current": i == 0,
+                "description": " ".join(_sentence(rng, 15) for _ in range(3)),
+            }
+            for i in range(experience_entries)
+        ]},
+        {"type": "education", "title": "Education", "order_index": 3, "content": [
+            {"degree": "BSc Computer Science", "institution": "TU Berlin", "startDate": "2006-10-01",
+             "endDate": "2009-09-30", "current": False, "description": _sentence(rng, 12)},
+        ]},
+        {"type": "skills", "title": "Skills", "order_index": 4, "content": "Python, FastAPI, PostgreSQL, Docker, AWS"},
+        {"type": "languages", "title": "Languages", "order_index": 5, "content": [
+            {"name": "English", "level": "C2"}, {"name": "German", "level": "B2"},
+        ]},
+    ]
+
+
+def make_job_descriptions(count: int, seed: int = 7) -> List[str]:
+    """Distinct postings; users share them, so the job analysis cache sees repeats as it would live"""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(('Acme', 'Globex', 'Initech'))} is hiring a {rng.choice(('Backend', 'Platform', 'Data'))} "
+        f"Engineer (#{i}). " + " ".join(_sentence(rng, 20) for _ in range(6))
+        for i in range(count)
+    ]
+
+
+def seed_users(count: int) -> List[str]:
+    """Active users with plenty of AI credits, written straight to the app's database"""
+    from app.database import SessionLocal
+    from app.models.user import User
+    from app.utils.auth import get_password_hash
+
+    hashed = get_password_hash(PASSWORD)  # bcrypt once, not per user
+    run = uuid.uuid4().hex[:8]
+    emails = [f"loadtest-{run}-{i}@example.com" for i in range(count)]
+    db = SessionLocal()
+    try:
+        db.add_all(
+            User(email=email, full_name=f"Load Test {i}", hashed_password=hashed, is_active=True, ai_credits=10 ** 9)
+            for i, email in enumerate(emails)
+        )
+        db.commit()
+    finally:
+        db.close()
+    return emails
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Recorder,
+        email: str,
+        rng: random.Random,
+        job_descriptions: List[str]
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.email = email
+        self.rng = rng
+        self.job_descriptions = job_descriptions
+        self.template_id = rng.choice(TEMPLATES)
+        self.sections = make_sections(rng)
+        self.headers: Dict[str, str] = {}
+        self.cv_id: Optional[str] = None
+
+    async def call(self, step: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(step, time.perf_counter() - start, 599)  # no response at all
+            return None
+        self.recorder.record(step, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def start(self) -> bool:
+        """Log in and create the CV the other steps work on"""
+        if not await self.login():
+            return False
+        response = await self.call("create_cv", "POST", "/api/cv", json={
+            "template_id": self.template_id, "sections": self.sections, "status": "draft",
+        })
+        if response is None or response.status_code != 200:
+            return False
+        self.cv_id = response.json()["id"]
+        return True
+
+    async def login(self) -> bool:
+        response = await self.call("login", "POST", "/auth/login", json={"email": self.email, "password": PASSWORD})
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+        return True
+
+    async def autosave(self) -> None:
+        # The editor saves after every change; here, a rewritten job description
+        experience = self.sections[2]["content"]
+        self.rng.choice(experience)["description"] = " ".join(_sentence(self.rng, 15) for _ in range(3))
+        await self.call("autosave", "PUT", f"/api/cv/{self.cv_id}", json={
+            "template_id": self.template_id, "sections": self.sections, "status": "draft",
+        })
+
+    async def preview(self) -> None:
+        await self.call("preview", "POST", "/api/cv/preview", json={
+            "cv_data": {"sections": self.sections}, "template_id": self.template_id,
+        })
+
+    async def export_pdf(self) -> None:
+        await self.call("export_pdf", "GET", f"/api/cv/{self.cv_id}/export/pdf")
+
+    async def export_docx(self) -> None:
+        await self.call("export_docx", "GET", f"/api/cv/{self.cv_id}/export/docx")
+
+    async def cover_letter(self) -> None:
+        await self.call("cover_letter", "POST", "/api/ai", json={
+            "cv_id": self.cv_id, "job_description": self.rng.choice(self.job_descriptions), "style": "professional",
+        })
+
+    async def register(self) -> None:
+        headers, self.headers = self.headers, {}
+        try:
+            await self.call("register", "POST", "/auth/register", json={
+                "full_name": "New User",
+                "email": f"signup-{uuid.uuid4().hex[:12]}@example.com",
+                "password": PASSWORD,
+                "confirm_password": PASSWORD,
+            })
+        finally:
+            self.headers = headers
+
+    def step(self, name: str) -> Callable:
+        return getattr(self, name)
@@ -0,0 +1,12 @@
+# loadtest/server.py
+"""
+The app under load, as run.py starts it:
+
+    uvicorn loadtest.server:app
+    gunicorn -c gunicorn.conf.py loadtest.server:app
+
+This is app.main:app unchanged, on Postgres and SQLite alike.
+"""
+from app.main import app
+
+__all__ = ["app"]
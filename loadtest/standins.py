@@ -0,0 +1,208 @@
+# loadtest/standins.py
+"""
+Local stand-ins for everything the app talks to besides its database, run
+as one process next to the app under test:
+
+    redis    fakeredis' TCP server, spoken to over the real redis protocol
+    smtp     an aiosmtpd sink that accepts every message
+    openai   an OpenAI-compatible /v1/chat/completions with canned answers
+             shaped like the ones ai_service parses, after a simulated delay
+    s3       the S3 calls the app makes (HEAD bucket, PUT/GET object) on a
+             local directory
+
+The app is pointed at them purely through its environment (see run.py),
+so the code under test is the code that ships.
+
+    python -m loadtest.standins --redis-port 6390 --smtp-port 8025 --openai-port 8091 --s3-port 8092
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+import uvicorn
+from aiosmtpd.controller import Controller
+from fakeredis import TcpFakeServer
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+SKILLS = (
+    "Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "AWS", "TypeScript", "React",
+    "CI/CD", "Terraform", "Redis", "GraphQL", "Machine Learning", "Communication", "Leadership",
+)
+WORDS = (
+    "team", "delivered", "platform", "customers", "improved", "reliability", "designed", "scaled",
+    "product", "engineering", "impact", "ownership", "collaborated", "shipped", "performance",
+    "mentored", "roadmap", "quality", "growth", "experience", "passionate", "results",
+)
+
+
+def _rng(prompt: str) -> random.Random:
+    # Same prompt, same answer: runs are comparable
+    return random.Random(hashlib.sha256(prompt.encode()).digest())
+
+
+def job_analysis(rng: random.Random) -> dict:
+    return {
+        "company_name": rng.choice(("Acme", "Globex", "Initech", "Umbrella", "Hooli")),
+        "position": rng.choice(("Backend Engineer", "Data Engineer", "Platform Engineer")),
+        "key_requirements": [f"{rng.randint(2, 8)}+ years of {rng.choice(SKILLS)}" for _ in range(4)],
+        "required_skills": rng.sample(SKILLS, 6),
+        "company_values": ["ownership", "customer focus"],
+        "contact_info": None,
+        "department": "Engineering",
+        "location": "Remote",
+        "employment_type": "full-time",
+    }
+
+
+def cv_analysis(rng: random.Random) -> dict:
+    score = round(rng.uniform(0.4, 0.95), 2)
+    return {
+        "key_experiences": ["Backend Engineer at Acme", "Developer at Globex"],
+        "highlighted_skills": rng.sample(SKILLS, 4),
+        "achievements": ["Cut p95 latency by 40%"],
+        "value_proposition": "Engineer who ships reliable services",
+        "education_match": True,
+        "experience_level_match": True,
+        "skill_match_score": score,
+        "experience_match_score": score,
+        "overall_match_score": score,
+        "match_level": "Good Match",
+    }
+
+
+def letter(rng: random.Random, words: int = 280) -> str:
+    paragraphs = []
+    for _ in range(4):
+        paragraphs.append(" ".join(rng.choice(WORDS) for _ in range(words // 4)).capitalize() + ".")
+    return "Dear Hiring Manager,\n\n" + "\n\n".join(paragraphs) + "\n\nSincerely,\nJane Doe"
+
+
+def fake_openai(latency_ms: float, jitter_ms: float) -> Starlette:
+    async def chat_completions(request: Request) -> JSONResponse:
+        body = await request.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        rng = _rng(prompt)
+        if "Analyze the following job posting" in prompt:
+            content = json.dumps(job_analysis(rng))
+        elif "key_experiences" in prompt:
+            content = json.dumps(cv_analysis(rng))
+        else:
+            content = letter(rng)
+
+        await asyncio.sleep(max(0.0, random.gauss(latency_ms, jitter_ms)) / 1000)
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+        return JSONResponse({
+            "id": f"chatcmpl-{rng.getrandbits(64):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    async def model(request: Request) -> JSONResponse:
+        # The health probe's models.retrieve
+        return JSONResponse({"id": request.path_params["model"], "object": "model", "created": 0, "owned_by": "loadtest"})
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/v1/models/{model:path}", model),
+    ])
+
+
+def local_s3(root: str) -> Starlette:
+    def path(request: Request) -> str:
+        bucket, key = request.path_params["bucket"], request.path_params.get("key", "")
+        full = os.path.realpath(os.path.join(root, bucket, key))
+        if not full.startswith(os.path.realpath(root) + os.sep):
+            raise ValueError("key outside the bucket")
+        return full
+
+    async def bucket(request: Request) -> Response:
+        return Response(status_code=200)  # head_bucket: every bucket exists
+
+    async def obj(request: Request) -> Response:
+        target = path(request)
+        if request.method == "PUT":
+            body = await request.body()
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(body)
+            return Response(status_code=200, headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+        if not os.path.isfile(target):
+            return Response(status_code=404)
+        with open(target, "rb") as f:
+            return Response(f.read(), media_type="application/octet-stream")
+
+    return Starlette(routes=[
+        Route("/{bucket}", bucket, methods=["HEAD", "GET"]),
+        Route("/{bucket}/{key:path}", obj, methods=["PUT", "GET", "HEAD"]),
+    ])
+
+
+class SinkHandler:
+    async def handle_DATA(self, server, session, envelope) -> str:
+        return "250 Message accepted"
+
+
+def start_redis(port: int) -> TcpFakeServer:
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, name="fake-redis", daemon=True).start()
+    return server
+
+
+def start_smtp(port: int) -> Controller:
+    controller = Controller(SinkHandler(), hostname="127.0.0.1", port=port)
+    controller.start()
+    return controller
+
+
+async def serve(args: argparse.Namespace) -> None:
+    servers = [
+        uvicorn.Server(uvicorn.Config(
+            fake_openai(args.llm_latency_ms, args.llm_jitter_ms),
+            host="127.0.0.1", port=args.openai_port, log_level="warning", access_log=False
+        )),
+        uvicorn.Server(uvicorn.Config(
+            local_s3(args.s3_root), host="127.0.0.1", port=args.s3_port, log_level="warning", access_log=False
+        )),
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-ins for Redis, SMTP, OpenAI and S3")
+    parser.add_argument("--redis-port", type=int, required=True)
+    parser.add_argument("--smtp-port", type=int, required=True)
+    parser.add_argument("--openai-port", type=int, required=True)
+    parser.add_argument("--s3-port", type=int, required=True)
+    parser.add_argument("--s3-root", default=os.path.join(tempfile.gettempdir(), "cv-builder-loadtest-s3"))
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    start_redis(args.redis_port)
+    start_smtp(args.smtp_port)
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
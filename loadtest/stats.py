@@ -0,0 +1,67 @@
+# loadtest/stats.py
+"""Latency samples per scenario step and the throughput/percentile report"""
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Sequence
+
+
+class StepStats(NamedTuple):
+    name: str
+    requests: int
+    errors: int
+    throughput: float  # requests per second over the run
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def percentile(ordered: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, name: str, seconds: float, status: int) -> None:
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+        if not 200 <= status < 400:
+            self.errors[name] += 1
+
+    def stats(self, duration: float) -> List[StepStats]:
+        rows = []
+        for name in sorted(self.latencies):
+            ordered = sorted(self.latencies[name])
+            rows.append(StepStats(
+                name,
+                len(ordered),
+                self.errors[name],
+                len(ordered) / duration if duration else 0.0,
+                percentile(ordered, 50) * 1000,
+                percentile(ordered, 95) * 1000,
+                percentile(ordered, 99) * 1000,
+                ordered[-1] * 1000,
+            ))
+        return rows
+
+
+def format_report(rows: List[StepStats], duration: float) -> str:
+    total = sum(row.requests for row in rows)
+    errors = sum(row.errors for row in rows)
+    lines = [
+        f"{'step':<14} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    for row in rows:
+        lines.append(
+            f"{row.name:<14} {row.requests:>9} {row.errors:>7} {row.throughput:>8.1f} "
+            f"{row.p50_ms:>9.1f} {row.p95_ms:>9.1f} {row.p99_ms:>9.1f} {row.max_ms:>9.1f}"
+        )
+    lines.append(f"{'total':<14} {total:>9} {errors:>7} {total / duration if duration else 0:>8.1f}")
+    return "\n".join(lines)
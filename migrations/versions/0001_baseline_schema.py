@@ -0,0 +1,120 @@
+"""baseline schema
+
+Mirrors the tables that used to be created by Base.metadata.create_all().
+Each table is only created when missing, so databases that were set up by
+create_all can simply be upgraded without stamping.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("email", sa.String(), nullable=True),
+            sa.Column("full_name", sa.String(), nullable=True),
+            sa.Column("hashed_password", sa.String(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("is_locked", sa.Boolean(), nullable=True),
+            sa.Column("failed_login_attempts", sa.Integer(), nullable=True),
+            sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("ai_credits", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "cvs" not in existing:
+        op.create_table(
+            "cvs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("template_id", sa.String(), nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum("DRAFT", "PUBLISHED", "ARCHIVED", name="cvstatus"),
+                nullable=True,
+            ),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("profile_image", sa.String(), nullable=True),
+        )
+
+    if "sections" not in existing:
+        op.create_table(
+            "sections",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "cv_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("cvs.id", ondelete="CASCADE"),
+                nullable=True,
+            ),
+            sa.Column("type", sa.String(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("content", sa.JSON(), nullable=False),
+            sa.Column("order_index", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "cv_profiles" not in existing:
+        op.create_table(
+            "cv_profiles",
+            sa.Column(
+                "cv_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("cvs.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("version", sa.String(), nullable=False),
+            sa.Column("facts", sa.JSON(), nullable=False),
+            sa.Column("skills", sa.JSON(), nullable=False),
+            sa.Column("skill_embeddings", sa.LargeBinary(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+    if "cover_letters" not in existing:
+        op.create_table(
+            "cover_letters",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("cv_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("cvs.id"), nullable=True),
+            sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("job_title", sa.String(), nullable=True),
+            sa.Column("company_name", sa.String(), nullable=True),
+            sa.Column("matching_score", sa.Float(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("cover_letters")
+    op.drop_table("cv_profiles")
+    op.drop_table("sections")
+    op.drop_table("cvs")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
+    sa.Enum(name="cvstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""cover letter history index
+
+Serves GET /api/ai/letters: rows for one user in (created_at, id) order,
+with the summary columns included so the list is an index-only scan.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_cover_letters_user_id_created_at",
+        "cover_letters",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_include=["job_title", "company_name", "matching_score", "cv_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cover_letters_user_id_created_at", table_name="cover_letters")
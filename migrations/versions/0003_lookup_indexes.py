@@ -0,0 +1,38 @@
+"""lookup indexes
+
+Indexes for the foreign keys and filters the API queries on.
+cover_letters.user_id is already the leading column of
+ix_cover_letters_user_id_created_at (0002).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_cvs_user_id_created_at",
+        "cvs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        if_not_exists=True,
+    )
+    op.create_index("ix_cvs_status", "cvs", ["status"], if_not_exists=True)
+    op.create_index("ix_sections_cv_id", "sections", ["cv_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sections_cv_id", table_name="sections")
+    op.drop_index("ix_cvs_status", table_name="cvs")
+    op.drop_index("ix_cvs_user_id_created_at", table_name="cvs")
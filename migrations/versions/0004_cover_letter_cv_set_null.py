@@ -0,0 +1,71 @@
+"""cover letters survive their CV
+
+Drafts are now removed with a single DELETE, so the database has to do what
+the ORM used to: clear cover_letters.cv_id instead of blocking the delete.
+sections and cv_profiles already cascade.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_NAME = "cover_letters_cv_id_fkey"
+HISTORY_INDEX = "ix_cover_letters_user_id_created_at"
+
+
+def _cv_foreign_key() -> Union[str, None]:
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys("cover_letters"):
+        if fk["referred_table"] == "cvs" and fk["constrained_columns"] == ["cv_id"]:
+            return fk["name"]
+    return None
+
+
+def _rebuild_sqlite_table(ondelete: Union[str, None]) -> None:
+    """
+    SQLite can't alter constraints in place, so batch mode copies the table.
+    Reflection reads the UUID columns back as NUMERIC and drops the DESC of
+    the 0002 history index, so those columns and the index are restated.
+    """
+    uuid = postgresql.UUID(as_uuid=True)
+    with op.batch_alter_table(
+        "cover_letters",
+        recreate="always",
+        reflect_args=[
+            sa.Column("id", uuid, primary_key=True),
+            sa.Column("user_id", uuid, sa.ForeignKey("users.id")),
+            sa.Column("cv_id", uuid, sa.ForeignKey("cvs.id", name=NEW_NAME, ondelete=ondelete)),
+            sa.Column("job_id", uuid),
+        ],
+    ) as batch_op:
+        batch_op.drop_index(HISTORY_INDEX)
+    op.create_index(HISTORY_INDEX, "cover_letters", ["user_id", sa.text("created_at DESC"), sa.text("id DESC")])
+
+
+def _replace_foreign_key(ondelete: Union[str, None]) -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild_sqlite_table(ondelete)
+        return
+    name = _cv_foreign_key()
+    if name:
+        op.drop_constraint(name, "cover_letters", type_="foreignkey")
+    op.create_foreign_key(NEW_NAME, "cover_letters", "cvs", ["cv_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _replace_foreign_key("SET NULL")
+
+
+def downgrade() -> None:
+    _replace_foreign_key(None)
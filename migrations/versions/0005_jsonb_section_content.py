@@ -0,0 +1,75 @@
+"""jsonb section content
+
+Moves section content and the CV profile columns from json to jsonb so
+Postgres stores them parsed, and adds GIN indexes for @> containment queries
+(CVService.find_cvs_by_skill / find_sections).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ("sections", "content"),
+    ("cv_profiles", "facts"),
+    ("cv_profiles", "skills"),
+]
+
+
+def upgrade() -> None:
+    # Other backends keep their JSON columns and have no GIN
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=False,
+            postgresql_using=f"{column}::jsonb",
+        )
+    op.create_index(
+        "ix_sections_content_gin",
+        "sections",
+        ["content"],
+        postgresql_using="gin",
+        postgresql_ops={"content": "jsonb_path_ops"},
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_cv_profiles_skills_gin",
+        "cv_profiles",
+        ["skills"],
+        postgresql_using="gin",
+        postgresql_ops={"skills": "jsonb_path_ops"},
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_cv_profiles_skills_gin", table_name="cv_profiles")
+    op.drop_index("ix_sections_content_gin", table_name="sections")
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=False,
+            postgresql_using=f"{column}::json",
+        )
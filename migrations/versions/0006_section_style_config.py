@@ -0,0 +1,34 @@
+"""section style config
+
+The second Section mapping in app/models/section.py declared a style_config
+column that never reached the database; it now lives on the single mapping.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("sections")}
+    if "style_config" not in columns:
+        op.add_column(
+            "sections",
+            sa.Column("style_config", sa.JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("sections", "style_config")
@@ -0,0 +1,48 @@
+# tests/conftest.py
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# A throwaway SQLite file, set before app.config / app.database are imported.
+# A file rather than :memory: so TestClient's worker threads see the same data.
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='cv-builder-tests-')}/test.db"
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("AWS_BUCKET_NAME", "test")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import User  # noqa: E402
+from app.models import database  # noqa: E402,F401  registers CV, Section, CoverLetter...
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+
+
+@pytest.fixture
+def user(db) -> User:
+    user = User(email=f"{uuid.uuid4().hex[:12]}@example.com", full_name="Jane Doe", is_active=True, ai_credits=10)
+    db.add(user)
+    db.commit()
+    return user
@@ -0,0 +1,56 @@
+# tests/test_compression.py
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware
+
+BIG = "cv " * 1000
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse(BIG)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BIG, BIG]), media_type="text/plain")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(make_app())
+
+
+@pytest.mark.parametrize("accept", ["br", "gzip", "identity", ""])
+@pytest.mark.parametrize("path", ["/small", "/big", "/stream"])
+def test_compressible_responses_vary_on_accept_encoding(client, path, accept):
+    response = client.get(path, headers={"Accept-Encoding": accept})
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_only_large_buffered_bodies_are_compressed(client):
+    assert client.get("/big", headers={"Accept-Encoding": "br"}).headers["content-encoding"] == "br"
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "br"}).headers
+    assert "content-encoding" not in client.get("/stream", headers={"Accept-Encoding": "br"}).headers
+
+
+def test_other_types_pass_through_untouched(client):
+    response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "vary" not in response.headers
+    assert "content-encoding" not in response.headers
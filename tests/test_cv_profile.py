@@ -0,0 +1,64 @@
+# tests/test_cv_profile.py
+from datetime import datetime
+
+from app.models.ai_models import JobAnalysis
+from app.models.database import CVProfile
+from app.services.ai_service import CoverLetterService
+from app.services.cv_profile_service import CVProfileService, experience_years
+
+SECTIONS = [
+    {"type": "text", "title": "Profile", "order_index": 0,
+     "content": "<p>Backend engineer who builds payment APIs with Python.</p>"},
+    {"type": "experience", "title": "Experience", "order_index": 1, "content": [
+        {"position": "Backend Engineer", "company": "Acme", "startDate": "2016-01-01", "endDate": "2020-01-01",
+         "current": False, "description": "<ul><li>Designed REST APIs on PostgreSQL</li></ul>"},
+        {"position": "Tech Lead", "company": "Globex", "startDate": "2019-01-01", "endDate": "2023-01-01",
+         "current": False, "description": "<p>Led a team of five engineers</p>"},
+    ]},
+    {"type": "skills", "title": "Skills", "order_index": 2, "content": "Python, PostgreSQL"},
+]
+
+
+def job(*requirements: str) -> JobAnalysis:
+    return JobAnalysis(
+        company_name="Initech", position="Backend Engineer", key_requirements=list(requirements),
+        required_skills=["Python", "Go"], company_values=[], contact_info=None,
+        department=None, location=None, employment_type=None,
+    )
+
+
+def profile() -> CVProfile:
+    facts = CVProfileService.extract_facts(SECTIONS)
+    return CVProfile(facts=facts, skills=["python", "postgresql"])
+
+
+def test_experience_years_counts_overlaps_once():
+    facts = CVProfileService.extract_facts(SECTIONS)
+    # 2016-2020 and 2019-2023 overlap by a year
+    assert round(experience_years(facts["experiences"], today=datetime(2024, 1, 1))) == 7
+
+
+def test_profile_analysis_keeps_descriptions_and_summary():
+    analysis = CoverLetterService()._analyze_cv_profile(profile(), job("REST APIs", "Kubernetes"))["analysis"]
+
+    assert analysis.key_experiences[0] == "REST APIs"  # covered in the posting's wording
+    assert "Backend Engineer at Acme: Designed REST APIs on PostgreSQL" in analysis.key_experiences
+    assert "Tech Lead at Globex: Led a team of five engineers" in analysis.key_experiences
+    assert "Kubernetes" not in analysis.key_experiences
+    assert analysis.value_proposition.startswith("Backend engineer who builds payment APIs")
+    assert analysis.highlighted_skills == ["Python"]
+
+
+def test_profile_analysis_derives_experience_level():
+    service = CoverLetterService()
+    assert service._analyze_cv_profile(profile(), job("5+ years of Python"))["analysis"].experience_level_match is True
+    assert service._analyze_cv_profile(profile(), job("10+ years of Python"))["analysis"].experience_level_match is False
+
+
+def test_version_of_tied_sections():
+    # Same order_index, type and title: only the content tells them apart
+    a = {"type": "text", "title": "A", "order_index": 0, "content": {"html": "<p>one</p>"}}
+    b = {"type": "text", "title": "A", "order_index": 0, "content": {"html": "<p>two</p>"}}
+
+    assert CVProfileService.compute_version([a, b]) == CVProfileService.compute_version([b, a])
+    assert CVProfileService.compute_version([a, b]) != CVProfileService.compute_version([a, a])
@@ -0,0 +1,46 @@
+# tests/test_cv_service.py
+from app.models.database import CV, CVProfile, CVStatus, Section
+from app.services.cv_profile_service import CVProfileService
+from app.services.cv_service import CVService
+
+SECTIONS = [
+    {"type": "text", "title": "Profile", "order_index": 0, "content": "<p>Backend engineer</p>"},
+    {"type": "skills", "title": "Skills", "order_index": 1, "content": "Python, PostgreSQL"},
+]
+
+
+def make_cv(db, user, status=CVStatus.DRAFT) -> CV:
+    cv = CV(user_id=user.id, template_id="modern", status=status)
+    db.add(cv)
+    db.flush()
+    service = CVService(db)
+    service.insert_sections(cv.id, SECTIONS)
+    CVProfileService(db).refresh(cv.id, SECTIONS)
+    db.commit()
+    return cv
+
+
+def test_delete_drafts_leaves_no_orphans(db, user):
+    drafts = [make_cv(db, user), make_cv(db, user)]
+    kept_draft = make_cv(db, user)
+    published = make_cv(db, user, CVStatus.PUBLISHED)
+
+    deleted = CVService(db).delete_drafts(user.id, exclude_id=kept_draft.id)
+    db.commit()
+
+    assert deleted == len(drafts)
+    remaining = {kept_draft.id, published.id}
+    assert {cv_id for (cv_id,) in db.query(CV.id)} == remaining
+    assert {cv_id for (cv_id,) in db.query(Section.cv_id)} == remaining
+    assert {cv_id for (cv_id,) in db.query(CVProfile.cv_id)} == remaining
+
+
+def test_replace_sections_swaps_all_rows(db, user):
+    cv = make_cv(db, user)
+    service = CVService(db)
+
+    service.replace_sections(cv.id, SECTIONS[:1])
+    db.commit()
+
+    rows = db.query(Section).filter(Section.cv_id == cv.id).all()
+    assert [(row.type, row.order_index) for row in rows] == [("text", 0)]
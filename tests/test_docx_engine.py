@@ -0,0 +1,35 @@
+# tests/test_docx_engine.py
+import io
+import re
+import zipfile
+
+from app.models.read_models import CVView
+from app.services.docx_engine import DOCUMENT_PART, DocxTemplates
+
+
+def document_text(sections) -> str:
+    docx = DocxTemplates().render(CVView.from_dict({"sections": sections}, "modern"))
+    with zipfile.ZipFile(io.BytesIO(docx)) as package:
+        xml = package.read(DOCUMENT_PART).decode()
+    return "".join(re.findall(r"<w:t[^>]*>([^<]*)</w:t>", xml))
+
+
+def test_skills_with_levels():
+    text = document_text([{"type": "skills", "title": "Skills", "order_index": 0, "content": [
+        {"name": "Python", "level": "Expert"},
+        {"name": "Docker"},
+        "SQL",
+    ]}])
+    assert "Python (Expert), Docker, SQL" in text
+
+
+def test_skills_as_text():
+    text = document_text([{"type": "skills", "title": "Skills", "order_index": 0, "content": "Python, Docker"}])
+    assert "Python, Docker" in text
+
+
+def test_languages_keep_their_format():
+    text = document_text([{"type": "languages", "title": "Languages", "order_index": 0, "content": [
+        {"name": "English", "level": "C2"},
+    ]}])
+    assert "English - C2" in text
@@ -0,0 +1,42 @@
+# tests/test_embeddings.py
+import numpy as np
+
+from app.utils.embeddings import EmbeddingIndex, HashedNgramEmbedder
+
+
+def make_index(maxsize: int) -> EmbeddingIndex:
+    return EmbeddingIndex(HashedNgramEmbedder(dim=64), maxsize=maxsize)
+
+
+def test_full_index_evicts_least_recently_used():
+    index = make_index(3)
+    index.embed(["python", "postgresql", "docker"])
+    index.embed(["python"])  # used again, so postgresql is now the oldest
+    index.embed(["kubernetes"])
+
+    assert len(index) == 3
+    assert "postgresql" not in index
+    assert all(term in index for term in ("python", "docker", "kubernetes"))
+
+
+def test_reused_rows_hold_the_right_vectors():
+    index = make_index(2)
+    for term in ["python", "postgresql", "docker", "python", "kubernetes"]:
+        index.embed([term])
+
+    for term in ["python", "kubernetes"]:
+        assert np.allclose(index.embed([term])[0], index.embedder.embed(term))
+
+
+def test_batch_larger_than_the_index():
+    index = make_index(2)
+    terms = ["python", "postgresql", "docker"]
+    vectors = index.embed(terms)
+    assert np.allclose(vectors, np.stack([index.embedder.embed(term) for term in terms]))
+
+
+def test_seeded_vectors_count_towards_the_limit():
+    index = make_index(2)
+    index.add(["go", "rust"], np.ones((2, 64), dtype=np.float32))
+    index.embed(["python"])
+    assert "go" not in index and "rust" in index and "python" in index
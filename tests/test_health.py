@@ -0,0 +1,34 @@
+# tests/test_health.py
+from app.services.health_service import DOWN, OK, HealthMonitor, Probe
+
+
+def healthy():
+    pass
+
+
+def broken():
+    raise ConnectionError("refused")
+
+
+def monitor(check) -> HealthMonitor:
+    return HealthMonitor([Probe("database", check, 60)], critical=["database"], timeout=1)
+
+
+async def test_ready_follows_critical_probes_while_running():
+    health = monitor(broken)
+    await health.start()
+    try:
+        assert (await health.run_probe(health.probes[0])).status == DOWN
+        assert not health.ready()
+
+        health.probes[0] = Probe("database", healthy, 60)
+        assert (await health.run_probe(health.probes[0])).status == OK
+        assert health.ready()
+    finally:
+        await health.stop()
+
+
+def test_ready_when_probes_are_disabled():
+    # HEALTH_PROBES_ENABLED=False: the monitor is never started
+    assert monitor(broken).ready()
+
@@ -0,0 +1,45 @@
+# tests/test_ids.py
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import cover_letter, cv
+from app.middleware.auth import get_current_user
+from app.models.database import CV, CoverLetter
+
+
+@pytest.fixture
+def client(user):
+    app = FastAPI()
+    app.include_router(cv.router)
+    app.include_router(cover_letter.router)
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+def test_ids_in_the_path_reach_uuid_columns(db, user, client):
+    saved = CV(user_id=user.id, template_id="modern")
+    letter = CoverLetter(user_id=user.id, content="Dear Hiring Manager")
+    db.add_all([saved, letter])
+    db.commit()
+
+    assert client.get(f"/api/cv/{saved.id}").json()["id"] == str(saved.id)
+    assert client.get(f"/api/ai/letters/{letter.id}").json()["id"] == str(letter.id)
+    assert client.get(f"/api/ai/letters/{uuid.uuid4()}").status_code == 404
+
+
+def test_malformed_ids_are_rejected(client):
+    assert client.get("/api/cv/not-an-id").status_code == 422
+    assert client.get("/api/ai/letters/not-an-id").status_code == 422
+
+
+def test_saved_letter_keeps_its_cv(db, user, client):
+    saved = CV(user_id=user.id, template_id="modern")
+    db.add(saved)
+    db.commit()
+
+    response = client.post("/api/ai/save", json={"content": "Dear Hiring Manager", "cv_id": str(saved.id)})
+    assert response.status_code == 200
+    assert response.json()["cv_id"] == str(saved.id)
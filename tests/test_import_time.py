@@ -0,0 +1,33 @@
+# tests/test_import_time.py
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.import_time import BUDGET, FORBIDDEN, digest, measure, total_seconds
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_heavy_libraries_not_imported_at_startup():
+    # A fresh interpreter: this one has imported whatever other tests needed
+    result = subprocess.run(
+        [sys.executable, "-c", "import json, sys, app.main; print(json.dumps(sorted(sys.modules)))"],
+        cwd=ROOT, capture_output=True, text=True, env=dict(os.environ)
+    )
+    assert result.returncode == 0, result.stderr
+
+    loaded = {name.split(".")[0] for name in json.loads(result.stdout.splitlines()[-1])}
+    assert sorted(loaded.intersection(FORBIDDEN)) == []
+
+
+def test_import_time_within_budget():
+    # Best of three: one cold import on a busy machine is noisy
+    runs = []
+    for _ in range(3):
+        runs.append(measure())
+        if total_seconds(runs[-1]) <= BUDGET:
+            break
+
+    fastest = min(runs, key=total_seconds)
+    assert total_seconds(fastest) <= BUDGET, digest(fastest, top=15)
@@ -0,0 +1,57 @@
+# tests/test_migrations.py
+import os
+import subprocess
+import sys
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import _enable_foreign_keys
+from app.models import User
+from app.models.database import CV, CoverLetter, CVStatus
+from app.services.cv_service import CVService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic(url: str, *args: str) -> None:
+    # A fresh interpreter: env.py migrates app.database.engine, bound at import
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "DATABASE_URL": url}
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.fixture
+def migrated(tmp_path):
+    """A session on a SQLite database built by alembic upgrade head rather than create_all"""
+    url = f"sqlite:///{tmp_path}/migrated.db"
+    alembic(url, "upgrade", "head")
+    engine = create_engine(url)
+    event.listen(engine, "connect", _enable_foreign_keys)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_deleting_a_draft_keeps_its_cover_letters(migrated):
+    user = User(email=f"{uuid.uuid4().hex[:12]}@example.com", is_active=True)
+    migrated.add(user)
+    migrated.flush()
+    draft = CV(user_id=user.id, template_id="modern", status=CVStatus.DRAFT)
+    migrated.add(draft)
+    migrated.flush()
+    letter = CoverLetter(user_id=user.id, cv_id=draft.id, content="Dear Hiring Manager")
+    migrated.add(letter)
+    migrated.commit()
+    draft_id, letter_id = draft.id, letter.id
+
+    assert CVService(migrated).delete_drafts(user.id) == 1
+    migrated.commit()
+
+    assert migrated.get(CV, draft_id) is None
+    assert migrated.get(CoverLetter, letter_id).cv_id is None
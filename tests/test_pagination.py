@@ -0,0 +1,79 @@
+# tests/test_pagination.py
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import cover_letter
+from app.middleware.auth import get_current_user
+from app.models.database import CV, CoverLetter
+from app.services.cv_service import CVService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Three rows share every timestamp, so only the id breaks the ties
+TIMESTAMPS = [datetime(2024, 5, 1, 12, 0, 0) - timedelta(minutes=i // 3) for i in range(11)]
+
+
+def newest_first(rows):
+    return [row.id for row in sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)]
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    created_at = datetime(2024, 5, 1, 12, 0, 0, 123456)
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+    assert decode_cursor(None) is None
+
+
+def test_invalid_cursor_is_a_400():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 20])
+async def test_cv_summaries_pages_through_ties(db, user, limit):
+    cvs = [CV(user_id=user.id, template_id="modern", created_at=created_at) for created_at in TIMESTAMPS]
+    db.add_all(cvs)
+    db.add(CV(user_id=None, template_id="modern", created_at=TIMESTAMPS[0]))  # someone else's
+    db.commit()
+
+    service = CVService(db)
+    seen, cursor = [], None
+    while True:
+        rows, cursor = await service.get_user_cv_summaries(user.id, limit=limit, cursor=cursor)
+        assert len(rows) <= limit
+        seen += [row.id for row in rows]
+        if cursor is None:
+            break
+
+    assert seen == newest_first(cvs)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 20])
+def test_cover_letters_page_through_ties(db, user, limit):
+    letters = [
+        CoverLetter(user_id=user.id, content=f"Letter {i}", job_title="Engineer", created_at=created_at)
+        for i, created_at in enumerate(TIMESTAMPS)
+    ]
+    db.add_all(letters)
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(cover_letter.router)
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = TestClient(app)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/ai/letters", params=params).json()
+        assert len(page["items"]) <= limit
+        seen += [uuid.UUID(item["id"]) for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == newest_first(letters)
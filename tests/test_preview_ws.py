@@ -0,0 +1,121 @@
+# tests/test_preview_ws.py
+import asyncio
+import json
+import logging
+
+import pytest
+from starlette.websockets import WebSocket
+
+from app.api import cv
+from app.services.preview_session import PreviewSession, PreviewSessionTooLarge, preview_sessions
+from app.utils.auth import create_access_token
+
+SECTIONS = [{"type": "text", "title": "Profile", "order_index": 0, "content": "<p>Backend engineer</p>"}]
+
+
+class Connection:
+    """The client side of one /preview/ws socket, driving the handler directly"""
+
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent: asyncio.Queue = asyncio.Queue()
+        scope = {"type": "websocket", "path": "/api/cv/preview/ws", "headers": [], "query_string": b""}
+        self.websocket = WebSocket(scope, self.incoming.get, self.sent.put)
+        self.incoming.put_nowait({"type": "websocket.connect"})
+
+    def send_json(self, payload: dict) -> None:
+        self.incoming.put_nowait({"type": "websocket.receive", "text": json.dumps(payload)})
+
+    def disconnect(self) -> None:
+        self.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+    async def receive(self) -> dict:
+        return await asyncio.wait_for(self.sent.get(), 5)
+
+
+@pytest.fixture
+def renderers(monkeypatch):
+    """The push tasks the handler starts, to check they are gone afterwards"""
+    tasks = []
+    push_renders = cv._push_renders
+
+    async def tracked(*args):
+        tasks.append(asyncio.current_task())
+        await push_renders(*args)
+
+    monkeypatch.setattr(cv, "_push_renders", tracked)
+    return tasks
+
+
+def init(user) -> dict:
+    return {"type": "init", "token": create_access_token(str(user.id)), "template_id": "modern", "sections": SECTIONS}
+
+
+async def open_session(user):
+    connection = Connection()
+    handler = asyncio.create_task(cv.preview_session(connection.websocket))
+    assert (await connection.receive())["type"] == "websocket.accept"
+    connection.send_json(init(user))
+    return connection, handler
+
+
+async def test_disconnect_stops_the_renderer(user, renderers):
+    connection, handler = await open_session(user)
+    page = await connection.receive()
+    assert json.loads(page["text"])["type"] == "page"
+
+    connection.disconnect()
+    await asyncio.wait_for(handler, 5)
+
+    assert len(renderers) == 1 and renderers[0].done()
+    assert len(preview_sessions) == 0
+
+
+async def test_render_failure_closes_the_socket(user, renderers, monkeypatch, caplog):
+    async def broken(self, preview_service):
+        raise RuntimeError("template exploded")
+
+    monkeypatch.setattr(PreviewSession, "render", broken)
+    with caplog.at_level(logging.ERROR, logger="app.api.cv"):
+        connection, handler = await open_session(user)
+        closed = await connection.receive()
+        connection.disconnect()  # the client's answer to the close frame
+        await asyncio.wait_for(handler, 5)
+
+    assert closed["type"] == "websocket.close" and closed["code"] == 1011
+    assert any(record.exc_info and "template exploded" in str(record.exc_info[1]) for record in caplog.records)
+    assert len(renderers) == 1 and renderers[0].done()
+    assert len(preview_sessions) == 0
+
+
+async def test_session_over_the_byte_cap_is_closed(user, renderers, monkeypatch):
+    monkeypatch.setattr(cv.settings, "PREVIEW_WS_MAX_SESSION_BYTES", 4096)
+    connection, handler = await open_session(user)
+    assert json.loads((await connection.receive())["text"])["type"] == "page"
+
+    section = {"type": "text", "title": "Notes", "order_index": 1, "content": "x" * 1500}
+    for index in (1, 2, 3):  # each message is small, the session is not
+        connection.send_json({"type": "update", "index": index, "section": section})
+    closed = await connection.receive()
+    while closed["type"] != "websocket.close":  # renders of the edits that fit
+        closed = await connection.receive()
+    await asyncio.wait_for(handler, 5)
+
+    assert closed["code"] == 1008
+    assert len(preview_sessions) == 0
+
+
+def test_byte_cap_counts_replaced_and_removed_sections(monkeypatch):
+    monkeypatch.setattr(cv.settings, "PREVIEW_WS_MAX_SESSION_BYTES", 4096)
+    session = PreviewSession("user", "modern", SECTIONS)
+    section = {"type": "text", "title": "Notes", "order_index": 1, "content": "x" * 3000}
+
+    session.apply({"type": "update", "index": 1, "section": section})
+    session.apply({"type": "update", "index": 1, "section": section})  # replaces, doesn't add
+    with pytest.raises(PreviewSessionTooLarge):
+        session.apply({"type": "update", "index": 2, "section": section})
+    assert len(session.sections) == 2  # the rejected edit left nothing behind
+
+    session.apply({"type": "remove", "index": 1})
+    session.apply({"type": "update", "index": 1, "section": section})
+    assert session.size == sum(session.sizes) < 4096
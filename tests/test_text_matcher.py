@@ -0,0 +1,72 @@
+# tests/test_text_matcher.py
+import pytest
+
+from app.utils.text_matcher import KeywordMatcher, compile_matcher, stem
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("managed", "manag"),
+    ("manages", "manag"),
+    ("managing", "manag"),
+    ("technologies", "technology"),
+    ("services", "servic"),
+    ("business", "business"),  # -ss is not a plural
+    ("status", "status"),
+    ("api", "api"),  # too short to touch
+    ("c++", "c++"),
+])
+def test_stem(word, expected):
+    assert stem(word) == expected
+
+
+def test_inflections_meet():
+    matcher = KeywordMatcher(["managed teams"])
+    assert matcher.search("Managing team members across sites")
+    assert matcher.search("she manages teams")
+    assert not matcher.search("she manages a team")  # words must be adjacent
+
+
+def test_overlapping_patterns_all_match():
+    patterns = ["machine learning", "learning", "deep machine learning models", "models"]
+    matcher = KeywordMatcher(patterns)
+    text = "Built deep machine learning models for search"
+
+    assert matcher.matched(text) == {0, 1, 2, 3}
+    found = matcher.first_matches(text)
+    assert text[found[0].start:found[0].end] == "machine learning"
+    assert text[found[2].start:found[2].end] == "deep machine learning models"
+
+
+def test_partial_prefix_does_not_block_a_later_match():
+    # "machine" starts "machine learning" but is followed by "vision"; the
+    # failure link has to fall back so "vision systems" is still found
+    matcher = KeywordMatcher(["machine learning", "vision systems"])
+    assert matcher.matched("machine vision systems") == {1}
+
+
+def test_whole_words_only():
+    matcher = KeywordMatcher(["java", "go"])
+    assert not matcher.search("JavaScript and Golang")
+    assert matcher.matched("Java, Go") == {0, 1}
+
+
+def test_symbols_and_dotted_names():
+    matcher = KeywordMatcher(["C++", "C#", "node.js", "C"])
+    assert matcher.matched("Wrote C# and node.js services") == {1, 2}
+    assert matcher.matched("Embedded C++ and C") == {0, 3}
+
+
+def test_find_all_reports_every_occurrence_in_order():
+    text = "Python first, then more Python"
+    matches = KeywordMatcher(["python"]).find_all(text)
+    assert [text[m.start:m.end] for m in matches] == ["Python", "Python"]
+    assert matches[0].end < matches[1].start
+
+
+def test_empty_patterns_never_match():
+    matcher = KeywordMatcher(["", "!!", "sql"])
+    assert matcher.matched("SQL and !!") == {2}
+
+
+def test_compile_matcher_reuses_the_automaton():
+    assert compile_matcher(("python", "sql")) is compile_matcher(("python", "sql"))